@@ -0,0 +1,66 @@
+"""模拟券商回放基准：随机生成委托与逐笔行情，统计每秒处理的委托数。
+
+用法::
+
+    python benchmarks/bench_broker.py [--orders 1000000] [--symbols 50]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from quantify.execution.broker import LIMIT, MARKET, STOP, PaperBroker
+
+_DAY_NS = 86_400_000_000_000
+
+
+def replay(orders: int, symbols: int, seed: int = 0) -> PaperBroker:
+    """每个时间步对一个标的下一笔委托，再用一笔行情撮合该标的挂单。"""
+    rng = np.random.default_rng(seed)
+    codes = [f"{600000 + i:06d}" for i in range(symbols)]
+    # 预先转换为 Python 列表，避免计时混入 NumPy 标量的装箱开销
+    symbol_idx = rng.integers(0, symbols, orders).tolist()
+    kinds = rng.choice([MARKET, LIMIT, STOP], orders, p=[0.6, 0.3, 0.1]).tolist()
+    sides = (rng.random(orders) < 0.55).tolist()
+    quantities = (rng.integers(1, 10, orders) * 100).tolist()
+    prices = (10.0 * np.exp(np.cumsum(rng.normal(0, 0.002, (orders,))))).tolist()
+    offsets = rng.normal(0, 0.01, orders).tolist()
+    # 每 10000 步视为一个交易日，触发 T+1 结算
+    steps = np.arange(orders)
+    timestamps = (1_700_000_000_000_000_000 + steps // 10_000 * _DAY_NS + steps).tolist()
+
+    broker = PaperBroker(cash=1e12, fill_capacity=orders)
+    submit, on_tick = broker.submit, broker.on_tick
+    for i in range(orders):
+        symbol = codes[symbol_idx[i]]
+        price = prices[i]
+        kind = kinds[i]
+        trigger = price * (1.0 + offsets[i])
+        side = "BUY" if sides[i] else "SELL"
+        if side == "SELL":
+            held = broker.sellable(symbol)
+            if held < 100:
+                side = "BUY"
+        quantity = quantities[i] if side == "BUY" else min(quantities[i], held - held % 100)
+        submit(symbol, side, quantity, kind, limit_price=trigger if kind == LIMIT else None,
+               stop_price=trigger if kind == STOP else None, timestamp=timestamps[i])
+        on_tick(symbol, timestamps[i], price)
+    return broker
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=1_000_000, help="委托数量")
+    parser.add_argument("--symbols", type=int, default=50, help="标的数量")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    broker = replay(args.orders, args.symbols)
+    elapsed = time.perf_counter() - start
+    print(f"orders : {args.orders:,}  fills: {len(broker.fills):,}  open: {len(broker.open_orders()):,}")
+    print(f"elapsed: {elapsed:8.2f} s  ({args.orders / elapsed:,.0f} orders/s)")
+
+
+if __name__ == "__main__":
+    main()
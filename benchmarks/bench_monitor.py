@@ -0,0 +1,87 @@
+"""盘中监控基准：全市场规模下单次行情刷新的 CPU 耗时。
+
+行情桩每次返回完整的腾讯行情文本并经 `parse_tencent_quotes` 解析，与线上一致；
+每次刷新随机改变一部分标的的价格，估值分析在预热时全部取回，之后只统计刷新本身。
+
+用法::
+
+    python benchmarks/bench_monitor.py [--symbols 5400] [--ticks 20] [--changed 0.3]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from quantify.features.monitor import LiveMonitor  # noqa: E402
+from quantify.features.quotes import parse_tencent_quotes  # noqa: E402
+
+
+class PayloadSource:
+    """按当前价格生成腾讯行情文本的本地桩。"""
+
+    def __init__(self, codes, seed: int = 3):
+        self.rng = np.random.default_rng(seed)
+        self.codes = codes
+        self.prices = np.round(self.rng.uniform(5, 50, len(codes)), 2)
+
+    def move(self, fraction: float) -> None:
+        changed = self.rng.random(len(self.codes)) < fraction
+        self.prices[changed] = np.round(self.prices[changed] * self.rng.uniform(0.98, 1.02, changed.sum()), 2)
+
+    async def quotes(self, codes) -> pd.DataFrame:
+        tail = "~".join(["0"] * 26) + "~20240105100000~0.1~1.0~10.5~9.9~0~0~12345"
+        payload = "\n".join(f'v_sh{code}="1~名称~{code}~{price:.2f}~{tail}";'
+                            for code, price in zip(self.codes, self.prices))
+        return parse_tencent_quotes(payload)
+
+    async def analysis(self, code: str) -> dict:
+        low = float(self.prices[int(code) - 600000]) * 0.9
+        return {"stock_text": code, "analysis": "股价被低估" if int(code) % 3 == 0 else "股价合理",
+                "relative_range": f"{low:.2f}-{low * 1.3:.2f}"}
+
+
+async def bench(n_symbols: int, ticks: int, fraction: float) -> None:
+    codes = [f"{600000 + i:06d}" for i in range(n_symbols)]
+    source = PayloadSource(codes)
+    monitor = LiveMonitor(codes, source, on_alert=None, analysis_concurrency=n_symbols)
+    now = pd.Timestamp("2024-01-05 10:00")
+    await monitor.tick(now)
+    await monitor.drain()
+
+    cpu, quotes_cpu = [], []
+    for i in range(ticks):
+        source.move(fraction)
+        start = time.process_time()
+        await source.quotes(codes)
+        quotes_cpu.append(time.process_time() - start)
+        start = time.process_time()
+        await monitor.tick(now + pd.Timedelta(seconds=5 * (i + 1)))
+        cpu.append(time.process_time() - start)
+    tick_ms = statistics.median(cpu) * 1000
+    quote_ms = statistics.median(quotes_cpu) * 1000
+    print(f"{n_symbols} symbols, {fraction:.0%} changed per tick, {ticks} ticks")
+    print(f"tick cpu (median)   : {tick_ms:7.1f} ms (quote stub + parse alone: {quote_ms:.1f} ms)")
+    print(f"tick cpu (max)      : {max(cpu) * 1000:7.1f} ms")
+    print(f"alerts today        : {len(monitor.alerts)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=5400, help="标的数量")
+    parser.add_argument("--ticks", type=int, default=20, help="统计的刷新次数")
+    parser.add_argument("--changed", type=float, default=0.3, help="每次刷新价格变化的标的比例")
+    args = parser.parse_args()
+    asyncio.run(bench(args.symbols, args.ticks, args.changed))
+
+
+if __name__ == "__main__":
+    main()
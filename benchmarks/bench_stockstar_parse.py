@@ -0,0 +1,74 @@
+"""证券之星估值页面解析基准：对比 BeautifulSoup 多次查找与单次正则扫描。
+
+用法::
+
+    python benchmarks/bench_stockstar_parse.py [--repeat 200]
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+from typing import Dict, Optional
+
+from quantify.features.A_stock import parse_stock_analysis
+
+FIXTURE = Path(__file__).resolve().parents[1] / "data" / "stockstar_GZAppraisement_03690.html"
+
+
+def parse_with_beautifulsoup(html: str) -> Dict[str, Optional[str]]:
+    """旧实现：构建完整 DOM 树后按标签逐个全文查找。"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    header_div = soup.select_one(".head_nav div:nth-of-type(2)")
+    stock_text = header_div.get_text(strip=True) if header_div else None
+    if stock_text and stock_text.endswith("估值分析"):
+        stock_text = stock_text[: -len("估值分析")].strip()
+
+    def extract_metric(label: str) -> Optional[str]:
+        target = soup.find(
+            lambda tag: tag.name in {"p", "div", "span"} and tag.get_text(strip=True).startswith(label)
+        )
+        if not target:
+            return None
+        text = target.get_text(separator="", strip=True)
+        for sep in ("：", ":"):
+            if sep in text:
+                return text.split(sep, 1)[1].strip()
+        return text.strip()
+
+    return {
+        "stock_text": stock_text,
+        "analysis": extract_metric("分析结果"),
+        "relative_range": extract_metric("相对估值范围"),
+        "absolute_range": extract_metric("绝对估值范围"),
+        "accuracy": extract_metric("估值准确性"),
+    }
+
+
+def bench(func, html: str, repeat: int) -> float:
+    """返回单页平均耗时（毫秒），取多轮中的最小值以降低噪声。"""
+    rounds = timeit.repeat(lambda: func(html), number=repeat, repeat=5)
+    return min(rounds) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="每轮解析次数")
+    args = parser.parse_args()
+
+    html = FIXTURE.read_text(encoding="utf-8")
+    print(f"fixture: {FIXTURE.name} ({len(html.encode('utf-8')) / 1024:.1f} KB)")
+    fast = bench(parse_stock_analysis, html, args.repeat)
+    try:
+        slow = bench(parse_with_beautifulsoup, html, max(args.repeat // 20, 5))
+    except ImportError:
+        print(f"single-pass regex : {fast:8.3f} ms/page (未安装 bs4，跳过对比)")
+        return
+    print(f"beautifulsoup     : {slow:8.3f} ms/page")
+    print(f"single-pass regex : {fast:8.3f} ms/page")
+    print(f"speedup           : {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
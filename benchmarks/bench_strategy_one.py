@@ -0,0 +1,108 @@
+"""StrategyOne 批量信号生成基准：对比逐K线 pandas 索引实现与 NumPy/numba 状态机。
+
+用法::
+
+    python benchmarks/bench_strategy_one.py [--bars 2520] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import talib as ta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from strategies.strategy_one import StrategyOne, _signal_kernel_jit  # noqa: E402
+
+
+class LegacyStrategyOne(StrategyOne):
+    """旧实现：在 pandas Series 上逐K线按位置索引，并对每根K线切片。"""
+
+    def generate_signals(self, data, index_data=None):
+        close, high, low = data["close"], data["high"], data["low"]
+        short_ma = ta.SMA(close, timeperiod=self.short_window)
+        long_ma = ta.SMA(close, timeperiod=self.long_window)
+        rsi = ta.RSI(close, timeperiod=self.rsi_period)
+        atr = ta.ATR(high, low, close, timeperiod=self.atr_period)
+        signals = pd.Series(0, index=data.index)
+        for i in range(self.long_window, len(data)):
+            if self.state.trading_suspended:
+                if data.index[i] >= self.state.suspend_until:
+                    self.state.trading_suspended = False
+                continue
+            if index_data is not None and not self._check_market_condition(index_data.iloc[:i + 1]):
+                continue
+            current_price = close.iloc[i]
+            if self.state.position and self._check_position_risk(data.iloc[:i + 1]):
+                signals.iloc[i] = -1
+                self.state.position = False
+                continue
+            trend_up = (current_price > long_ma.iloc[i]) and (short_ma.iloc[i] > long_ma.iloc[i])
+            momentum_ok = (rsi.iloc[i] > 50) and (rsi.iloc[i] < 70)
+            if not self.state.position and trend_up and momentum_ok:
+                signals.iloc[i] = 1
+                self.state.position = True
+                self.state.entry_price = current_price
+                self.state.entry_time = data.index[i]
+                self.state.highest_price = current_price
+                self.state.stop_loss_price = current_price - self.atr_multiplier * atr.iloc[i]
+            elif self.state.position and not trend_up:
+                signals.iloc[i] = -1
+                self.state.position = False
+        return signals
+
+
+def synthetic_bars(n: int, seed: int = 7) -> tuple:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    spread = rng.uniform(0, 0.02, n)
+    index = pd.bdate_range("2000-01-03", periods=n)
+    data = pd.DataFrame(
+        {"open": close, "high": close * (1 + spread), "low": close * (1 - spread), "close": close, "volume": 1e6},
+        index=index,
+    )
+    # 指数波动较小，避免熔断（暂停至当前时间之后）让旧实现跳过大部分K线
+    index_data = pd.DataFrame({"close": 3000 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))}, index=index)
+    return data, index_data
+
+
+def bars_per_second(factory, data, index_data, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        strategy = factory()
+        start = time.perf_counter()
+        strategy.generate_signals(data, index_data)
+        best = min(best, time.perf_counter() - start)
+    return len(data) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=2520, help="K线数量（默认约 10 年日线）")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    data, index_data = synthetic_bars(args.bars)
+    legacy = bars_per_second(lambda: LegacyStrategyOne({}), data, index_data, args.repeat)
+    numpy_path = bars_per_second(lambda: StrategyOne({"use_numba": False}), data, index_data, args.repeat)
+    print(f"bars: {args.bars}")
+    print(f"legacy pandas loop : {legacy:12,.0f} bars/s")
+    print(f"numpy state machine: {numpy_path:12,.0f} bars/s ({numpy_path / legacy:.1f}x)")
+    if _signal_kernel_jit is not None:
+        StrategyOne({}).generate_signals(data.iloc[:50], index_data.iloc[:50])  # 预热 JIT 编译
+        jit = bars_per_second(lambda: StrategyOne({}), data, index_data, args.repeat)
+        print(f"numba state machine: {jit:12,.0f} bars/s ({jit / legacy:.1f}x)")
+    else:
+        print("numba state machine: 未安装 numba，跳过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""对比两次基准结果，列出各用例的耗时变化并标记性能回退。
+
+参数可以是结果文件路径，也可以是 git 提交（解析为 ``benchmarks/results/<短提交号>.json``）。
+存在超过阈值的回退时以状态码 1 退出，便于在 CI 中拦截。
+
+用法::
+
+    python benchmarks/compare.py HEAD~1 HEAD [--threshold 0.10]
+    python benchmarks/compare.py results/abc1234.json results/def5678-dirty.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+
+def resolve(ref: str) -> Path:
+    """将文件路径或 git 提交解析为结果文件。"""
+    path = Path(ref)
+    if path.exists():
+        return path
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", ref], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        raise FileNotFoundError(f"既不是结果文件也不是有效的 git 提交: {ref}") from None
+    for candidate in (RESULTS_DIR / f"{sha}.json", RESULTS_DIR / f"{sha}-dirty.json"):
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"提交 {sha} 没有基准结果，请先在该提交上运行 benchmarks/suite.py")
+
+
+def load(path: Path) -> Dict[str, object]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(base: Dict[str, object], head: Dict[str, object], threshold: float = 0.10) -> List[Dict[str, object]]:
+    """按 (用例, 规模) 对齐两次结果，`change` 为耗时的相对变化，正数表示变慢。"""
+    base_rows: Dict[Tuple[str, int], Dict[str, float]] = {(r["case"], r["bars"]): r for r in base["results"]}
+    rows = []
+    for result in head["results"]:
+        key = (result["case"], result["bars"])
+        if key not in base_rows:
+            continue
+        before, after = base_rows[key]["best_s"], result["best_s"]
+        change = after / before - 1.0 if before > 0 else 0.0
+        status = "regression" if change > threshold else "improved" if change < -threshold else "same"
+        rows.append({"case": key[0], "bars": key[1], "base_s": before, "head_s": after,
+                     "change": change, "status": status})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base", help="基线结果文件或 git 提交")
+    parser.add_argument("head", help="待比较的结果文件或 git 提交")
+    parser.add_argument("--threshold", type=float, default=0.10, help="耗时增加超过该比例视为回退")
+    args = parser.parse_args()
+
+    base, head = load(resolve(args.base)), load(resolve(args.head))
+    print(f"base: {base['commit']}{' (dirty)' if base['dirty'] else ''}  "
+          f"head: {head['commit']}{' (dirty)' if head['dirty'] else ''}")
+    if base.get("environment") != head.get("environment"):
+        print("警告：两次结果的运行环境不同，对比仅供参考")
+    rows = compare(base, head, args.threshold)
+    print(f"{'case':<18}{'bars':>12}{'base s':>12}{'head s':>12}{'change':>10}  status")
+    for row in rows:
+        print(f"{row['case']:<18}{row['bars']:>12,}{row['base_s']:>12.4f}{row['head_s']:>12.4f}"
+              f"{row['change']:>+10.1%}  {row['status']}")
+    if any(row["status"] == "regression" for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""统计 ``python -X importtime`` 的导入开销，并检查重型依赖没有在包导入时被提前加载。
+
+每次测量都在新的解释器中执行，取多次运行中最快的一次以降低噪声。
+超出预算或提前加载了重型依赖时以状态码 1 退出，便于在 CI 中拦截。
+
+用法::
+
+    python benchmarks/importtime.py [--statement "import quantify"] [--top 15] [--budget-ms 50]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# 包导入时不应加载的依赖，只在用到对应功能时才导入
+HEAVY = ("akshare", "aiohttp", "bs4", "numba", "numpy", "pandas", "pydantic", "pydantic_settings", "requests",
+         "talib")
+
+
+def measure(statement: str = "import quantify", python: str = sys.executable) -> List[Dict[str, object]]:
+    """在新的解释器中执行 `statement`，返回每个模块的自身耗时、累计耗时（微秒）与所属的顶层导入。"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT / "src"), str(ROOT), env.get("PYTHONPATH")]))
+    completed = subprocess.run([python, "-X", "importtime", "-c", statement], cwd=ROOT, env=env,
+                               capture_output=True, text=True, check=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    # 输出按后序排列，子模块在前；倒序遍历时最近的顶层行即为所属的顶层导入
+    root = ""
+    for row in reversed(rows):
+        if row["depth"] == 0:
+            root = str(row["module"]).split(".")[0]
+        row["root"] = root
+    return rows
+
+
+def total_us(rows: Sequence[Dict[str, object]], package: str) -> int:
+    """`package` 及其子模块在顶层导入中的累计耗时。"""
+    return sum(row["cumulative_us"] for row in rows if row["depth"] == 0 and row["root"] == package)
+
+
+def heavy_imports(rows: Sequence[Dict[str, object]], heavy: Sequence[str] = HEAVY) -> List[str]:
+    loaded = {str(row["module"]).split(".")[0] for row in rows}
+    return sorted(loaded & set(heavy))
+
+
+def best_of(statement: str, package: str, repeat: int = 5) -> List[Dict[str, object]]:
+    """重复测量，返回 `package` 累计耗时最短的一次；第一次运行会编译 .pyc，不计入。"""
+    measure(statement)
+    runs = [measure(statement) for _ in range(repeat)]
+    return min(runs, key=lambda rows: total_us(rows, package))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--statement", default="import quantify", help="被测的导入语句")
+    parser.add_argument("--package", default="quantify", help="统计累计耗时的顶层包")
+    parser.add_argument("--top", type=int, default=15, help="列出累计耗时最高的模块数量")
+    parser.add_argument("--repeat", type=int, default=5, help="测量次数，取最快一次")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="累计耗时预算（毫秒）")
+    args = parser.parse_args(argv)
+
+    rows = best_of(args.statement, args.package, args.repeat)
+    total_ms = total_us(rows, args.package) / 1000
+    print(f"{args.statement!r}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"{'module':<48}{'self ms':>10}{'cumulative ms':>16}")
+    own = [row for row in rows if row["root"] == args.package]
+    for row in sorted(own, key=lambda r: r["cumulative_us"], reverse=True)[:args.top]:
+        print(f"{'  ' * row['depth'] + str(row['module']):<48}{row['self_us'] / 1000:>10.1f}"
+              f"{row['cumulative_us'] / 1000:>16.1f}")
+    heavy = heavy_imports(rows)
+    if heavy:
+        print(f"提前加载的重型依赖: {', '.join(heavy)}")
+    if heavy or total_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
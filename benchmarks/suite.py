@@ -0,0 +1,258 @@
+"""可复现的基准测试套件：数据加载、校验、信号生成、单标的回测与估值页面解析。
+
+行情由固定随机种子生成（分钟级 OHLCV），规模可选 1k / 100k / 10m 根K线；
+每个用例重复运行取最快一次与中位数，结果连同提交号、依赖版本写入
+``benchmarks/results/<commit>.json``，再用 ``benchmarks/compare.py`` 对比两次提交。
+
+用法::
+
+    python benchmarks/suite.py [--sizes 1k,100k] [--cases load_csv,validate] [--repeat 3]
+    python benchmarks/suite.py --sizes 1k,100k,10m      # 完整规模，10m 的 CSV 约 700 MB
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from quantify.backtest import BacktestEngine  # noqa: E402
+from quantify.config import Settings  # noqa: E402
+from quantify.data import LocalCSVLoader  # noqa: E402
+from quantify.features.A_stock import parse_stock_analysis  # noqa: E402
+from quantify.strategies import BaseStrategy, SignalFrame, StrategyContext  # noqa: E402
+from strategies.strategy_one import StrategyOne  # noqa: E402
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+FIXTURE = ROOT / "data" / "stockstar_GZAppraisement_03690.html"
+
+SIZES = {"1k": 1_000, "100k": 100_000, "10m": 10_000_000}
+DEFAULT_SIZES = ("1k", "100k")
+
+
+def synthetic_ohlcv(n_bars: int, seed: int = 7, start: str = "2000-01-03 09:30") -> pd.DataFrame:
+    """生成 `n_bars` 根分钟级几何随机游走K线，相同参数结果完全一致。"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.00002, 0.002, n_bars)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spread = rng.uniform(0, 0.003, n_bars)
+    index = pd.date_range(start, periods=n_bars, freq="min", name="date")
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + spread),
+            "low": np.minimum(open_, close) * (1 - spread),
+            "close": close,
+            "volume": rng.integers(1_000, 100_000, n_bars),
+        },
+        index=index,
+    )
+
+
+class _MemoryLoader:
+    def __init__(self, data: pd.DataFrame):
+        self._data = data
+
+    def load(self, symbol: str, **kwargs) -> pd.DataFrame:
+        return self._data
+
+
+class _StrategyOneAdapter(BaseStrategy):
+    """将 StrategyOne 的列式信号直接交给回测引擎。"""
+
+    def __init__(self, params: Dict):
+        self._strategy = StrategyOne(params)
+
+    def generate_signals(self, data: pd.DataFrame, context: StrategyContext) -> SignalFrame:
+        return self._strategy.generate_signals(data).frame
+
+
+class Workspace:
+    """按规模缓存生成的行情与 CSV 文件，同一规模的多个用例共享。"""
+
+    def __init__(self, directory: Path):
+        self._directory = directory
+        self._frames: Dict[int, pd.DataFrame] = {}
+
+    def frame(self, n_bars: int) -> pd.DataFrame:
+        if n_bars not in self._frames:
+            self._frames[n_bars] = synthetic_ohlcv(n_bars)
+        return self._frames[n_bars]
+
+    def csv(self, n_bars: int) -> Path:
+        path = self._directory / f"bars_{n_bars}.csv"
+        if not path.exists():
+            self.frame(n_bars).to_csv(path)
+        return path
+
+
+# 用例名 -> 构造函数：接收工作区与K线数量，返回一个无参的被测函数
+CASES: Dict[str, Callable[[Workspace, int], Callable[[], object]]] = {}
+
+
+def case(name: str):
+    def register(factory):
+        CASES[name] = factory
+        return factory
+
+    return register
+
+
+@case("load_csv")
+def _load_csv(workspace: Workspace, n_bars: int) -> Callable[[], object]:
+    path = workspace.csv(n_bars)
+    loader = LocalCSVLoader(path.parent)
+    return lambda: loader.load(path.stem)
+
+
+@case("validate")
+def _validate(workspace: Workspace, n_bars: int) -> Callable[[], object]:
+    # 打乱顺序，使排序开销计入
+    data = workspace.frame(n_bars).sample(frac=1.0, random_state=0)
+    loader = LocalCSVLoader(Path("."))
+    return lambda: loader.validate(data)
+
+
+@case("generate_signals")
+def _generate_signals(workspace: Workspace, n_bars: int) -> Callable[[], object]:
+    data = workspace.frame(n_bars)
+    StrategyOne({}).generate_signals(data.iloc[:100])  # 预热 numba JIT 编译
+    return lambda: StrategyOne({}).generate_signals(data)
+
+
+@case("backtest_run")
+def _backtest_run(workspace: Workspace, n_bars: int) -> Callable[[], object]:
+    data = workspace.frame(n_bars)
+    StrategyOne({}).generate_signals(data.iloc[:100])
+    engine = BacktestEngine(Settings(), _MemoryLoader(data), _StrategyOneAdapter({}))
+    return lambda: engine.run("BENCH")
+
+
+@case("parse_stockstar")
+def _parse_stockstar(workspace: Workspace, n_bars: int) -> Callable[[], object]:
+    """与K线规模无关，每次调用解析 `n_bars // 1000` 页（至少 1 页）固定页面。"""
+    html = FIXTURE.read_text(encoding="utf-8")
+    pages = max(n_bars // 1000, 1)
+    return lambda: [parse_stock_analysis(html) for _ in range(pages)]
+
+
+def _units(name: str, n_bars: int) -> int:
+    """吞吐的计数单位：解析用例为页数，其余为K线数。"""
+    return max(n_bars // 1000, 1) if name == "parse_stockstar" else n_bars
+
+
+def git_commit() -> Dict[str, object]:
+    """当前提交号与工作区是否有未提交的改动。"""
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": "unknown", "dirty": True}
+    return {"commit": sha, "dirty": dirty}
+
+
+def environment() -> Dict[str, str]:
+    versions = {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__}
+    try:
+        import numba
+
+        versions["numba"] = numba.__version__
+    except ImportError:
+        pass
+    return {**versions, "machine": platform.machine(), "processor": platform.processor() or platform.machine(),
+            "cpu_count": str(os.cpu_count())}
+
+
+def run_suite(
+    sizes: Sequence[int],
+    cases: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+    workdir: Optional[Path] = None,
+    log: Callable[[str], None] = print,
+) -> Dict[str, object]:
+    """运行选定用例，返回可序列化的结果字典。"""
+    names = list(cases or CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"未知的基准用例: {unknown}")
+
+    results: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        workspace = Workspace(Path(tmp))
+        for n_bars in sizes:
+            for name in names:
+                func = CASES[name](workspace, n_bars)
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    func()
+                    timings.append(time.perf_counter() - start)
+                best = min(timings)
+                units = _units(name, n_bars)
+                results.append({
+                    "case": name,
+                    "bars": n_bars,
+                    "best_s": best,
+                    "median_s": statistics.median(timings),
+                    "per_s": units / best if best > 0 else float("inf"),
+                })
+                log(f"{name:<18}{n_bars:>12,}{best:>12.4f} s{units / best:>16,.0f} /s")
+    return {
+        **git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "repeat": repeat,
+        "environment": environment(),
+        "results": results,
+    }
+
+
+def save(report: Dict[str, object], directory: Path = RESULTS_DIR) -> Path:
+    """保存为 ``<commit>.json``，工作区有未提交改动时文件名带 ``-dirty`` 后缀。"""
+    directory.mkdir(parents=True, exist_ok=True)
+    suffix = "-dirty" if report["dirty"] else ""
+    path = directory / f"{report['commit']}{suffix}.json"
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+
+def parse_sizes(text: str) -> List[int]:
+    sizes = []
+    for item in text.split(","):
+        item = item.strip().lower()
+        sizes.append(SIZES[item] if item in SIZES else int(item))
+    return sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help="K线规模，逗号分隔，可用 1k/100k/10m 或整数")
+    parser.add_argument("--cases", default=None, help=f"用例，逗号分隔，默认全部：{','.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例的重复次数")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR, help="结果目录")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    cases = args.cases.split(",") if args.cases else None
+    report = run_suite(parse_sizes(args.sizes), cases, repeat=args.repeat)
+    print(f"已保存到 {save(report, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,53 @@
 class SignalResult:
     """
     信号结果类，用于存储策略生成的信号和相关元数据
+
+    策略可以只提供列式信号 `frame`（quantify.strategies.SignalFrame）与K线索引 `index`，
+    逐K线的 `signals` 序列在首次访问时才由 `frame` 展开；`metadata` 也可以传入无参函数，
+    首次访问时才构造。只使用 `frame` 的调用方（如回测引擎）因此不为逐K线序列分配内存。
     """
     
-    def __init__(self, signals=None, metadata=None):
+    def __init__(self, signals=None, metadata=None, frame=None, index=None):
         """
         初始化信号结果
         
         Args:
-            signals: 信号数据
-            metadata: 元数据字典
+            signals: 信号数据，为空且提供了 frame 与 index 时按需展开
+            metadata: 元数据字典，或返回元数据字典的无参函数
+            frame: 可选的列式信号容器，供回测引擎直接使用
+            index: frame 对应的K线索引，用于展开逐K线的信号序列
         """
-        self.signals = signals if signals is not None else []
-        self.metadata = metadata if metadata is not None else {}
+        self._signals = signals
+        self._metadata = metadata
+        self.frame = frame
+        self.index = index
+
+    @property
+    def signals(self):
+        """逐K线的信号；只提供了 frame 时首次访问才展开"""
+        if self._signals is None:
+            if self.frame is not None and self.index is not None:
+                self._signals = self.frame.to_actions(self.index)
+            else:
+                self._signals = []
+        return self._signals
+
+    @signals.setter
+    def signals(self, value):
+        self._signals = value
+
+    @property
+    def metadata(self):
+        """元数据字典；构造时传入函数的，首次访问才调用"""
+        if self._metadata is None:
+            self._metadata = {}
+        elif callable(self._metadata):
+            self._metadata = self._metadata()
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value):
+        self._metadata = value
     
     def add_signal(self, signal):
         """
@@ -1,28 +1,44 @@
 import sys
-import time
-import concurrent.futures
-import pandas as pd
+import asyncio
 from datetime import datetime
 sys.path.append("../")
-from quantify.features.A_stock import print_a_stock_without_st, fetch_realtime_price, fetch_stock_analysis, is_price_in_front_half, print_info_from_url
+from quantify.config import Settings
+from quantify.features.checkpoint import ScanCheckpoint
+from quantify.features.monitor import LiveMonitor, ScannerSource
+from quantify.features.scanner import AsyncScanner
+from quantify.utils.instrumentation import InstrumentedRun
 from quantify.strategies.analysis import check_and_print_if_undervalued, get_filtered_stock_list
+from quantify.strategies.screener import scan_frame, screen, undervalued_report
 from quantify.consts.stack_code import HSTECH_CODES, A_STOCK_CODES
 
-def process_stock(code):
-    """处理单个股票：获取数据并分析"""
-    try:
-        current_price = fetch_realtime_price(code, timeout=10)
-        analysis_data = fetch_stock_analysis(code)
-        
-        # 检查是否被低估（打印操作在函数内部，注意线程安全问题，print通常是线程安全的）
-        return check_and_print_if_undervalued(code, current_price, analysis_data)
-        
-    except Exception as e:
-        # 忽略一般错误，避免刷屏
-        # print(f"处理 {code} 失败: {e}")
-        pass
 
-if __name__ == "__main__":
+async def scan_undervalued(stock_list, scanner, checkpoint=None):
+    """流式扫描股票列表，边完成边打印低估股票，返回按折价排序的低估股票表与失败数量
+
+    传入断点时跳过已完成的股票，最终结果由断点中的全部记录批量筛选生成，包含之前中断的运行已完成的部分。
+    """
+    found = []
+    failed = 0
+    async for item in scanner.scan(stock_list, checkpoint=checkpoint):
+        if not item.ok:
+            # 忽略一般错误，避免刷屏，仅计数
+            failed += 1
+            continue
+        found.append(item)
+        check_and_print_if_undervalued(item.code, item.price, item.analysis)
+    items = checkpoint.records() if checkpoint is not None else found
+    return undervalued_report(screen(scan_frame(items))), failed
+
+
+async def monitor(stock_list, settings):
+    """盘中常驻监控：按 Settings.monitor 的间隔刷新行情，发现新的低估股票立即打印。"""
+    # 行情不走缓存；估值分析仍写入磁盘缓存，重启后当天不必重新抓取
+    with AsyncScanner.from_settings(settings) as scanner:
+        async with ScannerSource(scanner) as source:
+            await LiveMonitor.from_settings(settings, stock_list, source).run()
+
+
+def main():
     stack_market = ["HK","A"]
     stock_list = []
     # 获取待筛选的股票列表
@@ -33,40 +49,49 @@ if __name__ == "__main__":
     print(f"开始处理 {len(stock_list)} 只股票...")
     if len(stock_list) == 0:
         print("没有找到股票列表，程序结束。")
-        return  
-    
-    # 使用线程池并发处理
-    # max_workers 可以根据机器性能调整，设置为 10-20 比较合适
-    results = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        # 提交所有任务
-        future_to_code = {executor.submit(process_stock, code): code for code in stock_list}
-        
-        # 获取结果
-        for future in concurrent.futures.as_completed(future_to_code):
-            try:
-                result = future.result()
-                if result:
-                    results.append(result)
-            except Exception as exc:
-                # print(f"任务执行异常: {exc}")
-                pass
-            
-    print("扫描完成。")
-    
-    if results:
+        return
+
+    # 使用异步扫描器并发处理，并发度与各主机限速在 Settings.scan 中配置
+    settings = Settings()
+    if sys.argv[1:] == ["monitor"]:
+        # python main.py monitor：交易时段内持续监控，Ctrl+C 退出
+        try:
+            asyncio.run(monitor(stock_list, settings))
+        except KeyboardInterrupt:
+            pass
+        return
+    scanner = AsyncScanner.from_settings(settings)
+    # 同一天同一市场的扫描共用断点文件，中断后重新运行会跳过已完成的股票
+    run_id = f"{datetime.now():%Y%m%d}_{'_'.join(stack_market)}"
+    # Settings.instrumentation.enabled 或 QUANTIFY_INSTRUMENT=1 时，结束后输出各阶段耗时
+    with InstrumentedRun.from_settings(settings), ScanCheckpoint.for_run(settings, run_id) as checkpoint, scanner:
+        if len(checkpoint):
+            print(f"从断点恢复，已完成 {len(checkpoint)} 只股票。")
+        results, failed = asyncio.run(scan_undervalued(stock_list, scanner, checkpoint))
+
+    print(f"扫描完成，失败 {failed} 只。")
+    errors = scanner.policy.error_totals()
+    if errors:
+        # 含重试成功前的失败，按失败类型汇总
+        print("请求失败分类：" + "，".join(f"{kind} {count} 次" for kind, count in sorted(errors.items())))
+
+    if not results.empty:
         print(f"发现 {len(results)} 只低估股票，正在保存到文件...")
-        df = pd.DataFrame(results)
+        df = results
         today_str = datetime.now().strftime('%Y年%m月%d日')
         # 添加日期列
         df['日期'] = today_str
-        
+
         # 调整列顺序，将日期放在第一列
         cols = ['日期'] + [c for c in df.columns if c != '日期']
         df = df[cols]
-        
+
         output_file = f'低估股票{today_str}_{stack_market}.csv'
         df.to_csv(output_file, index=False, encoding='utf-8-sig')
         print(f"已保存到 {output_file}")
     else:
-        print("未发现低估股票。")
\ No newline at end of file
+        print("未发现低估股票。")
+
+
+if __name__ == "__main__":
+    main()
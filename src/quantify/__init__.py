@@ -1,7 +1,12 @@
-"""量化交易框架核心包初始化模块。"""
+"""量化交易框架核心包初始化模块。
 
-from .config.settings import Settings
-from .backtest.engine import BacktestEngine
+子模块与导出对象按需导入，``import quantify`` 本身不加载 pandas、pydantic 等依赖。
+"""
 
-__all__ = ["Settings", "BacktestEngine"]
+from ._lazy import attach
 
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {"Settings": "config.settings", "BacktestEngine": "backtest.engine"},
+    submodules=["backtest", "config", "data", "execution", "features", "strategies", "utils"],
+)
@@ -0,0 +1,50 @@
+"""包级别的延迟导入（PEP 562）。
+
+包的 ``__init__`` 只声明导出名称所在的子模块，首次访问时才导入对应子模块，
+因此 ``import quantify`` 不再连带加载 pandas、pydantic、akshare 等重型依赖，
+短时运行的脚本与命令行只为实际用到的功能付出导入开销。
+
+用法::
+
+    __getattr__, __dir__, __all__ = attach(__name__, {"BacktestEngine": "engine"}, submodules=["engine"])
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+def attach(
+    package: str,
+    attributes: Dict[str, str],
+    submodules: Iterable[str] = (),
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """
+    生成包的 ``__getattr__``、``__dir__`` 与 ``__all__``。
+
+    Args:
+        package: 包名，通常传入 ``__name__``
+        attributes: 导出名称 -> 定义它的子模块（相对包的名称）
+        submodules: 可以作为属性直接访问的子模块
+
+    Returns:
+        (__getattr__, __dir__, __all__)
+    """
+    submodules = set(submodules)
+    names = sorted(set(attributes) | submodules)
+
+    def __getattr__(name: str) -> Any:
+        if name in attributes:
+            value = getattr(importlib.import_module(f"{package}.{attributes[name]}"), name)
+        elif name in submodules:
+            value = importlib.import_module(f"{package}.{name}")
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        # 缓存到包的命名空间，之后的访问不再经过 __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(names))
+
+    return __getattr__, __dir__, sorted(attributes)
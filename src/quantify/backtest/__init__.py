@@ -1,6 +1,16 @@
 """回测引擎模块。"""
 
-from .engine import BacktestEngine
-
-__all__ = ["BacktestEngine"]
+from .._lazy import attach
 
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "BacktestEngine": "engine",
+        "BacktestResult": "engine",
+        "CrossSectionResult": "cross_section",
+        "CrossSectionalEngine": "cross_section",
+        "ParallelBacktestRunner": "parallel",
+        "UniverseBacktestResult": "engine",
+    },
+    submodules=["cross_section", "engine", "parallel"],
+)
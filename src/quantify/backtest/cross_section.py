@@ -0,0 +1,135 @@
+"""截面组合回测：按策略给出的 日期 × 标的 目标权重每日调仓，整段回测是一组数组运算。
+
+第 t 日收盘后按目标权重调仓，持有到 t+1 日收盘，组合收益为权重与个股日收益逐行的内积；
+换手为相邻两日权重之差的绝对值之和，交易成本按换手乘以 `cost_rate` 扣除。
+停牌日（当日无收盘价）无法交易，该标的沿用前一日权重、收益记为 0，复牌日按与停牌前
+收盘价的比值计算收益；可交易标的按比例缩减，只分配停牌标的占用之外的仓位。
+
+内存：面板之外约需 `_WORK_ARRAYS` 个与面板字段同尺寸的 float32 中间数组，
+运行前连同面板一起按 `Settings.cross_section.max_memory_mb` 检查，超出时抛出 MemoryError。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from ..config import Settings
+from ..data.panel import Panel, check_budget
+from ..strategies.cross_section import CrossSectionalStrategy
+from ..utils.instrumentation import timed
+from .engine import TRADING_DAYS_PER_YEAR, _max_drawdown
+
+# 目标权重、前值填充后的收盘价、日收益、临时乘积与排名用的 int64 下标（计两份）等
+_WORK_ARRAYS = 8
+
+
+@dataclass
+class CrossSectionResult:
+    """截面组合回测结果，`weights` 为实际持有的 日期 × 标的 权重。"""
+
+    dates: pd.DatetimeIndex
+    symbols: pd.Index
+    weights: np.ndarray
+    equity_curve: pd.Series
+    returns: pd.Series
+    turnover: pd.Series
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    def holdings(self, date: Any) -> pd.Series:
+        """某日收盘后的持仓权重，按权重降序。"""
+        row = self.weights[self.dates.get_loc(pd.Timestamp(date))]
+        held = np.flatnonzero(row > 0)
+        return pd.Series(row[held], index=self.symbols[held], name="weight").sort_values(ascending=False)
+
+
+class CrossSectionalEngine:
+    """截面策略的组合回测引擎。"""
+
+    def __init__(self, settings: Settings, strategy: CrossSectionalStrategy):
+        self._settings = settings
+        self._strategy = strategy
+
+    @property
+    def max_bytes(self) -> int:
+        return int(self._settings.cross_section.max_memory_mb * 2**20)
+
+    @property
+    def cost_rate(self) -> float:
+        """每单位换手（买入与卖出之和）的交易成本，默认为佣金费率加一半印花税（约一半换手为卖出）。"""
+        config = self._settings.cross_section
+        if config.cost_rate is not None:
+            return config.cost_rate
+        execution = self._settings.execution
+        return execution.commission_rate + execution.stamp_duty / 2
+
+    def load_panel(self, loader: Any, symbols: Any, **kwargs: Any) -> Panel:
+        """按配置的数据类型加载面板，预计超出内存预算时在分配前抛出 MemoryError。"""
+        dtype = np.dtype(self._settings.cross_section.dtype)
+        return Panel.from_loader(loader, symbols, dtype=dtype, max_bytes=self.max_bytes, **kwargs)
+
+    @timed("backtest.cross_section")
+    def run(self, panel: Panel) -> CrossSectionResult:
+        n_dates, n_symbols = panel.shape
+        check_budget(panel.nbytes + _WORK_ARRAYS * n_dates * n_symbols * 4, self.max_bytes, "截面回测")
+        close = panel["close"]
+        suspended = np.isnan(close)
+
+        # 停牌日无法调仓：停牌标的沿用前一日权重，可交易标的只分配剩余的仓位
+        target = self._strategy.target_weights(panel)
+        weights = pd.DataFrame(np.where(suspended, np.nan, target)).ffill().fillna(0.0).to_numpy(np.float32)
+        del target
+        locked = np.where(suspended, weights, 0).sum(axis=1, dtype=np.float64)
+        free = weights.sum(axis=1, dtype=np.float64) - locked
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(free > 0, np.clip((1.0 - locked) / free, 0.0, 1.0), 1.0)
+        weights *= np.where(suspended, np.float32(1), scale.astype(np.float32)[:, None])
+        weights /= np.maximum(weights.sum(axis=1, dtype=np.float64), 1.0).astype(np.float32)[:, None]
+
+        filled = pd.DataFrame(close).ffill().to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            asset_returns = filled[1:] / filled[:-1] - 1
+        del filled
+        asset_returns[~np.isfinite(asset_returns)] = 0
+        daily = np.zeros(n_dates)
+        daily[1:] = (weights[:-1] * asset_returns).sum(axis=1, dtype=np.float64)
+        del asset_returns
+
+        turnover = np.empty(n_dates)
+        turnover[0] = weights[0].sum(dtype=np.float64)
+        turnover[1:] = np.abs(np.diff(weights, axis=0)).sum(axis=1, dtype=np.float64)
+        daily -= turnover * self.cost_rate
+
+        initial_capital = self._settings.backtest.initial_capital
+        equity = initial_capital * np.cumprod(1.0 + daily)
+        return CrossSectionResult(
+            dates=panel.dates,
+            symbols=panel.symbols,
+            weights=weights,
+            equity_curve=pd.Series(equity, index=panel.dates, name="equity"),
+            returns=pd.Series(daily, index=panel.dates, name="return"),
+            turnover=pd.Series(turnover, index=panel.dates, name="turnover"),
+            metrics=self._metrics(equity, daily, turnover, weights, initial_capital),
+        )
+
+    def _metrics(self, equity: np.ndarray, daily: np.ndarray, turnover: np.ndarray, weights: np.ndarray,
+                 initial_capital: float) -> Dict[str, Any]:
+        n_dates = len(equity)
+        total_return = float(equity[-1] / initial_capital - 1.0)
+        years = max(n_dates - 1, 1) / TRADING_DAYS_PER_YEAR
+        annual_return = float((1.0 + total_return) ** (1.0 / years) - 1.0) if total_return > -1.0 else -1.0
+        volatility = float(daily[1:].std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)) if n_dates > 2 else 0.0
+        return {
+            "environment": self._settings.environment,
+            "initial_capital": initial_capital,
+            "final_equity": float(equity[-1]),
+            "total_return": total_return,
+            "annual_return": annual_return,
+            "volatility": volatility,
+            "sharpe": float(daily[1:].mean() * TRADING_DAYS_PER_YEAR / volatility) if volatility > 0 else 0.0,
+            "max_drawdown": float(_max_drawdown(equity)),
+            "average_turnover": float(turnover.mean()),
+            "average_holdings": float((weights > 0).sum(axis=1).mean()),
+            "cost_rate": self.cost_rate,
+        }
@@ -1,13 +1,21 @@
 """轻量级回测引擎实现，连接数据、策略与配置。"""
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 from ..config import Settings
 from ..data import DataLoader
-from ..strategies import BaseStrategy, Signal
+from ..data.calendar import TradingCalendar
+from ..execution import PaperBroker
+from ..strategies import BaseStrategy, SignalFrame
+from ..strategies.signals import NAT
+from ..utils.instrumentation import timed
+
+# 年化换算使用的交易日数量
+TRADING_DAYS_PER_YEAR = 252
 
 
 @dataclass
@@ -15,11 +23,25 @@ class BacktestResult:
     """回测结果容器。"""
 
     symbol: str
-    signals: List[Signal] = field(default_factory=list)
+    signals: SignalFrame = field(default_factory=SignalFrame.empty)
     metrics: Dict[str, Any] = field(default_factory=dict)
     raw_data: Optional[pd.DataFrame] = None
 
 
+@dataclass
+class UniverseBacktestResult:
+    """多标的组合回测结果容器。"""
+
+    symbols: List[str]
+    signals: SignalFrame = field(default_factory=SignalFrame.empty)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    symbol_metrics: Optional[pd.DataFrame] = None
+    equity_curve: Optional[pd.Series] = None
+    cash: Optional[pd.Series] = None
+    positions: Optional[pd.DataFrame] = None
+    fills: Optional[pd.DataFrame] = None
+
+
 class _SimpleContext:
     """基础策略上下文实现，提供最小依赖。"""
 
@@ -41,25 +63,66 @@ class _SimpleContext:
         return self._records
 
 
+def _collect(signals: Any) -> SignalFrame:
+    """策略可直接返回 `SignalFrame`，也可以逐条产出 `Signal`。"""
+    return signals if isinstance(signals, SignalFrame) else SignalFrame.from_signals(signals)
+
+
+def _forward_fill_index(mask: np.ndarray) -> np.ndarray:
+    """返回每个时间点之前（含当前）最近一次 mask 为真的行号，尚未出现时为 -1。"""
+    rows = np.arange(mask.shape[0])[:, None]
+    idx = np.where(mask, rows, -1)
+    return np.maximum.accumulate(idx, axis=0)
+
+
+def _max_drawdown(equity: np.ndarray) -> np.ndarray:
+    """按列计算最大回撤，输入为时间 × 标的的净值矩阵或一维净值序列。"""
+    peak = np.maximum.accumulate(equity, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak > 0, 1.0 - equity / peak, 0.0)
+    return drawdown.max(axis=0)
+
+
 class BacktestEngine:
     """回测引擎，将策略信号组合成结果输出。"""
 
-    def __init__(self, settings: Settings, data_loader: DataLoader, strategy: BaseStrategy):
+    def __init__(
+        self,
+        settings: Settings,
+        data_loader: DataLoader,
+        strategy: BaseStrategy,
+        broker_factory: Optional[Callable[[], PaperBroker]] = None,
+        calendar: Optional[TradingCalendar] = None,
+    ):
+        """
+        Args:
+            broker_factory: 可选的模拟券商构造函数，组合回测改为逐根K线撮合；
+                每次回测新建一个券商，如 ``functools.partial(PaperBroker.from_settings, settings)``
+            calendar: 可选的交易日历，组合回测的日期轴改为该日历的交易日网格，
+                停牌日（网格内无K线）不可交易、价格沿用前值；默认使用各标的日期的并集
+        """
         self._settings = settings
         self._data_loader = data_loader
         self._strategy = strategy
+        self._broker_factory = broker_factory
+        self._calendar = calendar
         self._context = _SimpleContext()
 
-    def run(self, symbol: str, **kwargs) -> BacktestResult:
-        """执行单标的回测流程。"""
+    def _load(self, symbol: str, **kwargs) -> pd.DataFrame:
+        """加载单个标的数据并校验索引类型。"""
         raw_data = self._data_loader.load(symbol, **kwargs)
         if not isinstance(raw_data.index, pd.DatetimeIndex):
             raise TypeError("数据索引必须为 DatetimeIndex 以便对齐时间序列")
-
         raw_data.attrs["symbol"] = symbol
+        return raw_data
+
+    @timed("backtest.run")
+    def run(self, symbol: str, **kwargs) -> BacktestResult:
+        """执行单标的回测流程。"""
+        raw_data = self._load(symbol, **kwargs)
 
         self._strategy.on_start(self._context)
-        signals = list(self._strategy.generate_signals(raw_data, self._context))
+        signals = _collect(self._strategy.generate_signals(raw_data, self._context))
         self._strategy.on_finish(self._context)
 
         # 简化处理：这里只返回策略信号，真实项目可扩展仓位、资金曲线等计算
@@ -69,3 +132,292 @@ class BacktestEngine:
             **self._context.records,
         }
         return BacktestResult(symbol=symbol, signals=signals, metrics=metrics, raw_data=raw_data)
+
+    @timed("backtest.run_universe")
+    def run_universe(self, symbols: Sequence[str], **kwargs) -> UniverseBacktestResult:
+        """执行多标的组合回测。
+
+        所有标的按日期对齐成 日期 × 标的 面板，成交、持仓、现金与组合净值均以
+        NumPy 数组运算一次性完成。资金按标的等分为独立子账户，BUY 信号以当日
+        收盘价满仓买入，SELL 信号以当日收盘价清仓；未携带 timestamp 的信号视为
+        发生在该标的最后一根K线。
+
+        构造引擎时传入 `broker_factory` 则改为逐根K线经新建的模拟券商撮合，计入佣金、
+        印花税、T+1 与整手规则，见 `_route_through_broker`。
+        """
+        config = self._settings.backtest
+        start, end = pd.Timestamp(config.start), pd.Timestamp(config.end)
+
+        frames: Dict[str, pd.DataFrame] = {}
+        parts: List[SignalFrame] = []
+        self._strategy.on_start(self._context)
+        for symbol in symbols:
+            raw_data = self._load(symbol, **kwargs).sort_index().loc[start:end]
+            if raw_data.empty:
+                continue
+            frames[symbol] = raw_data
+            parts.append(_collect(self._strategy.generate_signals(raw_data, self._context)))
+        self._strategy.on_finish(self._context)
+        signals = SignalFrame.concat(parts)
+
+        loaded = list(frames)
+        if not loaded:
+            metrics = {
+                "environment": self._settings.environment,
+                "initial_capital": config.initial_capital,
+                "final_equity": config.initial_capital,
+                "total_return": 0.0,
+                "signal_count": len(signals),
+                **self._context.records,
+            }
+            return UniverseBacktestResult(symbols=[], signals=signals, metrics=metrics)
+
+        close_frame = pd.concat({symbol: frames[symbol]["close"] for symbol in loaded}, axis=1).sort_index()
+        if self._calendar is not None:
+            close_frame = close_frame.reindex(self._calendar.grid(close_frame.index[0], close_frame.index[-1]))
+        dates = close_frame.index
+        traded = close_frame.notna().to_numpy()
+        close = close_frame.ffill().to_numpy(dtype=np.float64)
+        n_dates, n_symbols = close.shape
+
+        actions = self._signal_panel(signals, dates, loaded, frames)
+
+        # 使用模拟券商时以其账户资金为准；每次回测新建券商，不继承上一次的资金、持仓与成交
+        broker = self._broker_factory() if self._broker_factory is not None else None
+        initial_capital = broker.cash if broker is not None else config.initial_capital
+        sleeve_capital = initial_capital / n_symbols
+        if broker is not None:
+            equity, portfolio_cash, shares, fills = self._route_through_broker(
+                broker, frames, loaded, dates, actions, sleeve_capital
+            )
+            held = shares > 0
+            trade_count = np.bincount(
+                pd.Index(loaded).get_indexer(fills.loc[fills["side"] == "BUY", "symbol"]), minlength=n_symbols
+            )
+        else:
+            equity, portfolio_cash, shares, fills, held, entries = self._vectorized_sleeves(
+                actions, close, dates, loaded, sleeve_capital
+            )
+            trade_count = entries.sum(axis=0)
+
+        return self._universe_result(
+            loaded, signals, dates, traded, equity, portfolio_cash, shares, fills, held, trade_count,
+            (actions != 0).sum(axis=0), initial_capital, sleeve_capital, self._context.records,
+            broker is not None,
+        )
+
+    def _universe_result(
+        self,
+        symbols: List[str],
+        signals: SignalFrame,
+        dates: pd.DatetimeIndex,
+        traded: np.ndarray,
+        equity: np.ndarray,
+        portfolio_cash: np.ndarray,
+        shares: np.ndarray,
+        fills: pd.DataFrame,
+        held: np.ndarray,
+        trade_count: np.ndarray,
+        signal_count: np.ndarray,
+        initial_capital: float,
+        sleeve_capital: float,
+        records: Dict[str, float],
+        brokered: bool = False,
+    ) -> UniverseBacktestResult:
+        """由各子账户的 日期 × 标的 净值与持仓汇总组合指标。"""
+        n_dates = len(dates)
+        portfolio_equity = equity.sum(axis=1)
+        symbol_metrics = pd.DataFrame(
+            {
+                "total_return": equity[-1] / sleeve_capital - 1.0,
+                "max_drawdown": _max_drawdown(equity),
+                "trade_count": trade_count,
+                "exposure": held.sum(axis=0) / np.maximum(traded.sum(axis=0), 1),
+                "signal_count": signal_count,
+                "final_equity": equity[-1],
+            },
+            index=pd.Index(symbols, name="symbol"),
+        )
+
+        daily_returns = np.zeros(n_dates)
+        daily_returns[1:] = portfolio_equity[1:] / portfolio_equity[:-1] - 1.0
+        volatility = float(daily_returns[1:].std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR)) if n_dates > 2 else 0.0
+        total_return = float(portfolio_equity[-1] / initial_capital - 1.0)
+        years = max(n_dates - 1, 1) / TRADING_DAYS_PER_YEAR
+        annual_return = float((1.0 + total_return) ** (1.0 / years) - 1.0) if total_return > -1.0 else -1.0
+        metrics = {
+            "environment": self._settings.environment,
+            "initial_capital": initial_capital,
+            "final_equity": float(portfolio_equity[-1]),
+            "total_return": total_return,
+            "annual_return": annual_return,
+            "volatility": volatility,
+            "sharpe": float(daily_returns[1:].mean() * TRADING_DAYS_PER_YEAR / volatility) if volatility > 0 else 0.0,
+            "max_drawdown": float(_max_drawdown(portfolio_equity)),
+            "trade_count": int(trade_count.sum()),
+            "signal_count": len(signals),
+            **records,
+        }
+        if brokered:
+            metrics["commission"] = float(fills["commission"].sum())
+            metrics["tax"] = float(fills["tax"].sum())
+        return UniverseBacktestResult(
+            symbols=symbols,
+            signals=signals,
+            metrics=metrics,
+            symbol_metrics=symbol_metrics,
+            equity_curve=pd.Series(portfolio_equity, index=dates, name="equity"),
+            cash=pd.Series(portfolio_cash, index=dates, name="cash"),
+            positions=pd.DataFrame(shares, index=dates, columns=symbols),
+            fills=fills,
+        )
+
+    @staticmethod
+    def _vectorized_sleeves(
+        actions: np.ndarray,
+        close: np.ndarray,
+        dates: pd.DatetimeIndex,
+        symbols: List[str],
+        sleeve_capital: float,
+    ):
+        """以收盘价即时成交、不计费用的子账户模型，全部以数组运算完成。"""
+        n_symbols = close.shape[1]
+        # 持仓状态：最近一次有效信号为 BUY 则持有
+        last_action_row = _forward_fill_index(actions != 0)
+        cols = np.arange(n_symbols)
+        held = (last_action_row >= 0) & (actions[np.maximum(last_action_row, 0), cols] > 0)
+
+        prev_held = np.zeros_like(held)
+        prev_held[1:] = held[:-1]
+        entries = held & ~prev_held
+        exits = ~held & prev_held
+
+        # 子账户净值：持仓期间随收盘价收益复利增长
+        returns = np.zeros_like(close)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[1:] = close[1:] / close[:-1] - 1.0
+        returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+        equity = sleeve_capital * np.cumprod(1.0 + prev_held * returns, axis=0)
+
+        # 持股数量在建仓当日确定，持有期间保持不变
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entry_shares = np.where(entries, equity / close, 0.0)
+        last_entry_row = _forward_fill_index(entries)
+        shares = np.where(held, entry_shares[np.maximum(last_entry_row, 0), cols], 0.0)
+        cash = equity - shares * np.nan_to_num(close, nan=0.0)
+
+        fills = BacktestEngine._fills_frame(entries, exits, dates, symbols, close, entry_shares, shares)
+        return equity, cash.sum(axis=1), shares, fills, held, entries
+
+    def _route_through_broker(
+        self,
+        broker: PaperBroker,
+        frames: Dict[str, pd.DataFrame],
+        symbols: List[str],
+        dates: pd.DatetimeIndex,
+        actions: np.ndarray,
+        sleeve_capital: float,
+    ):
+        """逐根K线驱动模拟券商：信号在当根收盘后下市价单，下一根K线开盘撮合。
+
+        资金按标的等分为子账户，BUY 以子账户可用资金按整手买入，SELL 卖出全部持仓；
+        佣金、印花税、T+1 与整手规则由 `PaperBroker` 处理。
+        """
+        n_dates, n_symbols = actions.shape
+        sleeve_cash = np.full(n_symbols, sleeve_capital)
+        symbol_cash = np.empty((n_dates, n_symbols))
+        shares = np.zeros((n_dates, n_symbols))
+        cash = np.empty(n_dates)
+
+        bars = {}
+        for j, symbol in enumerate(symbols):
+            frame = frames[symbol].reindex(dates)
+            bars[j] = frame[["open", "high", "low", "close"]].to_numpy(dtype=np.float64)
+        column_of = {symbol: j for j, symbol in enumerate(symbols)}
+        lot = broker.lot_size
+        rate = broker.commission_rate
+
+        for t, timestamp in enumerate(dates.asi8):
+            start = len(broker.fills)
+            for j, symbol in enumerate(symbols):
+                open_, high, low, close = bars[j][t]
+                if not np.isnan(close):
+                    broker.on_bar(symbol, timestamp, open_, high, low, close)
+            fills = broker.fills
+            for i in range(start, len(fills)):
+                j = column_of[broker.symbols[fills.symbol_id[i]]]
+                amount = fills.price[i] * fills.quantity[i]
+                sleeve_cash[j] += -fills.side[i] * amount - fills.commission[i] - fills.tax[i]
+
+            for j, symbol in enumerate(symbols):
+                close = bars[j][t][3]
+                if np.isnan(close) or broker.has_open_orders(symbol):
+                    continue
+                position = broker.position(symbol)
+                if actions[t, j] > 0 and position == 0:
+                    budget = min(sleeve_cash[j], broker.cash)
+                    quantity = int(budget / (close * (1.0 + rate)) // lot * lot)
+                    if quantity > 0:
+                        broker.submit(symbol, "BUY", quantity, timestamp=timestamp)
+                elif actions[t, j] < 0 and position > 0:
+                    broker.submit(symbol, "SELL", position, timestamp=timestamp)
+
+            symbol_cash[t] = sleeve_cash
+            shares[t] = [broker.position(symbol) for symbol in symbols]
+            cash[t] = broker.cash
+
+        marks = np.column_stack([pd.Series(bars[j][:, 3]).ffill().fillna(0.0).to_numpy() for j in range(n_symbols)])
+        equity = symbol_cash + shares * marks
+        return equity, cash, shares, broker.fills_frame()
+
+    @staticmethod
+    def _signal_panel(
+        signals: SignalFrame,
+        dates: pd.DatetimeIndex,
+        symbols: List[str],
+        frames: Dict[str, pd.DataFrame],
+    ) -> np.ndarray:
+        """将信号映射为 日期 × 标的 的动作矩阵（1 买入，-1 卖出，0 无动作）。"""
+        actions = np.zeros((len(dates), len(symbols)), dtype=np.int8)
+        if not len(signals):
+            return actions
+        column_of = pd.Index(symbols).get_indexer(list(signals.symbols))
+        cols = column_of[signals.symbol_id]
+        timestamps = signals.timestamp.copy()
+        undated = timestamps == NAT
+        if undated.any():
+            # 未携带时间的信号视为发生在该标的最后一根K线
+            for sid in np.unique(signals.symbol_id[undated & (cols >= 0)]):
+                mask = undated & (signals.symbol_id == sid)
+                timestamps[mask] = frames[signals.symbols[sid]].index[-1].value
+        rows = dates.get_indexer(pd.DatetimeIndex(timestamps.view("datetime64[ns]")))
+        valid = (cols >= 0) & (rows >= 0)
+        # 同一K线多次信号时以最后一次为准，与逐条处理的语义一致
+        actions[rows[valid], cols[valid]] = signals.action[valid]
+        return actions
+
+    @staticmethod
+    def _fills_frame(
+        entries: np.ndarray,
+        exits: np.ndarray,
+        dates: pd.DatetimeIndex,
+        symbols: List[str],
+        close: np.ndarray,
+        entry_shares: np.ndarray,
+        shares: np.ndarray,
+    ) -> pd.DataFrame:
+        """汇总全部成交记录。"""
+        prev_shares = np.zeros_like(shares)
+        prev_shares[1:] = shares[:-1]
+        buy_rows, buy_cols = np.nonzero(entries)
+        sell_rows, sell_cols = np.nonzero(exits)
+        fills = pd.DataFrame(
+            {
+                "date": np.concatenate([dates[buy_rows], dates[sell_rows]]),
+                "symbol": np.asarray(symbols, dtype=object)[np.concatenate([buy_cols, sell_cols])],
+                "side": ["BUY"] * len(buy_rows) + ["SELL"] * len(sell_rows),
+                "price": np.concatenate([close[buy_rows, buy_cols], close[sell_rows, sell_cols]]),
+                "shares": np.concatenate([entry_shares[buy_rows, buy_cols], prev_shares[sell_rows, sell_cols]]),
+            }
+        )
+        return fills.sort_values(["date", "symbol"], kind="stable").reset_index(drop=True)
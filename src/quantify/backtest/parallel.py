@@ -0,0 +1,263 @@
+"""多进程组合回测：按标的切分到多个工作进程，行情面板只在共享内存中放置一份。
+
+`BacktestEngine.run_universe` 的无券商模型中，各标的子账户互不影响，
+因此可以把标的分块交给不同进程分别生成信号并计算子账户净值：
+
+1. 主进程加载全部标的，按统一日期轴写入共享内存中的 标的 × 日期 面板；
+2. 工作进程在初始化时挂载面板，每个任务只传递标的的起止列号；
+3. 各进程把子账户净值、持仓直接写回共享内存中的输出面板，只返回列式信号、成交等小对象；
+4. 主进程合并后按与单进程相同的方式汇总组合指标。
+
+策略对象在每个工作进程初始化时传入一次，需要可以被 pickle（使用 fork 启动时无此要求）。
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import Settings
+from ..data import DataLoader
+from ..data.calendar import TradingCalendar
+from ..strategies import BaseStrategy, SignalFrame
+from ..utils.instrumentation import timed
+from .engine import BacktestEngine, UniverseBacktestResult, _collect, _SimpleContext
+
+# 面板中除行情字段外的输出与辅助数组
+_PRESENT = "__present__"
+_EQUITY = "__equity__"
+_SHARES = "__shares__"
+_HELD = "__held__"
+
+
+class SharedPanel:
+    """共享内存中的一组 标的 × 日期 二维数组，按标的存储，单个标的的数据连续。"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, specs: Dict[str, Tuple[int, str]], shape: Tuple[int, int],
+                 owner: bool):
+        self.shm = shm
+        self.specs = specs
+        self.shape = shape
+        self._owner = owner
+
+    @classmethod
+    def create(cls, dtypes: Dict[str, str], shape: Tuple[int, int]) -> "SharedPanel":
+        specs: Dict[str, Tuple[int, str]] = {}
+        offset = 0
+        cells = shape[0] * shape[1]
+        for name, dtype in dtypes.items():
+            specs[name] = (offset, np.dtype(dtype).str)
+            # 按 8 字节对齐，保证每个视图都满足 float64 对齐要求
+            offset += (cells * np.dtype(dtype).itemsize + 7) // 8 * 8
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+        return cls(shm, specs, shape, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, specs: Dict[str, Tuple[int, str]], shape: Tuple[int, int]) -> "SharedPanel":
+        return cls(shared_memory.SharedMemory(name=name), specs, shape, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def view(self, name: str) -> np.ndarray:
+        offset, dtype = self.specs[name]
+        return np.ndarray(self.shape, dtype=np.dtype(dtype), buffer=self.shm.buf, offset=offset)
+
+    def close(self) -> None:
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+# 工作进程内挂载的面板与任务上下文
+_WORKER: Dict[str, Any] = {}
+
+
+def _attach(shm_name: str, specs: Dict[str, Tuple[int, str]], shape: Tuple[int, int], fields: List[str],
+            dates: np.ndarray, symbols: List[str], strategy: BaseStrategy, sleeve_capital: float) -> None:
+    """进程池初始化：挂载共享面板，整个进程生命周期内复用。"""
+    _WORKER["panel"] = SharedPanel.attach(shm_name, specs, shape)
+    _WORKER["fields"] = fields
+    _WORKER["dates"] = pd.DatetimeIndex(dates)
+    _WORKER["symbols"] = symbols
+    _WORKER["strategy"] = strategy
+    _WORKER["sleeve_capital"] = sleeve_capital
+
+
+def _detach() -> None:
+    panel = _WORKER.pop("panel", None)
+    if panel is not None:
+        panel.close()
+    _WORKER.clear()
+
+
+def _backtest_chunk(lo: int, hi: int) -> Dict[str, Any]:
+    """回测第 [lo, hi) 列标的，净值、持仓写入共享面板，返回信号、成交与计数。"""
+    panel: SharedPanel = _WORKER["panel"]
+    dates: pd.DatetimeIndex = _WORKER["dates"]
+    symbols: List[str] = _WORKER["symbols"][lo:hi]
+    strategy: BaseStrategy = _WORKER["strategy"]
+    context = _SimpleContext()
+    present = panel.view(_PRESENT)
+    views = {field: panel.view(field) for field in _WORKER["fields"]}
+
+    frames: Dict[str, pd.DataFrame] = {}
+    parts: List[SignalFrame] = []
+    strategy.on_start(context)
+    for j, symbol in zip(range(lo, hi), symbols):
+        rows = present[j].astype(bool)
+        frame = pd.DataFrame({field: view[j][rows] for field, view in views.items()}, index=dates[rows])
+        frame.attrs["symbol"] = symbol
+        frames[symbol] = frame
+        parts.append(_collect(strategy.generate_signals(frame, context)))
+    strategy.on_finish(context)
+    signals = SignalFrame.concat(parts)
+
+    actions = BacktestEngine._signal_panel(signals, dates, symbols, frames)
+    close = pd.DataFrame(views["close"][lo:hi].T).ffill().to_numpy(dtype=np.float64)
+    equity, cash, shares, fills, held, entries = BacktestEngine._vectorized_sleeves(
+        actions, close, dates, symbols, _WORKER["sleeve_capital"]
+    )
+    panel.view(_EQUITY)[lo:hi] = equity.T
+    panel.view(_SHARES)[lo:hi] = shares.T
+    panel.view(_HELD)[lo:hi] = held.T
+    return {
+        "signals": signals,
+        "fills": fills,
+        "cash": cash,
+        "trade_count": entries.sum(axis=0),
+        "signal_count": (actions != 0).sum(axis=0),
+        "records": context.records,
+    }
+
+
+class ParallelBacktestRunner:
+    """多进程执行 `BacktestEngine.run_universe` 的无券商组合回测，结果与使用相同日历的单进程引擎一致。"""
+
+    def __init__(
+        self,
+        settings: Settings,
+        data_loader: DataLoader,
+        strategy: BaseStrategy,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        start_method: Optional[str] = None,
+        calendar: Optional[TradingCalendar] = None,
+    ):
+        """
+        Args:
+            settings: 全局配置，回测区间与资金取自 `Settings.backtest`
+            data_loader: 数据加载器，只在主进程中调用
+            strategy: 策略对象，每个工作进程持有一份副本
+            max_workers: 工作进程数，默认取 `Settings.parallel`，再默认为 CPU 核数
+            chunk_size: 每个任务包含的标的数量，默认取 `Settings.parallel`
+            start_method: 进程启动方式，默认取 `Settings.parallel`
+            calendar: 可选的交易日历，与 `BacktestEngine` 相同：日期轴为该日历的交易日网格，
+                网格外的K线被丢弃；默认使用各标的日期的并集
+        """
+        config = settings.parallel
+        self._settings = settings
+        self._strategy = strategy
+        self._calendar = calendar
+        self._engine = BacktestEngine(settings, data_loader, strategy, calendar=calendar)
+        self.max_workers = max_workers or config.max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or config.chunk_size
+        self.start_method = start_method or config.start_method
+
+    def _load_frames(self, symbols: Sequence[str], **kwargs) -> Dict[str, pd.DataFrame]:
+        config = self._settings.backtest
+        start, end = pd.Timestamp(config.start), pd.Timestamp(config.end)
+        frames: Dict[str, pd.DataFrame] = {}
+        for symbol in symbols:
+            raw_data = self._engine._load(symbol, **kwargs).sort_index().loc[start:end]
+            if not raw_data.empty:
+                frames[symbol] = raw_data
+        return frames
+
+    @staticmethod
+    def _fields(frames: Dict[str, pd.DataFrame]) -> List[str]:
+        """全部标的共有的数值字段，整数列在面板中以 float64 保存。"""
+        first = next(iter(frames.values()))
+        fields = [c for c in first.columns if pd.api.types.is_numeric_dtype(first[c])]
+        for frame in frames.values():
+            fields = [c for c in fields if c in frame.columns]
+        return fields
+
+    @timed("backtest.run_parallel")
+    def run_universe(self, symbols: Sequence[str], **kwargs) -> UniverseBacktestResult:
+        """加载全部标的后分块并行回测，返回与 `BacktestEngine.run_universe` 相同结构的结果。"""
+        frames = self._load_frames(symbols, **kwargs)
+        if not frames:
+            return self._engine.run_universe([], **kwargs)
+
+        loaded = list(frames)
+        dates_ns = np.unique(np.concatenate([frame.index.asi8 for frame in frames.values()]))
+        if self._calendar is not None:
+            dates_ns = self._calendar.grid(pd.Timestamp(dates_ns[0]), pd.Timestamp(dates_ns[-1])).asi8
+        dates = pd.DatetimeIndex(dates_ns)
+        fields = self._fields(frames)
+        if "close" not in fields:
+            raise ValueError("组合回测需要 close 字段")
+        shape = (len(loaded), len(dates))
+        dtypes = {**{field: "f8" for field in fields}, _PRESENT: "u1", _EQUITY: "f8", _SHARES: "f8", _HELD: "u1"}
+        panel = SharedPanel.create(dtypes, shape)
+        try:
+            views = {field: panel.view(field) for field in fields}
+            present = panel.view(_PRESENT)
+            present[:] = 0
+            for j, frame in enumerate(frames.values()):
+                rows = dates.get_indexer(frame.index)
+                keep = rows >= 0
+                rows = rows[keep]
+                present[j, rows] = 1
+                for field, view in views.items():
+                    view[j] = np.nan
+                    view[j, rows] = frame[field].to_numpy(dtype=np.float64)[keep]
+            del frames
+
+            initial_capital = self._settings.backtest.initial_capital
+            sleeve_capital = initial_capital / len(loaded)
+            tasks = [(lo, min(lo + self.chunk_size, len(loaded))) for lo in range(0, len(loaded), self.chunk_size)]
+            initargs = (panel.name, panel.specs, shape, fields, dates_ns, loaded, self._strategy, sleeve_capital)
+            outputs = self._execute(tasks, initargs)
+
+            equity = np.array(panel.view(_EQUITY).T)
+            shares = np.array(panel.view(_SHARES).T)
+            held = panel.view(_HELD).T.astype(bool)
+            traded = ~np.isnan(views["close"].T)
+        finally:
+            panel.close()
+
+        signals = SignalFrame.concat([output["signals"] for output in outputs])
+        fills = pd.concat([output["fills"] for output in outputs], ignore_index=True)
+        fills = fills.sort_values(["date", "symbol"], kind="stable").reset_index(drop=True)
+        records: Dict[str, float] = {}
+        for output in outputs:
+            records.update(output["records"])
+        return self._engine._universe_result(
+            loaded, signals, dates, traded, equity, sum(output["cash"] for output in outputs), shares, fills, held,
+            np.concatenate([output["trade_count"] for output in outputs]),
+            np.concatenate([output["signal_count"] for output in outputs]),
+            initial_capital, sleeve_capital, records,
+        )
+
+    def _execute(self, tasks: List[Tuple[int, int]], initargs: tuple) -> List[Dict[str, Any]]:
+        if self.max_workers == 1 or len(tasks) == 1:
+            _attach(*initargs)
+            try:
+                return [_backtest_chunk(lo, hi) for lo, hi in tasks]
+            finally:
+                _detach()
+        context = multiprocessing.get_context(self.start_method) if self.start_method else None
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(tasks)),
+            mp_context=context,
+            initializer=_attach,
+            initargs=initargs,
+        ) as pool:
+            return list(pool.map(_backtest_chunk, *zip(*tasks)))
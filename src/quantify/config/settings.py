@@ -1,7 +1,7 @@
 """项目配置定义，使用 Pydantic 管理参数。"""
 
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
@@ -26,6 +26,108 @@ class BacktestConfig(BaseModel):
     benchmark: str = Field(default="SPY", description="基准证券代码")
 
 
+class ParallelConfig(BaseModel):
+    """多进程组合回测配置。"""
+
+    max_workers: Optional[int] = Field(default=None, ge=1, description="工作进程数，默认使用全部 CPU 核；为 1 时在当前进程内运行")
+    chunk_size: int = Field(default=64, ge=1, description="每个任务包含的标的数量")
+    start_method: Optional[Literal["fork", "spawn", "forkserver"]] = Field(
+        default=None, description="进程启动方式，默认使用平台默认值"
+    )
+
+
+class ExecutionConfig(BaseModel):
+    """模拟成交配置，默认按 A 股交易规则收费。"""
+
+    commission_rate: float = Field(default=0.00025, ge=0, description="佣金费率，买卖双向收取")
+    min_commission: float = Field(default=5.0, ge=0, description="单笔最低佣金")
+    stamp_duty: float = Field(default=0.0005, ge=0, description="印花税率，仅卖出收取")
+    lot_size: int = Field(default=100, ge=1, description="每手股数，买入须为整手")
+    t_plus_one: bool = Field(default=True, description="当日买入是否次日才可卖出")
+
+
+class ScanConfig(BaseModel):
+    """行情扫描配置，控制并发度、超时与各主机限速。"""
+
+    concurrency: int = Field(default=20, ge=1, description="同时进行中的股票数量上限")
+    timeout: float = Field(default=10.0, gt=0, description="单次 HTTP 请求超时（秒）")
+    host_rate_limits: Dict[str, float] = Field(
+        default_factory=lambda: {"qt.gtimg.cn": 50.0, "tool.stockstar.com": 20.0},
+        description="各主机每秒请求数上限，未列出的主机不限速",
+    )
+
+
+class HttpConfig(BaseModel):
+    """HTTP 抓取的重试与熔断配置。"""
+
+    max_attempts: int = Field(default=3, ge=1, description="单个请求的最大尝试次数，含首次请求")
+    backoff_base: float = Field(default=0.5, ge=0, description="指数退避的基础等待时间（秒）")
+    backoff_max: float = Field(default=8.0, ge=0, description="单次重试等待时间上限（秒）")
+    failure_threshold: int = Field(default=5, ge=1, description="主机连续失败多少次后熔断")
+    reset_timeout: float = Field(default=30.0, gt=0, description="熔断后多久放行探测请求（秒）")
+
+
+class InstrumentationConfig(BaseModel):
+    """埋点与性能报告配置，也可用环境变量 QUANTIFY_INSTRUMENT=1 开启。"""
+
+    enabled: bool = Field(default=False, description="是否统计各阶段耗时并在运行结束时输出报告")
+    json_path: Optional[Path] = Field(default=None, description="耗时统计 JSON 的导出路径")
+    profile_path: Optional[Path] = Field(default=None, description="cProfile 统计文件的导出路径")
+
+
+class UpdaterConfig(BaseModel):
+    """本地K线仓库每日增量更新配置。"""
+
+    max_workers: int = Field(default=16, ge=1, description="并发下载的线程数")
+    batch_size: int = Field(default=200, ge=1, description="每批标的数量，每批完成后保存一次水位线")
+
+
+class CacheConfig(BaseModel):
+    """网络数据持久化缓存配置。"""
+
+    enabled: bool = Field(default=True, description="是否启用缓存")
+    filename: str = Field(default="http_cache.sqlite3", description="缓存文件名，位于 cache_dir 下")
+    ttl: Dict[str, float] = Field(
+        default_factory=lambda: {"quote": 60.0, "analysis": 86400.0},
+        description="各数据来源的过期时间（秒）",
+    )
+    default_ttl: float = Field(default=86400.0, gt=0, description="未单独配置来源的过期时间（秒）")
+    max_entries: int = Field(default=200_000, ge=1, description="缓存条目上限，超出后按最近访问时间淘汰")
+
+
+class FeatureConfig(BaseModel):
+    """指标特征仓库配置。"""
+
+    max_memory_mb: float = Field(default=256.0, gt=0, description="内存中指标缓存的容量上限（MB）")
+    spill: bool = Field(default=True, description="超出内存上限的条目是否写入磁盘")
+    dirname: str = Field(default="features", description="落盘目录名，位于 cache_dir 下")
+
+
+class CalendarConfig(BaseModel):
+    """交易日历配置。"""
+
+    exchange: Literal["SSE", "SZSE", "HKEX"] = Field(default="SSE", description="默认交易所")
+    dirname: str = Field(default="calendars", description="日历文件目录名，位于 cache_dir 下")
+
+
+class MonitorConfig(BaseModel):
+    """盘中实时监控配置。"""
+
+    interval: float = Field(default=5.0, gt=0, description="行情刷新间隔（秒）")
+    exchange: Literal["SSE", "SZSE", "HKEX"] = Field(default="SSE", description="按该交易所的交易日与交易时段运行")
+    analysis_concurrency: int = Field(default=10, ge=1, description="同时抓取估值分析的股票数量上限")
+
+
+class CrossSectionConfig(BaseModel):
+    """截面因子组合回测配置。"""
+
+    dtype: Literal["float32", "float64"] = Field(default="float32", description="行情面板的数据类型")
+    max_memory_mb: float = Field(default=1536.0, gt=0, description="面板与回测中间数组的内存预算（MB）")
+    cost_rate: Optional[float] = Field(
+        default=None, ge=0, description="每单位换手的交易成本，默认为佣金费率加一半印花税"
+    )
+
+
 class Settings(BaseSettings):
     """全局配置入口，支持环境变量覆盖默认值。"""
 
@@ -35,6 +137,19 @@ class Settings(BaseSettings):
         default_factory=BacktestConfig,
         description="回测核心参数",
     )
+    execution: ExecutionConfig = Field(default_factory=ExecutionConfig, description="模拟成交设置")
+    parallel: ParallelConfig = Field(default_factory=ParallelConfig, description="多进程回测设置")
+    scan: ScanConfig = Field(default_factory=ScanConfig, description="行情扫描设置")
+    cache: CacheConfig = Field(default_factory=CacheConfig, description="网络数据缓存设置")
+    http: HttpConfig = Field(default_factory=HttpConfig, description="HTTP 重试与熔断设置")
+    updater: UpdaterConfig = Field(default_factory=UpdaterConfig, description="K线增量更新设置")
+    features: FeatureConfig = Field(default_factory=FeatureConfig, description="指标特征仓库设置")
+    calendar: CalendarConfig = Field(default_factory=CalendarConfig, description="交易日历设置")
+    monitor: MonitorConfig = Field(default_factory=MonitorConfig, description="盘中实时监控设置")
+    cross_section: CrossSectionConfig = Field(default_factory=CrossSectionConfig, description="截面因子回测设置")
+    instrumentation: InstrumentationConfig = Field(
+        default_factory=InstrumentationConfig, description="埋点与性能报告设置"
+    )
     cache_dir: Path = Field(default=Path("./.cache"), description="缓存目录")
 
     class Config:
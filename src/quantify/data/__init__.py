@@ -1,7 +1,25 @@
-"""数据读取模块集合。"""
+"""数据读取模块集合。
 
-from .base import DataLoader
-from .local import LocalCSVLoader
-from .akshare_loader import AkshareHKIndexLoader
+各加载器按需导入，akshare 只在实际从网络下载时才会加载。
+"""
 
-__all__ = ["DataLoader", "LocalCSVLoader", "AkshareHKIndexLoader"]
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "DataLoader": "base",
+        "LocalCSVLoader": "local",
+        "BarStore": "bar_store",
+        "BarStoreLoader": "bar_store",
+        "AkshareHKIndexLoader": "akshare_loader",
+        "AkshareLoader": "akshare_loader",
+        "BarUpdater": "updater",
+        "Panel": "panel",
+        "TradingCalendar": "calendar",
+        "UpdateReport": "updater",
+        "Universe": "universe",
+        "registry": "universe",
+    },
+    submodules=["akshare_loader", "bar_store", "base", "calendar", "local", "panel", "universe", "updater"],
+)
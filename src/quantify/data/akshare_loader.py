@@ -0,0 +1,253 @@
+"""基于 akshare 的日线数据加载器，下载结果缓存到本地列式仓库。
+
+首次加载下载请求区间的全部数据并写入 `BarStore`；之后只下载缓存未覆盖的日期区间
+（与缓存不相邻时连同中间的空档一起下载，缓存始终是一段连续区间）：
+向后延伸时直接追加到列文件末尾，向前补历史时合并后整体替换。
+只有已收盘的K线会写入缓存，盘中请求到的当天K线只在本次返回结果中合并。
+网络不可用或未安装 akshare 时，直接返回缓存中的数据。
+
+akshare 在首次下载时才导入，离线环境或测试中可用 ``sys.modules["akshare"]`` 注入替身。
+"""
+
+from datetime import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ..utils.instrumentation import timed
+from ..utils.logging import get_logger
+from .bar_store import BarStore
+from .base import AbstractDataLoader
+
+logger = get_logger(__name__)
+
+# akshare 中文列名 -> 项目统一列名
+AKSHARE_COLUMNS = {
+    "日期": "date",
+    "开盘": "open",
+    "收盘": "close",
+    "最高": "high",
+    "最低": "low",
+    "成交量": "volume",
+    "成交额": "amount",
+}
+
+# 未指定起始日期时的默认下载起点
+DEFAULT_START = "1990-01-01"
+
+_ONE_DAY = pd.Timedelta(days=1)
+
+
+def _akshare():
+    import akshare
+
+    return akshare
+
+
+def _fetch_a(symbol: str, start: pd.Timestamp, end: pd.Timestamp, adjust: str) -> pd.DataFrame:
+    return _akshare().stock_zh_a_hist(
+        symbol=symbol, period="daily", start_date=start.strftime("%Y%m%d"),
+        end_date=end.strftime("%Y%m%d"), adjust=adjust,
+    )
+
+
+def _fetch_hk(symbol: str, start: pd.Timestamp, end: pd.Timestamp, adjust: str) -> pd.DataFrame:
+    return _akshare().stock_hk_hist(
+        symbol=symbol, period="daily", start_date=start.strftime("%Y%m%d"),
+        end_date=end.strftime("%Y%m%d"), adjust=adjust,
+    )
+
+
+def _fetch_hk_index(symbol: str, start: pd.Timestamp, end: pd.Timestamp, adjust: str) -> pd.DataFrame:
+    # 新浪港股指数接口只提供全量历史，按区间在本地截取
+    return _akshare().stock_hk_index_daily_sina(symbol=symbol)
+
+
+# 各市场收盘时间，之后当天的日线视为最终数据
+MARKET_CLOSE = {"a": time(15, 0), "hk": time(16, 10), "hk_index": time(16, 10)}
+
+# 市场 -> 下载函数
+FETCHERS: Dict[str, Callable[[str, pd.Timestamp, pd.Timestamp, str], pd.DataFrame]] = {
+    "a": _fetch_a,
+    "hk": _fetch_hk,
+    "hk_index": _fetch_hk_index,
+}
+
+
+def _empty_bars() -> pd.DataFrame:
+    return pd.DataFrame(
+        columns=["open", "high", "low", "close", "volume"], index=pd.DatetimeIndex([], name="date"), dtype=float
+    )
+
+
+def normalize_bars(raw: pd.DataFrame) -> pd.DataFrame:
+    """统一 akshare 返回的列名与索引，只保留数值列，按日期升序。"""
+    data = raw.rename(columns=AKSHARE_COLUMNS)
+    data.columns = [str(c).lower() for c in data.columns]
+    if "date" not in data.columns:
+        raise ValueError("akshare 返回数据缺少日期列")
+    data["date"] = pd.to_datetime(data["date"])
+    data = data.set_index("date")
+    data = data[[c for c in data.columns if pd.api.types.is_numeric_dtype(data[c])]]
+    return data[~data.index.duplicated(keep="last")].sort_index()
+
+
+class AkshareLoader(AbstractDataLoader):
+    """akshare 日线加载器，支持 A 股（a）、港股（hk）与港股指数（hk_index）。
+
+    缓存元数据记录已经向接口请求过的日期区间，而不是数据的首末日期，
+    因此节假日、停牌等无数据区间不会被反复请求。收盘前当天的K线尚未定型，
+    不写入缓存，每次加载都会重新请求。
+    """
+
+    def __init__(
+        self,
+        store: BarStore,
+        market: str = "a",
+        adjust: str = "",
+        offline: bool = False,
+        now: Optional[Callable[[], pd.Timestamp]] = None,
+    ):
+        """
+        Args:
+            store: 本地列式仓库
+            market: 市场类型，见 `FETCHERS`
+            adjust: 复权方式，"" 不复权、"qfq" 前复权、"hfq" 后复权；
+                前复权会改写历史价格，增量缓存时建议使用不复权或后复权
+            offline: 为 True 时只读缓存，不访问网络
+            now: 返回当前时间的函数，便于测试
+        """
+        if market not in FETCHERS:
+            raise ValueError(f"不支持的市场类型: {market}")
+        self._store = store
+        self._market = market
+        self._adjust = adjust
+        self._offline = offline
+        self._now = now or pd.Timestamp.now
+
+    @classmethod
+    def from_settings(cls, settings: Any, **kwargs: Any) -> "AkshareLoader":
+        """使用 `Settings.cache_dir` 下的列式仓库作为缓存。"""
+        return cls(BarStore.from_settings(settings), **kwargs)
+
+    @property
+    def store(self) -> BarStore:
+        return self._store
+
+    def cache_key(self, symbol: str) -> str:
+        """仓库中的标的目录名，带市场前缀以区分同名代码。"""
+        suffix = f"_{self._adjust}" if self._adjust else ""
+        return f"{self._market}{suffix}_{symbol}"
+
+    @property
+    def market(self) -> str:
+        return self._market
+
+    def final_date(self) -> pd.Timestamp:
+        """最后一个K线已定型的日期：收盘后为当天，否则为前一天。"""
+        now = pd.Timestamp(self._now())
+        today = now.normalize()
+        return today if now.time() >= MARKET_CLOSE[self._market] else today - _ONE_DAY
+
+    @timed("data.load.akshare")
+    def load(self, symbol: str, **kwargs) -> pd.DataFrame:
+        """加载 [start, end] 区间的日线，缺失部分先从 akshare 下载。"""
+        start = pd.Timestamp(kwargs.get("start") or DEFAULT_START).normalize()
+        end = pd.Timestamp(kwargs.get("end") or self._now()).normalize()
+        final = self.final_date()
+        key = self.cache_key(symbol)
+
+        live = None
+        if not self._offline:
+            try:
+                self.update(symbol, start, min(end, final))
+                if end > final:
+                    live = self._download(symbol, max(start, final + _ONE_DAY), end)
+            except Exception as exc:  # noqa: BLE001 - 任何下载失败都回退到缓存
+                if not self._store.has(key):
+                    raise
+                logger.warning("下载 %s 失败，使用本地缓存: %s", symbol, exc)
+        if not self._store.has(key):
+            if live is None:
+                raise FileNotFoundError(f"本地缓存中不存在 {symbol}，且处于离线模式")
+            # 只请求了当天尚未收盘的K线，缓存中还没有该标的
+            return self.validate(live if len(live) else _empty_bars())
+        data = self._store.read(key, start=start, end=end)
+        if live is not None and len(live):
+            data = pd.concat([data, live[live.index > final].reindex(columns=data.columns)])
+        return self.validate(data)
+
+    @timed("data.download")
+    def _download(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """下载并规范化 [start, end] 区间的日线。"""
+        logger.info("下载 %s %s ~ %s", symbol, start.date(), end.date())
+        raw = FETCHERS[self._market](symbol, start, end, self._adjust)
+        if raw is None or not len(raw):
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+        return normalize_bars(raw).loc[start:end]
+
+    def missing_ranges(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """返回 [start, end] 中尚未向接口请求过的日期区间。
+
+        缓存只记录一段连续的已请求区间，因此与其不相邻的请求会连同中间的空档一起下载，
+        否则扩大后的区间会把从未请求过的空档当作已缓存。
+        """
+        if start > end:
+            return []
+        key = self.cache_key(symbol)
+        if not self._store.has(key):
+            return [(start, end)]
+        source = self._store.meta(key).get("source", {})
+        fetched_start = pd.Timestamp(source["fetched_start"])
+        fetched_end = pd.Timestamp(source["fetched_end"])
+        ranges = []
+        if start < fetched_start:
+            ranges.append((start, fetched_start - _ONE_DAY))
+        if end > fetched_end:
+            ranges.append((fetched_end + _ONE_DAY, end))
+        return [(lo, hi) for lo, hi in ranges if lo <= hi]
+
+    def update(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> int:
+        """下载 [start, end] 中缺失的区间并写入缓存，返回新写入的K线数量。
+
+        `end` 会被截断到 `final_date()`，未收盘的K线不写入缓存。
+        """
+        end = min(pd.Timestamp(end), self.final_date())
+        ranges = self.missing_ranges(symbol, start, end)
+        if not ranges:
+            return 0
+
+        key = self.cache_key(symbol)
+        frames = [self._download(symbol, lo, hi) for lo, hi in ranges]
+        frames = [f for f in frames if len(f)]
+        downloaded = sum(len(f) for f in frames)
+        source = {"market": self._market, "symbol": symbol, "adjust": self._adjust}
+
+        if not self._store.has(key):
+            merged = pd.concat(frames) if frames else _empty_bars()
+            merged.index.name = "date"
+            source.update(fetched_start=start.isoformat(), fetched_end=end.isoformat())
+            self._store.write(key, merged, source=source)
+            return downloaded
+
+        cached = self._store.meta(key)["source"]
+        fetched_start = min(pd.Timestamp(cached["fetched_start"]), start)
+        fetched_end = max(pd.Timestamp(cached["fetched_end"]), end)
+        source.update(fetched_start=fetched_start.isoformat(), fetched_end=fetched_end.isoformat())
+        if ranges[0][0] < pd.Timestamp(cached["fetched_start"]):
+            # 向前补历史需要改写整个标的
+            merged = pd.concat([*frames, self._store.read(key).copy()])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            merged.index.name = "date"
+            self._store.write(key, merged, source=source)
+        else:
+            tail = pd.concat(frames) if frames else pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+            self._store.append(key, tail, source=source)
+        return downloaded
+
+
+class AkshareHKIndexLoader(AkshareLoader):
+    """港股指数日线加载器，如恒生科技指数 ``HSTECH``、恒生指数 ``HSI``。"""
+
+    def __init__(self, store: BarStore, **kwargs: Any):
+        super().__init__(store, market="hk_index", **kwargs)
@@ -0,0 +1,266 @@
+"""列式本地K线仓库，按字段存储为可内存映射的二进制文件。
+
+目录结构::
+
+    <root>/<symbol>/meta.json     # 行数、字段类型与来源文件信息
+    <root>/<symbol>/date.bin      # int64，纳秒时间戳，升序
+    <root>/<symbol>/<field>.bin   # float64 / int64 数值列
+
+读取时直接对列文件做 ``np.memmap``，按日期二分定位切片，不解析文本也不复制数据。
+"""
+
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..utils.instrumentation import timed
+from .base import AbstractDataLoader
+from .local import LocalCSVLoader
+
+DATE_COLUMN = "date"
+META_FILE = "meta.json"
+STORE_VERSION = 1
+
+
+def _to_ns(value: Any) -> int:
+    """将日期类输入转换为纳秒时间戳。"""
+    return int(pd.Timestamp(value).value)
+
+
+class BarStore:
+    """列式K线仓库，每个标的一个目录、每个字段一个列文件。"""
+
+    def __init__(self, root: Path):
+        self._root = Path(root)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "BarStore":
+        """使用 `Settings.cache_dir` 下的 bars 目录作为仓库根目录。"""
+        return cls(Path(settings.cache_dir) / "bars")
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def symbol_dir(self, symbol: str) -> Path:
+        return self._root / symbol
+
+    def has(self, symbol: str) -> bool:
+        return (self.symbol_dir(symbol) / META_FILE).exists()
+
+    def symbols(self) -> List[str]:
+        """列出仓库中已存在的标的。"""
+        if not self._root.exists():
+            return []
+        return sorted(p.name for p in self._root.iterdir() if (p / META_FILE).exists())
+
+    def meta(self, symbol: str) -> Dict[str, Any]:
+        """读取标的元数据。"""
+        meta_path = self.symbol_dir(symbol) / META_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"列式仓库中不存在标的: {symbol}")
+        with meta_path.open("r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def write(self, symbol: str, data: pd.DataFrame, source: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """整体写入标的数据，已有数据会被原子替换。
+
+        `data` 需以 DatetimeIndex 为索引；数值列按整数/浮点分别存为 int64/float64，
+        非数值列会被忽略。
+        """
+        if not isinstance(data.index, pd.DatetimeIndex):
+            raise TypeError("写入列式仓库的数据索引必须为 DatetimeIndex")
+        data = data.sort_index()
+        dates = data.index.tz_localize(None) if data.index.tz is not None else data.index
+        columns: Dict[str, np.ndarray] = {DATE_COLUMN: dates.asi8.astype(np.int64)}
+        for name in data.columns:
+            series = data[name]
+            if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+                continue
+            dtype = np.int64 if pd.api.types.is_integer_dtype(series) else np.float64
+            columns[str(name).lower()] = series.to_numpy(dtype=dtype)
+
+        meta = {
+            "version": STORE_VERSION,
+            "rows": int(len(data)),
+            "columns": {name: array.dtype.str for name, array in columns.items()},
+            "first": int(columns[DATE_COLUMN][0]) if len(data) else None,
+            "last": int(columns[DATE_COLUMN][-1]) if len(data) else None,
+            "source": source or {},
+        }
+
+        self._root.mkdir(parents=True, exist_ok=True)
+        staging = self._root / f".{symbol}.{uuid.uuid4().hex}.tmp"
+        staging.mkdir()
+        try:
+            for name, array in columns.items():
+                array.tofile(staging / f"{name}.bin")
+            with (staging / META_FILE).open("w", encoding="utf-8") as fh:
+                json.dump(meta, fh, ensure_ascii=False)
+            self._swap_in(symbol, staging)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+        return meta
+
+    def append(self, symbol: str, data: pd.DataFrame, source: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """在标的末尾追加新K线，不改写已有数据；标的不存在时等同于 `write`。
+
+        新数据的日期必须晚于已存储的最后一根K线。各列文件先截断到元数据记录的行数
+        （丢弃上次中断留下的半截数据）再追加，最后原子替换 meta.json 提交新行数，
+        读者在提交前只会看到旧数据。`source` 会合并进元数据中的来源信息。
+        """
+        if not self.has(symbol):
+            return self.write(symbol, data, source=source)
+        if not isinstance(data.index, pd.DatetimeIndex):
+            raise TypeError("写入列式仓库的数据索引必须为 DatetimeIndex")
+
+        meta = self.meta(symbol)
+        if len(data) == 0:
+            meta["source"] = {**meta.get("source", {}), **(source or {})}
+            self._write_meta(symbol, meta)
+            return meta
+        data = data.sort_index()
+        dates = data.index.tz_localize(None) if data.index.tz is not None else data.index
+        new_dates = dates.asi8.astype(np.int64)
+        if meta["last"] is not None and new_dates[0] <= meta["last"]:
+            raise ValueError(f"{symbol} 追加数据的日期必须晚于已有数据 {pd.Timestamp(meta['last'])}")
+
+        rows = int(meta["rows"])
+        lookup = {str(c).lower(): c for c in data.columns}
+        columns: Dict[str, np.ndarray] = {}
+        for name, dtype in meta["columns"].items():
+            if name == DATE_COLUMN:
+                columns[name] = new_dates
+                continue
+            if name in lookup:
+                columns[name] = data[lookup[name]].to_numpy(dtype=np.dtype(dtype))
+            elif np.dtype(dtype).kind == "f":
+                columns[name] = np.full(len(data), np.nan)
+            else:
+                raise KeyError(f"追加数据缺少整数字段: {name}")
+
+        directory = self.symbol_dir(symbol)
+        for name, array in columns.items():
+            with (directory / f"{name}.bin").open("r+b") as fh:
+                fh.truncate(rows * array.dtype.itemsize)
+                fh.seek(0, os.SEEK_END)
+                array.tofile(fh)
+                fh.flush()
+                os.fsync(fh.fileno())
+
+        meta["rows"] = rows + len(new_dates)
+        meta["first"] = meta["first"] if meta["first"] is not None else int(new_dates[0])
+        meta["last"] = int(new_dates[-1])
+        meta["source"] = {**meta.get("source", {}), **(source or {})}
+        self._write_meta(symbol, meta)
+        return meta
+
+    def _write_meta(self, symbol: str, meta: Dict[str, Any]) -> None:
+        """先写临时文件再原子替换，保证 meta.json 始终完整。"""
+        path = self.symbol_dir(symbol) / META_FILE
+        tmp = path.with_name(f".{META_FILE}.{uuid.uuid4().hex}.tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(meta, fh, ensure_ascii=False)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    def _swap_in(self, symbol: str, staging: Path) -> None:
+        """用暂存目录替换正式目录，读者最多短暂看到“标的不存在”。"""
+        target = self.symbol_dir(symbol)
+        trash = None
+        if target.exists():
+            trash = self._root / f".{symbol}.{uuid.uuid4().hex}.old"
+            os.replace(target, trash)
+        os.replace(staging, target)
+        if trash is not None:
+            shutil.rmtree(trash, ignore_errors=True)
+
+    @timed("data.read.bar_store")
+    def read(
+        self,
+        symbol: str,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """读取标的在 [start, end] 区间内的数据，返回基于内存映射的只读 DataFrame。"""
+        meta = self.meta(symbol)
+        rows = int(meta["rows"])
+        dtypes = meta["columns"]
+        wanted = [c for c in (columns or dtypes) if c != DATE_COLUMN]
+        missing = [c for c in wanted if c not in dtypes]
+        if missing:
+            raise KeyError(f"列式仓库中 {symbol} 缺少字段: {missing}")
+
+        dates = self._column(symbol, DATE_COLUMN, dtypes[DATE_COLUMN], rows)
+        lo = int(np.searchsorted(dates, _to_ns(start), side="left")) if start is not None else 0
+        hi = int(np.searchsorted(dates, _to_ns(end), side="right")) if end is not None else rows
+
+        index = pd.DatetimeIndex(dates[lo:hi].view("datetime64[ns]"), name=DATE_COLUMN)
+        frame = {name: self._column(symbol, name, dtypes[name], rows)[lo:hi] for name in wanted}
+        return pd.DataFrame(frame, index=index, copy=False)
+
+    def _column(self, symbol: str, name: str, dtype: str, rows: int) -> np.ndarray:
+        """以只读内存映射方式打开列文件，仅映射元数据记录的有效行。"""
+        if rows == 0:
+            return np.empty(0, dtype=np.dtype(dtype))
+        mapped = np.memmap(self.symbol_dir(symbol) / f"{name}.bin", dtype=np.dtype(dtype), mode="r", shape=(rows,))
+        # 转为普通 ndarray 视图，底层仍引用同一块映射内存
+        return np.asarray(mapped)
+
+
+class BarStoreLoader(AbstractDataLoader):
+    """基于列式仓库的数据加载器。
+
+    首次加载或源 CSV 更新后，会通过 `LocalCSVLoader` 解析一次并写入仓库，
+    之后的加载只做内存映射与日期切片。
+    """
+
+    def __init__(self, store: BarStore, source: Optional[LocalCSVLoader] = None):
+        self._store = store
+        self._source = source
+
+    @property
+    def store(self) -> BarStore:
+        return self._store
+
+    @timed("data.load.bar_store")
+    def load(self, symbol: str, **kwargs) -> pd.DataFrame:
+        """加载标的数据，支持 start/end 日期切片与 columns 字段筛选。"""
+        start = kwargs.pop("start", None)
+        end = kwargs.pop("end", None)
+        columns = kwargs.pop("columns", None)
+        if self._source is not None and self._is_stale(symbol, **kwargs):
+            self.convert(symbol, **kwargs)
+        if not self._store.has(symbol):
+            raise FileNotFoundError(f"列式仓库中不存在标的且无可用数据源: {symbol}")
+        return self._store.read(symbol, start=start, end=end, columns=columns)
+
+    def convert(self, symbol: str, **kwargs) -> Dict[str, Any]:
+        """从源 CSV 解析并写入列式仓库。"""
+        if self._source is None:
+            raise RuntimeError("未配置 CSV 数据源，无法转换")
+        file_path = self._source.path_for(symbol, **kwargs)
+        data = self._source.load(symbol, **kwargs)
+        stat = file_path.stat()
+        source = {"path": str(file_path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        return self._store.write(symbol, data, source=source)
+
+    def _is_stale(self, symbol: str, **kwargs) -> bool:
+        """源文件不存在于仓库或已被修改时需要重新转换。"""
+        if not self._store.has(symbol):
+            return True
+        file_path = self._source.path_for(symbol, **kwargs)
+        if not file_path.exists():
+            return False
+        source = self._store.meta(symbol).get("source", {})
+        stat = file_path.stat()
+        return source.get("mtime_ns") != stat.st_mtime_ns or source.get("size") != stat.st_size
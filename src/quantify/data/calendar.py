@@ -0,0 +1,275 @@
+"""交易日历：A 股（上交所 / 深交所）与港交所的交易日序列。
+
+交易日以升序 int64 纳秒数组保存，另外按自然日预先计算查找表，
+日期与交易日序号的互转是一次数组下标运算（O(1)，可整列向量化）。
+"N 个交易日后"、"相隔几个交易日"因此都变成整数加减，不再构造 Timestamp。
+
+日历从本地文件加载，每行一个 ISO 日期（``#`` 开头为注释），默认位于
+``<cache_dir>/calendars/{cn,hk}.txt``；A 股日历可用 `download_a_share_calendar` 通过 akshare 生成。
+文件不存在时退化为周一至周五的工作日日历。
+
+日期与序号的互转不外推：早于第一个交易日（"prev"）或晚于最后一个交易日（"next"）的日期、
+以及超出范围的序号都会抛出异常；只有 `grid` 会把区间截取到日历范围内。
+"""
+
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DAY_NS = 86_400_000_000_000
+
+# 交易所 -> 日历文件名，上交所与深交所共用同一个 A 股日历
+EXCHANGE_FILES = {"SSE": "cn", "SZSE": "cn", "HKEX": "hk"}
+
+# 交易所 -> 连续竞价时段（当地时间，左闭右开）
+SESSION_HOURS = {
+    "SSE": (("09:30", "11:30"), ("13:00", "15:00")),
+    "SZSE": (("09:30", "11:30"), ("13:00", "15:00")),
+    "HKEX": (("09:30", "12:00"), ("13:00", "16:00")),
+}
+
+DateLike = Union[str, pd.Timestamp, np.datetime64, Sequence[Any], pd.DatetimeIndex]
+
+
+def _day_numbers(dates: DateLike) -> np.ndarray:
+    """日期（可含日内时间）对应的自 1970-01-01 起的自然日编号。"""
+    return np.floor_divide(pd.DatetimeIndex(np.atleast_1d(dates)).as_unit("ns").asi8, DAY_NS)
+
+
+class TradingCalendar:
+    """交易日历，`index` 与 `sessions` 互为逆映射。"""
+
+    def __init__(self, sessions: Iterable[Any], name: str = ""):
+        """
+        Args:
+            sessions: 交易日，任意顺序，重复与日内时间会被去除
+            name: 日历名称，仅用于展示
+        """
+        days = np.unique(_day_numbers(list(sessions)))
+        if not len(days):
+            raise ValueError("交易日历为空")
+        self.name = name
+        self._days = days
+        self.sessions = pd.DatetimeIndex(days * DAY_NS)
+        self._first = int(days[0])
+        span = np.arange(self._first, int(days[-1]) + 1)
+        # 每个自然日之后（含当日）的第一个交易日序号，以及当日是否为交易日
+        self._next = np.searchsorted(days, span, side="left").astype(np.int64)
+        self._is_session = np.zeros(len(span), dtype=bool)
+        self._is_session[days - self._first] = True
+
+    @classmethod
+    def weekdays(cls, start: str, end: str, holidays: Iterable[Any] = (), name: str = "") -> "TradingCalendar":
+        """周一至周五、剔除 `holidays` 的工作日日历。"""
+        sessions = pd.bdate_range(start, end)
+        holidays = pd.DatetimeIndex(list(holidays))
+        if len(holidays):
+            sessions = sessions.difference(holidays.normalize())
+        return cls(sessions, name=name)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], name: Optional[str] = None) -> "TradingCalendar":
+        """读取每行一个日期的文本文件。"""
+        path = Path(path)
+        lines = [line.strip() for line in path.read_text(encoding="utf-8").splitlines()]
+        dates = np.array([line for line in lines if line and not line.startswith("#")], dtype="datetime64[D]")
+        return cls(dates, name=name or path.stem)
+
+    @classmethod
+    def load(cls, exchange: str = "SSE", directory: Optional[Path] = None) -> "TradingCalendar":
+        """加载交易所日历，本地文件不存在时退化为 1990 年至次年底的工作日日历（与数据下载的默认起点一致）。"""
+        filename = EXCHANGE_FILES[exchange.upper()]
+        path = Path(directory or Path("./.cache") / "calendars") / f"{filename}.txt"
+        if path.exists():
+            return cls.from_file(path, name=exchange.upper())
+        logger.warning("未找到交易日历文件 %s，使用工作日日历代替", path)
+        return cls.weekdays("1990-01-01", f"{pd.Timestamp.now().year + 1}-12-31", name=exchange.upper())
+
+    @classmethod
+    def from_settings(cls, settings: Any, exchange: Optional[str] = None) -> "TradingCalendar":
+        """根据 `Settings.calendar` 加载，日历目录位于 `Settings.cache_dir` 下。"""
+        config = settings.calendar
+        return cls.load(exchange or config.exchange, Path(settings.cache_dir) / config.dirname)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(self.sessions.strftime("%Y-%m-%d")) + "\n", encoding="utf-8")
+        return path
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __repr__(self) -> str:
+        first, last = self.sessions[0], self.sessions[-1]
+        return f"TradingCalendar({self.name!r}, {len(self)} sessions, {first:%Y-%m-%d}..{last:%Y-%m-%d})"
+
+    def _lookup(self, dates: DateLike) -> tuple:
+        offset = _day_numbers(dates) - self._first
+        inside = (offset >= 0) & (offset < len(self._next))
+        clipped = np.clip(offset, 0, len(self._next) - 1)
+        after = offset >= len(self._next)
+        nxt = np.where(inside, self._next[clipped], np.where(after, len(self), 0))
+        is_session = inside & self._is_session[clipped]
+        return nxt, is_session
+
+    def index(self, dates: DateLike, side: str = "raise") -> Union[int, np.ndarray]:
+        """
+        日期对应的交易日序号。
+
+        Args:
+            dates: 单个日期或日期序列，日内时间被忽略
+            side: 非交易日的处理方式，"raise" 抛出 KeyError，"next" 取之后的交易日，"prev" 取之前的交易日；
+                之后（之前）已没有交易日时同样抛出 KeyError
+        """
+        nxt, is_session = self._lookup(dates)
+        if side == "next":
+            result = nxt
+            self._check_range(dates, result >= len(self), "晚于最后一个交易日")
+        elif side == "prev":
+            result = np.where(is_session, nxt, nxt - 1)
+            self._check_range(dates, result < 0, "早于第一个交易日")
+        elif side == "raise":
+            if not is_session.all():
+                missing = pd.DatetimeIndex(np.atleast_1d(dates))[~is_session]
+                raise KeyError(f"{self.name or '日历'}中没有这些交易日: {list(missing.strftime('%Y-%m-%d')[:5])}")
+            result = nxt
+        else:
+            raise ValueError(f"未知的 side: {side}")
+        return int(result[0]) if np.ndim(dates) == 0 else result
+
+    def _check_range(self, dates: DateLike, outside: np.ndarray, reason: str) -> None:
+        if outside.any():
+            missing = pd.DatetimeIndex(np.atleast_1d(dates))[outside]
+            raise KeyError(f"日期{reason}（{self!r}）: {list(missing.strftime('%Y-%m-%d')[:5])}")
+
+    def is_session(self, dates: DateLike) -> Union[bool, np.ndarray]:
+        result = self._lookup(dates)[1]
+        return bool(result[0]) if np.ndim(dates) == 0 else result
+
+    def session(self, indices: Union[int, np.ndarray]) -> Union[pd.Timestamp, pd.DatetimeIndex]:
+        """交易日序号对应的日期，超出日历范围时抛出 IndexError。"""
+        if np.ndim(indices) == 0:
+            if not 0 <= int(indices) < len(self):
+                raise IndexError(f"交易日序号 {int(indices)} 超出日历范围")
+            return self.sessions[int(indices)]
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError("交易日序号超出日历范围")
+        return pd.DatetimeIndex(self._days[indices] * DAY_NS)
+
+    def offset(self, dates: DateLike, n: Union[int, np.ndarray], side: str = "prev"):
+        """`dates` 之后第 `n` 个交易日（n 可为负）；非交易日先按 `side` 归到相邻交易日。"""
+        return self.session(np.asarray(self.index(dates, side)) + n)
+
+    def distance(self, start: DateLike, end: DateLike) -> Union[int, np.ndarray]:
+        """两个日期之间相隔的交易日数，非交易日归到之前的交易日。"""
+        return np.subtract(self.index(end, "prev"), self.index(start, "prev"))
+
+    def _hours(self) -> tuple:
+        return tuple((pd.Timedelta(f"{start}:00"), pd.Timedelta(f"{end}:00"))
+                     for start, end in SESSION_HOURS.get(self.name, SESSION_HOURS["SSE"]))
+
+    def is_open(self, now: Any) -> bool:
+        """`now`（交易所当地时间）是否处于交易日的连续竞价时段，时段按日历名称取自 `SESSION_HOURS`。"""
+        now = pd.Timestamp(now)
+        if not self.is_session(now):
+            return False
+        elapsed = now - now.normalize()
+        return any(start <= elapsed < end for start, end in self._hours())
+
+    def next_open(self, now: Any) -> pd.Timestamp:
+        """`now` 之后（含当前时刻）最近一个连续竞价时段的开始时间；正处于时段内时返回 `now`。"""
+        now = pd.Timestamp(now)
+        if self.is_open(now):
+            return now
+        hours = self._hours()
+        if self.is_session(now):
+            elapsed = now - now.normalize()
+            for start, _ in hours:
+                if elapsed < start:
+                    return now.normalize() + start
+        day = int(self._lookup(now)[0][0]) + (1 if self.is_session(now) else 0)
+        if day >= len(self):
+            raise IndexError("交易日序号超出日历范围")
+        return self.session(day) + hours[0][0]
+
+    def grid(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None) -> pd.DatetimeIndex:
+        """[start, end] 内的全部交易日，超出日历范围的部分被截去。"""
+        lo = int(self._lookup(start)[0][0]) if start is not None else 0
+        if end is not None:
+            nxt, is_session = self._lookup(end)
+            hi = int(nxt[0]) + int(is_session[0])
+        else:
+            hi = len(self)
+        return self.sessions[lo:max(hi, lo)]
+
+    def reindex(
+        self,
+        frame: pd.DataFrame,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        zero_fill: Sequence[str] = ("volume", "amount"),
+    ) -> pd.DataFrame:
+        """
+        将单个标的的日线对齐到交易日网格，并标记停牌日。
+
+        网格默认从该标的第一根K线到最后一根K线；非交易日的K线被丢弃。
+        停牌日（网格内无K线）的价格沿用上一交易日，`zero_fill` 中的列记为 0，
+        `suspended` 列为 True；第一根K线之前的行保持为 NaN。
+
+        Args:
+            frame: 以 DatetimeIndex 为索引的日线，同一交易日只能有一根K线
+            start: 网格起点，默认第一根K线
+            end: 网格终点，默认最后一根K线
+            zero_fill: 停牌日填 0 而不沿用前值的列
+        """
+        grid = self.grid(start if start is not None else frame.index[0] if len(frame) else None,
+                         end if end is not None else frame.index[-1] if len(frame) else None)
+        if frame.empty or not len(grid):
+            return frame.iloc[0:0].assign(suspended=np.zeros(0, dtype=bool))
+        index, is_session = self._lookup(frame.index)
+        rows = index - self.index(grid[0])
+        keep = is_session & (rows >= 0) & (rows < len(grid))
+        rows = rows[keep]
+        if len(np.unique(rows)) != len(rows):
+            raise ValueError("同一交易日存在多根K线，只能对齐日线数据")
+
+        present = np.zeros(len(grid), dtype=bool)
+        present[rows] = True
+        source = np.full(len(grid), -1, dtype=np.int64)
+        source[rows] = np.flatnonzero(keep)
+        # 沿用最近一根K线的行号，第一根K线之前为 -1
+        last = np.maximum.accumulate(np.where(present, np.arange(len(grid)), -1))
+        source = np.where(last >= 0, source[np.maximum(last, 0)], -1)
+        before = source < 0
+        suspended = ~present & ~before
+        gather = np.maximum(source, 0)
+
+        columns = {}
+        for column in frame.columns:
+            out = frame[column].to_numpy()[gather]
+            if column in zero_fill:
+                out = np.where(suspended, 0, out)
+            if before.any():
+                out = out.astype(np.float64 if out.dtype.kind in "fiub" else object)
+                out[before] = np.nan if out.dtype.kind == "f" else None
+            columns[column] = out
+        result = pd.DataFrame(columns, index=grid.rename(frame.index.name))
+        result["suspended"] = suspended
+        result.attrs.update(frame.attrs)
+        return result
+
+
+def download_a_share_calendar(directory: Path) -> Path:
+    """通过 akshare 下载 A 股历史与已公布的交易日，保存为 ``cn.txt``。"""
+    import akshare
+
+    dates = akshare.tool_trade_date_hist_sina()["trade_date"]
+    return TradingCalendar(pd.to_datetime(dates), name="SSE").save(Path(directory) / f"{EXCHANGE_FILES['SSE']}.txt")
@@ -5,6 +5,7 @@ from typing import Optional
 
 import pandas as pd
 
+from ..utils.instrumentation import timed
 from .base import AbstractDataLoader
 
 
@@ -16,9 +17,14 @@ class LocalCSVLoader(AbstractDataLoader):
         self._encoding = encoding
         self._parse_dates = parse_dates or "date"
 
+    def path_for(self, symbol: str, **kwargs) -> Path:
+        """返回证券代码对应的 CSV 文件路径。"""
+        return Path(kwargs.get("file")) if kwargs.get("file") else self._data_dir / f"{symbol}.csv"
+
+    @timed("data.load.csv")
     def load(self, symbol: str, **kwargs) -> pd.DataFrame:
         """根据证券代码加载数据文件，并执行基础清洗。"""
-        file_path = Path(kwargs.get("file")) if kwargs.get("file") else self._data_dir / f"{symbol}.csv"
+        file_path = self.path_for(symbol, **kwargs)
         if not file_path.exists():
             raise FileNotFoundError(f"找不到本地数据文件: {file_path}")
         data = pd.read_csv(file_path, encoding=self._encoding, parse_dates=[self._parse_dates])
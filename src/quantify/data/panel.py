@@ -0,0 +1,130 @@
+"""日期 × 标的 行情面板：每个字段一个二维 NumPy 数组，供截面因子与组合回测使用。
+
+面板的行是统一的日期轴（默认各标的日期的并集，也可以传入交易日历网格），
+列是标的；某标的在某日没有K线时该格为 NaN。数组默认使用 float32，
+10 年 × 5,400 只股票的单个字段约 55 MB，OHLCV 五个字段约 275 MB。
+构造前先按 `max_bytes` 估算内存，超出预算时直接抛出 MemoryError 而不是分配到一半。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..utils.instrumentation import timed
+
+OHLCV = ("open", "high", "low", "close", "volume")
+
+
+def check_budget(nbytes: int, max_bytes: Optional[int], what: str = "面板") -> None:
+    """估算的内存占用超过预算时抛出 MemoryError。"""
+    if max_bytes is not None and nbytes > max_bytes:
+        raise MemoryError(f"{what}预计占用 {nbytes / 2**20:.0f} MB，超出预算 {max_bytes / 2**20:.0f} MB")
+
+
+@dataclass
+class Panel:
+    """日期 × 标的 的多字段面板，`fields` 中每个数组的形状均为 (len(dates), len(symbols))。"""
+
+    dates: pd.DatetimeIndex
+    symbols: pd.Index
+    fields: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.dates = pd.DatetimeIndex(self.dates)
+        self.symbols = pd.Index(self.symbols)
+        for name, values in self.fields.items():
+            if values.shape != self.shape:
+                raise ValueError(f"字段 {name} 的形状 {values.shape} 与面板 {self.shape} 不一致")
+
+    @property
+    def shape(self) -> tuple:
+        return len(self.dates), len(self.symbols)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(values.nbytes for values in self.fields.values())
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise KeyError(f"面板中没有字段 {name}，现有字段: {list(self.fields)}") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.fields
+
+    def __setitem__(self, name: str, values: np.ndarray) -> None:
+        """添加字段，例如按日期对齐后的估值上下限。"""
+        values = np.asarray(values)
+        if values.shape != self.shape:
+            raise ValueError(f"字段 {name} 的形状 {values.shape} 与面板 {self.shape} 不一致")
+        self.fields[name] = values
+
+    @classmethod
+    @timed("panel.build")
+    def from_frames(
+        cls,
+        frames: Mapping[str, pd.DataFrame],
+        fields: Sequence[str] = OHLCV,
+        dates: Optional[pd.DatetimeIndex] = None,
+        dtype: Any = np.float32,
+        max_bytes: Optional[int] = None,
+    ) -> "Panel":
+        """
+        由各标的日线构造面板。
+
+        Args:
+            frames: 标的 -> 以 DatetimeIndex 为索引的日线，缺少的字段记为 NaN
+            fields: 面板包含的字段
+            dates: 日期轴，例如 `TradingCalendar.grid(...)`；默认为各标的日期的并集，
+                不在日期轴上的K线被丢弃
+            dtype: 面板数组的数据类型
+            max_bytes: 内存预算（字节），超出时在分配前抛出 MemoryError
+        """
+        symbols = [symbol for symbol, frame in frames.items() if len(frame)]
+        if dates is None:
+            stamps = [frames[symbol].index.as_unit("ns").asi8 for symbol in symbols]
+            days = np.unique(np.concatenate(stamps)) if stamps else np.empty(0, dtype=np.int64)
+            dates = pd.DatetimeIndex(days.view("datetime64[ns]"))
+        dates = pd.DatetimeIndex(dates).as_unit("ns")
+        grid = dates.asi8
+        shape = (len(dates), len(symbols))
+        check_budget(shape[0] * shape[1] * np.dtype(dtype).itemsize * len(fields), max_bytes)
+
+        arrays = {name: np.full(shape, np.nan, dtype=dtype) for name in fields}
+        for j, symbol in enumerate(symbols):
+            frame = frames[symbol]
+            stamps = frame.index.as_unit("ns").asi8
+            rows = np.searchsorted(grid, stamps)
+            keep = rows < len(grid)
+            keep[keep] = grid[rows[keep]] == stamps[keep]
+            rows = rows[keep]
+            for name in fields:
+                if name in frame.columns:
+                    arrays[name][rows, j] = frame[name].to_numpy()[keep]
+        return cls(dates, pd.Index(symbols, name="symbol"), arrays)
+
+    @classmethod
+    def from_loader(
+        cls,
+        loader: Any,
+        symbols: Iterable[str],
+        fields: Sequence[str] = OHLCV,
+        dates: Optional[pd.DatetimeIndex] = None,
+        dtype: Any = np.float32,
+        max_bytes: Optional[int] = None,
+        **kwargs: Any,
+    ) -> "Panel":
+        """通过数据加载器逐个读取标的后构造面板，`kwargs` 透传给 `loader.load`。"""
+        frames = {symbol: loader.load(symbol, **kwargs) for symbol in symbols}
+        return cls.from_frames(frames, fields, dates=dates, dtype=dtype, max_bytes=max_bytes)
+
+    def align(self, frame: pd.DataFrame, dtype: Any = np.float32) -> np.ndarray:
+        """把 日期 × 标的 的 DataFrame 对齐到面板，缺失的日期与标的为 NaN。"""
+        return frame.reindex(index=self.dates, columns=self.symbols).to_numpy(dtype=dtype)
+
+    def to_frame(self, name: str) -> pd.DataFrame:
+        """单个字段转换为以日期为索引、标的为列的 DataFrame。"""
+        return pd.DataFrame(self[name], index=self.dates, columns=self.symbols)
@@ -0,0 +1,242 @@
+"""标的注册表：每个股票代码只登记一次，映射为连续的整数编号。
+
+市场、交易所前缀、板块与 ST 标记在登记时一次性计算并按编号存放在 NumPy 数组中，
+筛选与名称搜索都是对整列的向量化运算；面板、缓存与扫描可以直接使用编号，
+不必反复解析代码字符串。
+
+进程内共享一个注册表（`registry()`），初始登记 `HSTECH_CODES` 与 `A_STOCK_CODES`；
+A 股列表 CSV 通过 `Universe.load_csv` 登记，同一文件未修改时只读取一次；文件修改后重新读取，
+名称与 ST 标记以文件为准，格式错误的代码跳过并记录警告。
+"""
+
+import csv
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..consts.stack_code import A_STOCK_CODES, HSTECH_CODES
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+MARKETS = ("A", "HK")
+EXCHANGES = ("sh", "sz", "hk")
+BOARDS = ("main", "chinext", "star", "bse", "gem")
+
+MARKET_A, MARKET_HK = 0, 1
+EXCHANGE_SH, EXCHANGE_SZ, EXCHANGE_HK = 0, 1, 2
+BOARD_MAIN, BOARD_CHINEXT, BOARD_STAR, BOARD_BSE, BOARD_GEM = range(5)
+
+_CODE_COLUMN, _NAME_COLUMN = "股票代码", "股票名称"
+
+
+def _valid_codes(codes: np.ndarray) -> np.ndarray:
+    """逐个判断代码格式是否合法：港股为 5 位数字，A 股为 6 位数字。"""
+    codes = np.asarray(codes, dtype=str)
+    return np.char.isdigit(codes) & np.isin(np.char.str_len(codes), (5, 6))
+
+
+def _classify(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """按代码计算 (市场, 交易所, 板块)；港股为 5 位数字，A 股为 6 位数字。"""
+    if not np.char.isdigit(codes).all():
+        raise ValueError("股票代码需为数字。")
+    lengths = np.char.str_len(codes)
+    if not np.isin(lengths, (5, 6)).all():
+        raise ValueError("股票代码需为 5 位 (港股) 或 6 位 (A股) 数字。")
+    hk = lengths == 5
+    first = codes.astype("<U1")
+    head2, head3 = codes.astype("<U2"), codes.astype("<U3")
+
+    market = np.where(hk, MARKET_HK, MARKET_A).astype(np.int8)
+    exchange = np.where(hk, EXCHANGE_HK, np.where(np.isin(first, ("5", "6", "9")), EXCHANGE_SH, EXCHANGE_SZ))
+    board = np.select(
+        [hk & (head2 == "08"), hk,
+         np.isin(head3, ("300", "301", "302")), np.isin(head3, ("688", "689")),
+         np.isin(first, ("4", "8")) | (head2 == "92")],
+        [BOARD_GEM, BOARD_MAIN, BOARD_CHINEXT, BOARD_STAR, BOARD_BSE],
+        default=BOARD_MAIN,
+    )
+    return market, exchange.astype(np.int8), board.astype(np.int8)
+
+
+class Universe:
+    """代码 -> 连续编号的注册表，按编号存放各标的属性。"""
+
+    def __init__(self, codes: Iterable[str] = (), names: Optional[Iterable[str]] = None):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self.codes = np.empty(0, dtype="<U6")
+        self.names = np.empty(0, dtype="<U1")
+        self.market = np.empty(0, dtype=np.int8)
+        self.exchange = np.empty(0, dtype=np.int8)
+        self.board = np.empty(0, dtype=np.int8)
+        self.st = np.empty(0, dtype=bool)
+        self.symbols = np.empty(0, dtype="<U8")
+        self._folded = np.empty(0, dtype="<U1")
+        self._csv: Dict[Tuple[str, int], np.ndarray] = {}
+        self.intern(codes, names)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._ids
+
+    def intern(
+        self, codes: Iterable[str], names: Optional[Iterable[str]] = None, overwrite: bool = False
+    ) -> np.ndarray:
+        """
+        登记代码并返回编号；已登记的代码保持原编号
+
+        Args:
+            codes: 股票代码
+            names: 对应的股票名称，为空的名称不改动已有名称
+            overwrite: 为 True 时以传入的名称（及由名称得出的 ST 标记）覆盖已有名称，否则只补全缺失的名称
+        """
+        codes = [str(code).strip() for code in codes]
+        names = [str(name).strip() for name in names] if names is not None else [""] * len(codes)
+        with self._lock:
+            fresh: Dict[str, str] = {}
+            renamed: Dict[int, str] = {}
+            for code, name in zip(codes, names):
+                i = self._ids.get(code)
+                if i is None:
+                    fresh[code] = fresh.get(code) or name
+                elif name and (overwrite or not self.names[i]) and name != self.names[i]:
+                    renamed[i] = name
+            if renamed:
+                self._set_names(renamed)
+            if fresh:
+                self._append(list(fresh), list(fresh.values()))
+            return np.fromiter((self._ids[code] for code in codes), dtype=np.int32, count=len(codes))
+
+    def _append(self, codes: List[str], names: List[str]) -> None:
+        new_codes = np.asarray(codes, dtype=str)
+        market, exchange, board = _classify(new_codes)
+        new_names = np.asarray(names, dtype=str)
+        start = len(self.codes)
+        self.codes = np.concatenate([self.codes, new_codes])
+        self.names = np.concatenate([self.names, new_names])
+        self.market = np.concatenate([self.market, market])
+        self.exchange = np.concatenate([self.exchange, exchange])
+        self.board = np.concatenate([self.board, board])
+        self.symbols = np.concatenate([self.symbols, np.char.add(np.asarray(EXCHANGES)[exchange], new_codes)])
+        self._folded = np.concatenate([self._folded, np.char.lower(new_names)])
+        self.st = np.concatenate([self.st, np.char.find(np.char.upper(new_names), "ST") >= 0])
+        self._ids.update((code, start + i) for i, code in enumerate(codes))
+
+    def _set_names(self, renamed: Dict[int, str]) -> None:
+        width = max(self.names.dtype.itemsize // 4, *(len(name) for name in renamed.values()))
+        if width > self.names.dtype.itemsize // 4:
+            self.names = self.names.astype(f"<U{width}")
+            self._folded = self._folded.astype(f"<U{width}")
+        for i, name in renamed.items():
+            self.names[i], self._folded[i] = name, name.lower()
+            self.st[i] = "ST" in name.upper()
+
+    def id(self, code: str) -> int:
+        """已登记代码的编号，未登记时抛出 KeyError。"""
+        return self._ids[code.strip()]
+
+    def ids(self, codes: Iterable[str]) -> np.ndarray:
+        ids = self._ids
+        codes = list(codes)
+        return np.fromiter((ids[code] for code in codes), dtype=np.int32, count=len(codes))
+
+    def symbol(self, code: str) -> str:
+        """腾讯行情接口使用的带交易所前缀代码，未登记的代码先登记。"""
+        i = self._ids.get(code)
+        if i is None:
+            i = int(self.intern([code])[0])
+        return str(self.symbols[i])
+
+    def code_list(self, ids: Union[np.ndarray, Sequence[int]]) -> List[str]:
+        return self.codes[np.asarray(ids, dtype=np.intp)].tolist()
+
+    def mask(
+        self,
+        market: Optional[str] = None,
+        boards: Optional[Sequence[str]] = None,
+        exclude_st: bool = False,
+    ) -> np.ndarray:
+        """按市场、板块与 ST 标记筛选，返回与编号对齐的布尔数组。"""
+        mask = np.ones(len(self), dtype=bool)
+        if market is not None:
+            mask &= self.market == MARKETS.index(market)
+        if boards is not None:
+            mask &= np.isin(self.board, [BOARDS.index(board) for board in boards])
+        if exclude_st:
+            mask &= ~self.st
+        return mask
+
+    def select(self, ids: Optional[np.ndarray] = None, **filters) -> np.ndarray:
+        """在 `ids`（默认全部）中保留满足 `mask` 条件的编号，保持原顺序。"""
+        mask = self.mask(**filters)
+        if ids is None:
+            return np.flatnonzero(mask).astype(np.int32)
+        ids = np.asarray(ids, dtype=np.int32)
+        return ids[mask[ids]]
+
+    def search(self, keyword: str, ids: Optional[np.ndarray] = None) -> np.ndarray:
+        """名称包含 `keyword`（不区分大小写）的编号。"""
+        hit = np.char.find(self._folded, keyword.lower()) >= 0
+        if ids is None:
+            return np.flatnonzero(hit).astype(np.int32)
+        ids = np.asarray(ids, dtype=np.int32)
+        return ids[hit[ids]]
+
+    def load_csv(self, path: Union[str, Path]) -> np.ndarray:
+        """
+        登记 A 股列表 CSV（股票代码, 股票名称），返回文件中各有效行的编号；文件未修改时不重复读取
+
+        名称与 ST 标记以文件为准覆盖已登记的值；代码格式错误的行跳过并记录警告。
+        """
+        path = os.path.abspath(path)
+        key = (path, os.stat(path).st_mtime_ns)
+        if key not in self._csv:
+            with open(path, encoding="utf-8-sig", newline="") as handle:
+                rows = [((row.get(_CODE_COLUMN) or "").strip(), row.get(_NAME_COLUMN) or "")
+                        for row in csv.DictReader(handle)]
+            valid = _valid_codes([code for code, _ in rows]) if rows else np.empty(0, dtype=bool)
+            bad = [code for (code, _), ok in zip(rows, valid) if not ok]
+            if bad:
+                logger.warning("%s 中 %d 行股票代码格式错误，已跳过: %s", path, len(bad), ", ".join(bad[:5]))
+            rows = [row for row, ok in zip(rows, valid) if ok]
+            # 同一文件的旧版本结果不再使用
+            self._csv = {k: v for k, v in self._csv.items() if k[0] != path}
+            self._csv[key] = self.intern([code for code, _ in rows], [name for _, name in rows], overwrite=True)
+        return self._csv[key]
+
+    def to_frame(self, ids: Optional[np.ndarray] = None):
+        """转换为以编号为索引的 DataFrame，便于查看与导出。"""
+        import pandas as pd
+
+        ids = np.arange(len(self), dtype=np.int32) if ids is None else np.asarray(ids, dtype=np.int32)
+        return pd.DataFrame(
+            {
+                "code": self.codes[ids],
+                "name": self.names[ids],
+                "market": np.asarray(MARKETS)[self.market[ids]],
+                "exchange": np.asarray(EXCHANGES)[self.exchange[ids]],
+                "board": np.asarray(BOARDS)[self.board[ids]],
+                "st": self.st[ids],
+                "symbol": self.symbols[ids],
+            },
+            index=pd.Index(ids, name="id"),
+        )
+
+
+_registry: Optional[Universe] = None
+_registry_lock = threading.Lock()
+
+
+def registry() -> Universe:
+    """进程内共享的注册表，初始登记内置的港股科技与 A 股代码。"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = Universe(HSTECH_CODES + A_STOCK_CODES)
+        return _registry
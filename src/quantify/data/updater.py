@@ -0,0 +1,145 @@
+"""每日增量更新任务：按标的水位线只下载缺失区间并追加到本地列式仓库。
+
+水位线保存在仓库根目录的 ``watermarks.json``，记录每个标的已存储的最后一根K线、
+行数与本次确认到的日期。每完成一批标的就原子替换一次水位线文件；
+任务中途被打断后重新运行，已确认到目标日期的标的会直接跳过。
+"""
+
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from ..utils.logging import get_logger
+from .akshare_loader import DEFAULT_START, AkshareLoader
+
+logger = get_logger(__name__)
+
+WATERMARK_FILE = "watermarks.json"
+
+
+@dataclass
+class UpdateReport:
+    """一次更新任务的结果汇总。"""
+
+    appended: Dict[str, int] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def rows(self) -> int:
+        return sum(self.appended.values())
+
+
+class BarUpdater:
+    """并发批量更新本地K线仓库。"""
+
+    def __init__(
+        self,
+        loader: AkshareLoader,
+        max_workers: int = 16,
+        batch_size: int = 200,
+        watermark_path: Optional[Path] = None,
+    ):
+        self._loader = loader
+        self._max_workers = max_workers
+        self._batch_size = batch_size
+        self._watermark_path = Path(watermark_path or loader.store.root / WATERMARK_FILE)
+        self._lock = threading.Lock()
+        self._watermarks = self._read_watermarks()
+
+    @classmethod
+    def from_settings(cls, settings: Any, **loader_kwargs: Any) -> "BarUpdater":
+        """根据 `Settings.updater` 构造，仓库位于 `Settings.cache_dir` 下。"""
+        config = settings.updater
+        return cls(
+            AkshareLoader.from_settings(settings, **loader_kwargs),
+            max_workers=config.max_workers,
+            batch_size=config.batch_size,
+        )
+
+    @property
+    def watermarks(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self._watermarks)
+
+    def _read_watermarks(self) -> Dict[str, Dict[str, Any]]:
+        if not self._watermark_path.exists():
+            return {}
+        with self._watermark_path.open("r", encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def _flush_watermarks(self) -> None:
+        """先写临时文件再原子替换，中断时旧水位线保持完整。"""
+        self._watermark_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._watermark_path.with_name(f".{WATERMARK_FILE}.{uuid.uuid4().hex}.tmp")
+        with self._lock:
+            payload = json.dumps(self._watermarks, ensure_ascii=False, sort_keys=True)
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self._watermark_path)
+
+    def is_current(self, symbol: str, target: pd.Timestamp) -> bool:
+        """水位线已确认到目标日期时无需更新。"""
+        mark = self._watermarks.get(symbol)
+        return mark is not None and pd.Timestamp(mark["checked"]) >= target
+
+    def _update_one(self, symbol: str, start: pd.Timestamp, target: pd.Timestamp) -> int:
+        appended = self._loader.update(symbol, start, target)
+        store = self._loader.store
+        meta = store.meta(self._loader.cache_key(symbol))
+        mark = {
+            "last": pd.Timestamp(meta["last"]).isoformat() if meta["last"] is not None else None,
+            "rows": meta["rows"],
+            "checked": meta["source"]["fetched_end"],
+        }
+        with self._lock:
+            self._watermarks[symbol] = mark
+        return appended
+
+    def run(self, symbols: Sequence[str], start: Optional[Any] = None, end: Optional[Any] = None) -> UpdateReport:
+        """
+        更新一组标的到 `end`（默认最近一个已收盘交易日）
+
+        Args:
+            symbols: 标的代码列表
+            start: 新标的首次下载的起始日期
+            end: 更新的目标日期，会被截断到已收盘日期
+
+        Returns:
+            UpdateReport: 追加行数、跳过与失败的标的
+        """
+        start = pd.Timestamp(start or DEFAULT_START).normalize()
+        target = self._loader.final_date()
+        if end is not None:
+            target = min(target, pd.Timestamp(end).normalize())
+
+        report = UpdateReport()
+        pending = []
+        for symbol in dict.fromkeys(symbols):
+            if self.is_current(symbol, target):
+                report.skipped.append(symbol)
+            else:
+                pending.append(symbol)
+        logger.info("更新 %d 只标的至 %s，跳过 %d 只", len(pending), target.date(), len(report.skipped))
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            for offset in range(0, len(pending), self._batch_size):
+                batch = pending[offset:offset + self._batch_size]
+                futures = {symbol: pool.submit(self._update_one, symbol, start, target) for symbol in batch}
+                for symbol, future in futures.items():
+                    try:
+                        report.appended[symbol] = future.result()
+                    except Exception as exc:  # noqa: BLE001 - 单只标的失败不影响整批
+                        report.failed[symbol] = f"{type(exc).__name__}: {exc}"
+                self._flush_watermarks()
+        if report.failed:
+            logger.warning("%d 只标的更新失败", len(report.failed))
+        return report
@@ -1,6 +1,9 @@
 """执行模块，模拟下单与成交回报。"""
 
-from .broker import PaperBroker
-
-__all__ = ["PaperBroker"]
+from .._lazy import attach
 
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {"FillLog": "broker", "Order": "broker", "PaperBroker": "broker"},
+    submodules=["broker"],
+)
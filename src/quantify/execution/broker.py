@@ -0,0 +1,419 @@
+"""事件驱动的模拟券商，按K线或逐笔行情撮合委托。
+
+* 每个标的维护一个挂单簿，支持市价、限价与止损单；限价与止损单按价格放入堆中，
+  每根K线只弹出价格可成交的委托，撮合成本与挂单数量无关；
+* 遵循 A 股规则：买入须为整手（默认 100 股），卖出可一次性卖出零股；T+1，当日买入次日才可卖出；
+* 成交收取佣金（双向，设最低收费）与印花税（仅卖出）；
+* 委托使用 ``__slots__`` 记录，成交写入按倍数扩容的预分配数组，百万级委托可在数秒内回放。
+
+撮合口径：
+
+* K线撮合：市价单以开盘价成交；限价买单在最低价不高于限价时以 min(开盘价, 限价) 成交，
+  限价卖单对称；止损买单在最高价触及止损价时以 max(开盘价, 止损价) 成交，止损卖单对称。
+* 逐笔撮合：市价单以最新价成交，限价单与止损单在最新价满足条件时以最新价成交。
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+BUY = "BUY"
+SELL = "SELL"
+
+MARKET = "MARKET"
+LIMIT = "LIMIT"
+STOP = "STOP"
+
+PENDING = "PENDING"
+FILLED = "FILLED"
+CANCELLED = "CANCELLED"
+REJECTED = "REJECTED"
+
+_DAY_NS = 86_400_000_000_000
+
+TimestampLike = Union[int, pd.Timestamp, str]
+
+
+_NAN = float("nan")
+
+
+def _to_ns(timestamp: TimestampLike) -> int:
+    if type(timestamp) is int:
+        return timestamp
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    return int(pd.Timestamp(timestamp).value)
+
+
+class Order:
+    """委托记录。"""
+
+    __slots__ = (
+        "order_id", "symbol", "side", "quantity", "order_type",
+        "limit_price", "stop_price", "created", "status", "reason",
+    )
+
+    def __init__(self, order_id: int, symbol: str, side: str, quantity: int, order_type: str,
+                 limit_price: float, stop_price: float, created: int):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.order_type = order_type
+        self.limit_price = limit_price
+        self.stop_price = stop_price
+        self.created = created
+        self.status = PENDING
+        self.reason = ""
+
+    def __repr__(self) -> str:
+        return (f"Order({self.order_id}, {self.symbol}, {self.side}, {self.quantity}, "
+                f"{self.order_type}, {self.status})")
+
+
+class OrderBook:
+    """单个标的的挂单簿。
+
+    市价单按到达顺序排队；限价买单以限价从高到低、限价卖单从低到高排列，
+    止损买单以触发价从低到高、止损卖单从高到低排列，同价按委托编号先后。
+    撤单只修改委托状态，弹出时跳过；`pending` 为仍有效的挂单数量。
+    """
+
+    __slots__ = ("market", "bids", "asks", "buy_stops", "sell_stops", "pending")
+
+    def __init__(self) -> None:
+        self.market: List[Order] = []
+        self.bids: List[tuple] = []
+        self.asks: List[tuple] = []
+        self.buy_stops: List[tuple] = []
+        self.sell_stops: List[tuple] = []
+        self.pending = 0
+
+    def add(self, order: Order) -> None:
+        self.pending += 1
+        if order.order_type == MARKET:
+            self.market.append(order)
+        elif order.order_type == LIMIT:
+            if order.side == BUY:
+                heapq.heappush(self.bids, (-order.limit_price, order.order_id, order))
+            else:
+                heapq.heappush(self.asks, (order.limit_price, order.order_id, order))
+        elif order.side == BUY:
+            heapq.heappush(self.buy_stops, (order.stop_price, order.order_id, order))
+        else:
+            heapq.heappush(self.sell_stops, (-order.stop_price, order.order_id, order))
+
+    def orders(self) -> List[Order]:
+        """全部有效挂单，按委托编号排序。"""
+        pending = [o for o in self.market if o.status == PENDING]
+        for heap in (self.bids, self.asks, self.buy_stops, self.sell_stops):
+            pending.extend(item[2] for item in heap if item[2].status == PENDING)
+        return sorted(pending, key=lambda o: o.order_id)
+
+
+class FillLog:
+    """成交流水，各字段为并行的预分配数组，写满后容量翻倍。"""
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self._size = 0
+        self.order_id = np.empty(capacity, dtype=np.int64)
+        self.timestamp = np.empty(capacity, dtype=np.int64)
+        self.symbol_id = np.empty(capacity, dtype=np.int32)
+        self.side = np.empty(capacity, dtype=np.int8)
+        self.price = np.empty(capacity, dtype=np.float64)
+        self.quantity = np.empty(capacity, dtype=np.int64)
+        self.commission = np.empty(capacity, dtype=np.float64)
+        self.tax = np.empty(capacity, dtype=np.float64)
+
+    _FIELDS = ("order_id", "timestamp", "symbol_id", "side", "price", "quantity", "commission", "tax")
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, order_id: int, timestamp: int, symbol_id: int, side: int, price: float,
+               quantity: int, commission: float, tax: float) -> None:
+        i = self._size
+        if i == len(self.order_id):
+            self._grow()
+        self.order_id[i] = order_id
+        self.timestamp[i] = timestamp
+        self.symbol_id[i] = symbol_id
+        self.side[i] = side
+        self.price[i] = price
+        self.quantity[i] = quantity
+        self.commission[i] = commission
+        self.tax[i] = tax
+        self._size = i + 1
+
+    def _grow(self) -> None:
+        for name in self._FIELDS:
+            old = getattr(self, name)
+            new = np.empty(len(old) * 2, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def to_frame(self, symbols: List[str]) -> pd.DataFrame:
+        """转换为成交明细表，列与组合回测结果的 fills 一致并附带费用。"""
+        n = self._size
+        return pd.DataFrame({
+            "date": pd.to_datetime(self.timestamp[:n]),
+            "symbol": np.asarray(symbols, dtype=object)[self.symbol_id[:n]] if n else np.empty(0, dtype=object),
+            "side": np.where(self.side[:n] > 0, BUY, SELL),
+            "price": self.price[:n].copy(),
+            "shares": self.quantity[:n].copy(),
+            "commission": self.commission[:n].copy(),
+            "tax": self.tax[:n].copy(),
+            "order_id": self.order_id[:n].copy(),
+        })
+
+
+class PaperBroker:
+    """模拟券商：资金、持仓、挂单簿与成交流水。"""
+
+    def __init__(
+        self,
+        cash: float = 1_000_000.0,
+        commission_rate: float = 0.00025,
+        min_commission: float = 5.0,
+        stamp_duty: float = 0.0005,
+        lot_size: int = 100,
+        t_plus_one: bool = True,
+        fill_capacity: int = 1024,
+    ):
+        self.cash = float(cash)
+        self.commission_rate = commission_rate
+        self.min_commission = min_commission
+        self.stamp_duty = stamp_duty
+        self.lot_size = lot_size
+        self.t_plus_one = t_plus_one
+        self.fills = FillLog(fill_capacity)
+        self.orders: List[Order] = []
+        self._books: Dict[str, OrderBook] = {}
+        self._positions: Dict[str, int] = {}
+        self._bought_today: Dict[str, int] = {}
+        self._symbol_ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._day = np.iinfo(np.int64).min
+
+    @classmethod
+    def from_settings(cls, settings: Any, **kwargs: Any) -> "PaperBroker":
+        """根据 `Settings.execution` 构造，初始资金取自 `Settings.backtest.initial_capital`。"""
+        config = settings.execution
+        params = dict(
+            cash=settings.backtest.initial_capital,
+            commission_rate=config.commission_rate,
+            min_commission=config.min_commission,
+            stamp_duty=config.stamp_duty,
+            lot_size=config.lot_size,
+            t_plus_one=config.t_plus_one,
+        )
+        params.update(kwargs)
+        return cls(**params)
+
+    # ------------------------------------------------------------ 查询
+
+    @property
+    def symbols(self) -> List[str]:
+        """按首次出现顺序排列的标的列表，下标即成交流水中的 symbol_id。"""
+        return self._symbols
+
+    def position(self, symbol: str) -> int:
+        return self._positions.get(symbol, 0)
+
+    def sellable(self, symbol: str) -> int:
+        """当前可卖数量，T+1 下不含当日买入部分。"""
+        return self._positions.get(symbol, 0) - self._bought_today.get(symbol, 0)
+
+    def positions(self) -> Dict[str, int]:
+        return {symbol: qty for symbol, qty in self._positions.items() if qty}
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        if symbol is not None:
+            book = self._books.get(symbol)
+            return book.orders() if book is not None else []
+        return sorted((o for book in self._books.values() for o in book.orders()), key=lambda o: o.order_id)
+
+    def has_open_orders(self, symbol: str) -> bool:
+        """该标的是否有有效挂单，不构造挂单列表。"""
+        book = self._books.get(symbol)
+        return book is not None and book.pending > 0
+
+    def equity(self, prices: Mapping[str, float]) -> float:
+        """按给定价格计算的总资产。"""
+        return self.cash + sum(qty * prices[symbol] for symbol, qty in self._positions.items() if qty)
+
+    def fills_frame(self) -> pd.DataFrame:
+        return self.fills.to_frame(self._symbols)
+
+    # ------------------------------------------------------------ 委托
+
+    def submit(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        order_type: str = MARKET,
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        timestamp: TimestampLike = 0,
+    ) -> Order:
+        """
+        提交委托
+
+        买入数量向下取整到整手；卖出数量须为整手，或等于全部持仓（零股一次性卖出）。
+        不满足规则的委托直接以 REJECTED 状态返回，不进入挂单簿。
+        """
+        side = side.upper()
+        quantity = int(quantity)
+        if side == BUY:
+            quantity -= quantity % self.lot_size
+        order = Order(len(self.orders), symbol, side, quantity, order_type,
+                      _NAN if limit_price is None else float(limit_price),
+                      _NAN if stop_price is None else float(stop_price),
+                      _to_ns(timestamp))
+        self.orders.append(order)
+
+        if side not in (BUY, SELL) or order_type not in (MARKET, LIMIT, STOP):
+            return self._reject(order, "不支持的委托")
+        if quantity <= 0:
+            return self._reject(order, "数量不足一手")
+        if order_type == LIMIT and limit_price is None:
+            return self._reject(order, "限价单缺少限价")
+        if order_type == STOP and stop_price is None:
+            return self._reject(order, "止损单缺少触发价")
+        if side == SELL and quantity % self.lot_size and quantity != self.position(symbol):
+            return self._reject(order, "零股须一次性卖出")
+
+        if symbol not in self._symbol_ids:
+            self._symbol_ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = OrderBook()
+        book.add(order)
+        return order
+
+    def cancel(self, order_id: int) -> bool:
+        """撤销挂单，已成交或已撤销的委托返回 False。"""
+        if not 0 <= order_id < len(self.orders):
+            return False
+        order = self.orders[order_id]
+        if order.status != PENDING:
+            return False
+        # 挂单簿中的记录在撮合弹出时跳过
+        order.status = CANCELLED
+        self._books[order.symbol].pending -= 1
+        return True
+
+    @staticmethod
+    def _reject(order: Order, reason: str) -> Order:
+        order.status = REJECTED
+        order.reason = reason
+        return order
+
+    # ------------------------------------------------------------ 撮合
+
+    def _roll_day(self, timestamp: int) -> None:
+        """进入新的交易日，T+1 冻结的当日买入部分全部解冻。"""
+        self._day = timestamp // _DAY_NS
+        self._bought_today.clear()
+
+    def on_bar(self, symbol: str, timestamp: TimestampLike, open_: float, high: float, low: float,
+               close: float) -> int:
+        """
+        用一根K线撮合该标的的全部挂单
+
+        Returns:
+            int: 本根K线成交笔数
+        """
+        timestamp = _to_ns(timestamp)
+        if timestamp // _DAY_NS != self._day:
+            self._roll_day(timestamp)
+        book = self._books.get(symbol)
+        if book is None:
+            return 0
+        filled = 0
+        if book.market:
+            waiting = []
+            for order in book.market:
+                if order.status != PENDING:
+                    continue
+                if self._execute(order, open_, timestamp):
+                    filled += 1
+                elif order.status == PENDING:
+                    waiting.append(order)
+            book.market = waiting
+        if book.bids and -book.bids[0][0] >= low:
+            filled += self._match(book.bids, lambda key: -key >= low, lambda key: min(open_, -key), timestamp)
+        if book.asks and book.asks[0][0] <= high:
+            filled += self._match(book.asks, lambda key: key <= high, lambda key: max(open_, key), timestamp)
+        if book.buy_stops and book.buy_stops[0][0] <= high:
+            filled += self._match(book.buy_stops, lambda key: key <= high, lambda key: max(open_, key), timestamp)
+        if book.sell_stops and -book.sell_stops[0][0] >= low:
+            filled += self._match(book.sell_stops, lambda key: -key >= low, lambda key: min(open_, -key), timestamp)
+        return filled
+
+    def on_tick(self, symbol: str, timestamp: TimestampLike, price: float) -> int:
+        """用一笔最新成交价撮合该标的的全部挂单。"""
+        return self.on_bar(symbol, timestamp, price, price, price, price)
+
+    def _match(self, heap: List[tuple], crosses, fill_price, timestamp: int) -> int:
+        """从堆顶依次弹出价格可成交的委托并撮合，暂不可成交的委托放回堆中。"""
+        filled = 0
+        waiting = []
+        while heap and crosses(heap[0][0]):
+            item = heapq.heappop(heap)
+            order = item[2]
+            if order.status != PENDING:
+                continue
+            if self._execute(order, fill_price(item[0]), timestamp):
+                filled += 1
+            elif order.status == PENDING:
+                waiting.append(item)
+        for item in waiting:
+            heapq.heappush(heap, item)
+        return filled
+
+    def _execute(self, order: Order, price: float, timestamp: int) -> bool:
+        """按成交价更新资金与持仓，条件不满足时拒单或继续挂单。"""
+        symbol = order.symbol
+        quantity = order.quantity
+        amount = price * quantity
+        commission = max(amount * self.commission_rate, self.min_commission)
+        position = self._positions.get(symbol, 0)
+
+        book = self._books[symbol]
+        if order.side == BUY:
+            cost = amount + commission
+            if cost > self.cash:
+                self._reject(order, "资金不足")
+                book.pending -= 1
+                return False
+            self.cash -= cost
+            self._positions[symbol] = position + quantity
+            if self.t_plus_one:
+                self._bought_today[symbol] = self._bought_today.get(symbol, 0) + quantity
+            tax = 0.0
+            side = 1
+        else:
+            if quantity > position:
+                self._reject(order, "持仓不足")
+                book.pending -= 1
+                return False
+            if quantity > position - self._bought_today.get(symbol, 0):
+                # T+1：当日买入部分次日才可卖出，委托继续挂单
+                return False
+            tax = amount * self.stamp_duty
+            self.cash += amount - commission - tax
+            self._positions[symbol] = position - quantity
+            side = -1
+
+        order.status = FILLED
+        book.pending -= 1
+        self.fills.append(order.order_id, timestamp, self._symbol_ids[symbol], side, price, quantity, commission, tax)
+        return True
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import re
+from html import unescape
 from typing import Optional, Dict
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+
+from ..data.universe import registry
+from ..utils.cache import DiskCache
+from ..utils.http import FetchPolicy, http_get
+from ..utils.instrumentation import timed
 
 
 DEFAULT_HEADERS = {
@@ -27,60 +31,95 @@ def print_a_stock_without_st(
 ) -> pd.DataFrame:
     """返回剔除 ST 后的 A 股列表，可选按名称关键字筛选并打印。"""
 
-    df = pd.read_csv(csv_path, dtype=str)
-    mask = ~df["股票名称"].str.contains("ST", case=False, na=False)
-    df_filtered = df[mask]
-
+    universe = registry()
+    ids = universe.select(universe.load_csv(csv_path), exclude_st=True)
     if keyword:
-        df_target = df_filtered[df_filtered["股票名称"].str.contains(keyword, case=False, na=False)].copy()
-    else:
-        df_target = df_filtered.copy()
+        ids = universe.search(keyword, ids)
+    df_target = pd.DataFrame({"股票代码": universe.codes[ids], "股票名称": universe.names[ids]})
 
     if print_output:
-        for _, row in df_target.iterrows():
-            print(f"{row['股票代码']},{row['股票名称']}")
+        for code, name in zip(df_target["股票代码"], df_target["股票名称"]):
+            print(f"{code},{name}")
 
     return df_target
 
 
-def fetch_stock_analysis(stock_code: str = "03690") -> Dict[str, Optional[str]]:
-    url = f"https://tool.stockstar.com/access/GZAppraisement/{stock_code}"
-    response = requests.get(url, headers=DEFAULT_HEADERS, timeout=10)
-    if response.status_code != 200:
-        raise RuntimeError(
-            f"请求失败，状态码 {response.status_code}，请检查网络或更新请求头。"
+STOCKSTAR_ANALYSIS_URL = "https://tool.stockstar.com/access/GZAppraisement/{code}"
+TENCENT_QUOTE_URL = "http://qt.gtimg.cn/q={symbol}"
+
+
+# 估值页面字段标签 -> 返回字典中的键
+ANALYSIS_LABELS = {
+    "分析结果": "analysis",
+    "相对估值范围": "relative_range",
+    "绝对估值范围": "absolute_range",
+    "估值准确性": "accuracy",
+}
+
+# 一次扫描同时匹配页头股票名称（"美团-W (03690)估值分析"）与各估值字段（"标签：<span>值</span>"）
+_ANALYSIS_PATTERN = re.compile(
+    r">\s*(?P<stock>[^<>]*?)\s*估值分析\s*<"
+    r"|(?P<label>" + "|".join(ANALYSIS_LABELS) + r")\s*[：:]\s*(?:<[^>]*>\s*)*(?P<value>[^<]*)"
+)
+_TITLE_PATTERN = re.compile(r"<title[^>]*>\s*([^<]*?)\s*</title>", re.IGNORECASE)
+
+
+@timed("parse.stockstar")
+def parse_stock_analysis(html: str) -> Dict[str, Optional[str]]:
+    """解析证券之星估值分析页面，返回股票名称与各项估值字段。
+
+    不构建 DOM 树，而是用一个正则对原始 HTML 做单次顺序扫描，五个字段全部命中后立即停止；
+    每个字段取页面中第一次出现的值，未找到时为 None。
+    """
+    result: Dict[str, Optional[str]] = {"stock_text": None, **{key: None for key in ANALYSIS_LABELS.values()}}
+    remaining = len(result)
+    for match in _ANALYSIS_PATTERN.finditer(html):
+        label = match.group("label")
+        if label is None:
+            key, value = "stock_text", match.group("stock")
+        else:
+            key, value = ANALYSIS_LABELS[label], match.group("value")
+        value = unescape(value).strip() if value else ""
+        if not value or result[key] is not None:
+            continue
+        result[key] = value
+        remaining -= 1
+        if remaining == 0:
+            break
+
+    if not result["stock_text"]:
+        title = _TITLE_PATTERN.search(html)
+        result["stock_text"] = unescape(title.group(1)) if title and title.group(1) else None
+    return result
+
+
+# 缓存中的数据来源名称
+ANALYSIS_CACHE_SOURCE = "analysis"
+QUOTE_CACHE_SOURCE = "quote"
+
+
+def fetch_stock_analysis(
+    stock_code: str = "03690",
+    cache: Optional[DiskCache] = None,
+    timeout: float = 10.0,
+    policy: Optional[FetchPolicy] = None,
+) -> Dict[str, Optional[str]]:
+    if cache is not None:
+        return cache.get_or_fetch(
+            ANALYSIS_CACHE_SOURCE, stock_code, lambda: _download_stock_analysis(stock_code, timeout, policy)
         )
+    return _download_stock_analysis(stock_code, timeout, policy)
+
+
+@timed("http.analysis")
+def _download_stock_analysis(
+    stock_code: str, timeout: float, policy: Optional[FetchPolicy]
+) -> Dict[str, Optional[str]]:
+    """实际发起网络请求；只有这一段计入 http 耗时，缓存命中不会产生样本。"""
+    url = STOCKSTAR_ANALYSIS_URL.format(code=stock_code)
+    response = http_get(url, headers=DEFAULT_HEADERS, timeout=timeout, policy=policy)
     response.encoding = response.apparent_encoding or response.encoding or "utf-8"
-    soup = BeautifulSoup(response.text, "html.parser")
-    header_div = soup.select_one(".head_nav div:nth-of-type(2)")
-    stock_text = None
-    if header_div:
-        stock_text = header_div.get_text(strip=True)
-        if stock_text.endswith("估值分析"):
-            stock_text = stock_text[: -len("估值分析")].strip()
-    if not stock_text:
-        stock_text = soup.title.string.strip() if soup.title else None
-
-    def extract_metric(label: str) -> Optional[str]:
-        target = soup.find(
-            lambda tag: tag.name in {"p", "div", "span"}
-            and tag.get_text(strip=True).startswith(label)
-        )
-        if not target:
-            return None
-        text = target.get_text(separator="", strip=True)
-        for sep in ("：", ":"):
-            if sep in text:
-                return text.split(sep, 1)[1].strip()
-        return text.strip()
-
-    return {
-        "stock_text": stock_text,
-        "analysis": extract_metric("分析结果"),
-        "relative_range": extract_metric("相对估值范围"),
-        "absolute_range": extract_metric("绝对估值范围"),
-        "accuracy": extract_metric("估值准确性"),
-    }
+    return parse_stock_analysis(response.text)
 
 
 def print_info_from_url(
@@ -102,23 +141,17 @@ def print_info_from_url(
     return analysis_data
 
 
-def fetch_realtime_price(stock_code: str, timeout: float = 5.0) -> float:
-    normalized = stock_code.strip()
-    if not normalized.isdigit():
-        raise ValueError("股票代码需为数字。")
-    
-    if len(normalized) == 5:
-        prefix = "hk"
-    elif len(normalized) == 6:
-        prefix = "sh" if normalized.startswith(("5", "6", "9")) else "sz"
-    else:
-        raise ValueError("股票代码需为 5 位 (港股) 或 6 位 (A股) 数字。")
-
-    url = f"http://qt.gtimg.cn/q={prefix}{normalized}"
-    response = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
-    if response.status_code != 200:
-        raise RuntimeError(f"请求实时行情失败，状态码 {response.status_code}。")
-    payload = response.text.strip()
+def tencent_symbol(stock_code: str) -> str:
+    """将 5 位港股或 6 位 A 股代码转换为腾讯行情接口使用的带市场前缀代码。
+
+    前缀在代码登记到标的注册表时计算一次，之后直接查表。
+    """
+    return registry().symbol(stock_code.strip())
+
+
+def parse_realtime_price(payload: str) -> float:
+    """从腾讯行情接口的单条返回内容中解析当前价格。"""
+    payload = payload.strip()
     if "=" not in payload:
         raise ValueError("返回内容异常，未找到行情数据。")
     raw_data = payload.split("=", 1)[1].strip().strip('";')
@@ -130,13 +163,39 @@ def fetch_realtime_price(stock_code: str, timeout: float = 5.0) -> float:
     return float(fields[3])
 
 
+def fetch_realtime_price(
+    stock_code: str,
+    timeout: float = 5.0,
+    cache: Optional[DiskCache] = None,
+    policy: Optional[FetchPolicy] = None,
+) -> float:
+    if cache is not None:
+        return cache.get_or_fetch(
+            QUOTE_CACHE_SOURCE, stock_code, lambda: _download_realtime_price(stock_code, timeout, policy)
+        )
+    return _download_realtime_price(stock_code, timeout, policy)
+
+
+@timed("http.quote")
+def _download_realtime_price(stock_code: str, timeout: float, policy: Optional[FetchPolicy]) -> float:
+    """实际请求腾讯行情接口，缓存命中时不会走到这里。"""
+    url = TENCENT_QUOTE_URL.format(symbol=tencent_symbol(stock_code))
+    response = http_get(url, headers=DEFAULT_HEADERS, timeout=timeout, policy=policy)
+    return parse_realtime_price(response.text)
+
+
+# 估值范围中的前两个数字；紧跟在数字后的 "-" 是区间分隔符而不是负号（"93.16-102.97"）
+RANGE_PATTERN = r"(?<![\d.])(-?\d+(?:\.\d+)?)\D*?(?<![\d.])(-?\d+(?:\.\d+)?)"
+_RANGE_PATTERN = re.compile(RANGE_PATTERN)
+
+
 def parse_relative_range(range_text: str) -> Optional[tuple[float, float]]:
     if not range_text:
         return None
-    matches = re.findall(r"-?\d+(?:\.\d+)?", range_text)
-    if len(matches) < 2:
+    match = _RANGE_PATTERN.search(range_text)
+    if match is None:
         return None
-    lower, upper = map(float, matches[:2])
+    lower, upper = map(float, match.groups())
     if lower > upper:
         lower, upper = upper, lower
     return lower, upper
@@ -1,5 +1,13 @@
-"""特征工程模块。"""
+"""特征工程模块。
 
-import os
+行情抓取（requests / aiohttp）、估值解析与特征缓存各自按需导入。
+"""
 
-__all__ = []
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {"FACTORS": "factors", "FeatureStore": "store", "INDICATORS": "indicators", "LiveMonitor": "monitor",
+     "atr": "indicators", "rsi": "indicators", "sma": "indicators"},
+    submodules=["A_stock", "checkpoint", "factors", "hk_tech", "indicators", "monitor", "quotes", "scanner", "store"],
+)
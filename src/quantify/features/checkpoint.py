@@ -0,0 +1,97 @@
+"""扫描断点文件：每完成一只股票就追加一行 JSON，中断后可从断点继续。
+
+文件为只追加的 JSON Lines，每行记录一只股票的价格与估值分析。进程在写入中途被杀时，
+最后一行可能不完整，读取时会被忽略，对应的股票在下次运行时重新扫描。
+失败的股票不写入断点，重启后自动重试。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from .scanner import ScanResult
+
+CHECKPOINT_DIR = "scans"
+
+
+class ScanCheckpoint:
+    """只追加的扫描断点文件。"""
+
+    def __init__(self, path: Path, fsync: bool = False):
+        self._path = Path(path)
+        self._fsync = fsync
+        self._records: Dict[str, ScanResult] = {}
+        self._handle = None
+        self._load()
+
+    @classmethod
+    def for_run(cls, settings: Any, run_id: str, **kwargs: Any) -> "ScanCheckpoint":
+        """同一 run_id（如日期 + 市场）对应同一个断点文件，位于 `Settings.cache_dir/scans` 下。"""
+        return cls(Path(settings.cache_dir) / CHECKPOINT_DIR / f"{run_id}.jsonl", **kwargs)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def done(self) -> Set[str]:
+        return set(self._records)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def records(self) -> List[ScanResult]:
+        """按首次完成顺序返回全部已完成的结果。"""
+        return list(self._records.values())
+
+    def _load(self) -> None:
+        if not self._path.exists():
+            return
+        with self._path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    # 中断时写了一半的行
+                    continue
+                self._records[row["code"]] = ScanResult(code=row["code"], price=row["price"], analysis=row["analysis"])
+
+    def append(self, result: ScanResult) -> None:
+        """追加一条成功的扫描结果，失败结果不记录。"""
+        if not result.ok:
+            return
+        if self._handle is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self._path.open("a", encoding="utf-8")
+            # 上次中断可能留下没有换行结尾的半行，先补换行使其独立成行
+            if self._handle.tell() > 0 and not self._ends_with_newline():
+                self._handle.write("\n")
+        line = json.dumps({"code": result.code, "price": result.price, "analysis": result.analysis},
+                          ensure_ascii=False)
+        self._handle.write(line + "\n")
+        self._handle.flush()
+        if self._fsync:
+            os.fsync(self._handle.fileno())
+        self._records[result.code] = result
+
+    def _ends_with_newline(self) -> bool:
+        with self._path.open("rb") as fh:
+            fh.seek(-1, os.SEEK_END)
+            return fh.read(1) == b"\n"
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> "ScanCheckpoint":
+        return self
+
+    def __exit__(self, *exc: Optional[BaseException]) -> None:
+        self.close()
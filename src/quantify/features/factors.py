@@ -0,0 +1,130 @@
+"""截面因子：在 日期 × 标的 面板上整列计算因子，并按日期做排名、标准化与选股。
+
+因子函数的输入输出都是形状为 (日期, 标的) 的二维数组，数据不足或缺失处为 NaN；
+截面运算（`rank` / `zscore` / `top_n`）沿标的方向（axis=1）对每个日期同时计算，
+NaN 不参与排名与标准化，也不会被选中。全部为整块的 NumPy 数组运算，不按日期或标的循环
+（`volatility` 为控制临时内存按列分块）。
+"""
+
+from typing import Callable, Dict, Mapping, Optional
+
+import numpy as np
+
+Factor = Callable[..., np.ndarray]
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """沿日期方向后移 `periods` 行，前面补 NaN。"""
+    out = np.full_like(values, np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def momentum(close: np.ndarray, lookback: int = 252, skip: int = 21) -> np.ndarray:
+    """动量：`skip` 个交易日前相对 `lookback + skip` 个交易日前的涨幅，跳过最近一个月以避开短期反转。"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _shift(close, skip) / _shift(close, skip + lookback) - 1
+
+
+def volatility(close: np.ndarray, window: int = 20, block: int = 1024) -> np.ndarray:
+    """
+    滚动波动率：最近 `window` 个日对数收益的样本标准差，窗口内有缺失时为 NaN。
+
+    窗口和由 float64 累计和做差得到；按 `block` 列分块计算，临时数组的内存与标的总数无关。
+    """
+    out = np.full(close.shape, np.nan, dtype=close.dtype if close.dtype.kind == "f" else np.float64)
+    if window < 2 or len(close) <= window:
+        return out
+    for lo in range(0, close.shape[1], block):
+        part = close[:, lo:lo + block].astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.log(part[1:] / part[:-1])
+        valid = np.isfinite(returns)
+        returns[~valid] = 0.0
+        zeros = np.zeros((1, part.shape[1]))
+        s1 = np.concatenate([zeros, np.cumsum(returns, axis=0)])
+        s2 = np.concatenate([zeros, np.cumsum(returns * returns, axis=0)])
+        count = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+        total = s1[window:] - s1[:-window]
+        var = (s2[window:] - s2[:-window] - total * total / window) / (window - 1)
+        full = count[window:] - count[:-window] == window
+        out[window:, lo:lo + block] = np.where(full, np.sqrt(np.maximum(var, 0.0)), np.nan)
+    return out
+
+
+def valuation_discount(close: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """相对估值区间中点的折价比例，正数表示低于中点，与 `screener.screen` 的 discount 一致。"""
+    midpoint = (lower + upper) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (midpoint - close) / midpoint
+
+
+def rank(values: np.ndarray, pct: bool = True) -> np.ndarray:
+    """
+    每个日期的截面排名，升序，最小值为 1（`pct` 时为 1/有效数）；NaN 保持为 NaN。
+
+    相同取值按标的顺序依次排名，不取平均名次。
+    """
+    values = np.asarray(values)
+    missing = np.isnan(values)
+    # NaN 排到最后，有效值的名次不受影响
+    order = np.argsort(np.where(missing, np.inf, values), axis=1, kind="stable")
+    ranks = np.empty(values.shape, dtype=values.dtype if values.dtype.kind == "f" else np.float64)
+    np.put_along_axis(ranks, order, np.arange(1, values.shape[1] + 1, dtype=ranks.dtype)[None, :], axis=1)
+    if pct:
+        count = (~missing).sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ranks /= count
+    ranks[missing] = np.nan
+    return ranks
+
+
+def zscore(values: np.ndarray) -> np.ndarray:
+    """每个日期的截面标准化 (x - 均值) / 标准差，有效值少于 2 个或标准差为 0 的日期为 NaN。"""
+    values = np.asarray(values)
+    dtype = values.dtype if values.dtype.kind == "f" else np.dtype(np.float64)
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=1, keepdims=True)
+    # 逐行求和用 float64 累加，整块的临时数组保持输入精度
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(valid, values, 0).sum(axis=1, keepdims=True, dtype=np.float64) / count
+        centered = (values - mean.astype(dtype)).astype(dtype, copy=False)
+        var = np.square(np.where(valid, centered, 0)).sum(axis=1, keepdims=True, dtype=np.float64) / (count - 1)
+        std = np.sqrt(var).astype(dtype)
+        return centered / np.where(std > 0, std, np.nan).astype(dtype)
+
+
+def top_n(scores: np.ndarray, n: int) -> np.ndarray:
+    """每个日期得分最高的 `n` 个标的，返回布尔掩码；有效标的不足 `n` 个时全部选中。"""
+    scores = np.asarray(scores)
+    valid = ~np.isnan(scores)
+    if n <= 0:
+        return np.zeros(scores.shape, dtype=bool)
+    if n >= scores.shape[1]:
+        return valid
+    # argpartition 只保证前 n 个是最大的 n 个，不做完整排序
+    picked = np.argpartition(np.where(valid, -scores, np.inf), n - 1, axis=1)[:, :n]
+    mask = np.zeros(scores.shape, dtype=bool)
+    np.put_along_axis(mask, picked, True, axis=1)
+    return mask & valid
+
+
+def composite(factors: Mapping[str, np.ndarray], weights: Mapping[str, float]) -> np.ndarray:
+    """各因子截面 z-score 的加权和；任一因子缺失的格为 NaN。"""
+    total: Optional[np.ndarray] = None
+    for name, weight in weights.items():
+        term = zscore(factors[name]) * np.float32(weight)
+        total = term if total is None else total + term
+    if total is None:
+        raise ValueError("至少需要一个因子权重")
+    return total
+
+
+# 名称 -> 因子函数，参数为面板与因子参数；估值折价需要面板包含 value_lower / value_upper 字段
+FACTORS: Dict[str, Factor] = {
+    "momentum": lambda panel, lookback=252, skip=21: momentum(panel["close"], lookback, skip),
+    "volatility": lambda panel, window=20: volatility(panel["close"], window),
+    "valuation_discount": lambda panel: valuation_discount(panel["close"], panel["value_lower"],
+                                                           panel["value_upper"]),
+}
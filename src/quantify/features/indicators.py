@@ -0,0 +1,232 @@
+"""向量化技术指标，计算口径与 TA-Lib 的 SMA、RSI、ATR 一致。
+
+输入可以是一维序列，也可以是 ``(时间, 标的)`` 的二维面板：一次调用即可算完整个股票池。
+面板中各列开头的 NaN 视为尚未上市的填充，指标从该列第一个有效值开始预热，
+因此长度不同的标的可以右对齐后放进同一个面板，结果与逐只调用 TA-Lib 相同。
+
+每个指标都以「状态 + 步进」的形式实现：``init`` 给出空状态，``step`` 消费新的K线并返回
+指标值与新状态。全量计算等于从空状态步进一次，追加K线时只需从保存的状态继续步进。
+RSI/ATR 的 Wilder 递推只有 `rsi_update` / `atr_update` 一份实现，面板计算与
+`RollingIndicators` 的逐根更新共用；安装了 numba 时面板递推会被 JIT 编译。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:  # numba 为可选依赖，安装后 RSI/ATR 的逐K线递推会被 JIT 编译
+    from numba import njit
+except ImportError:  # pragma: no cover - 取决于运行环境
+    njit = None
+
+State = Dict[str, np.ndarray]
+
+
+def _as_2d(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    return values.reshape(len(values), -1)
+
+
+# ---------------------------------------------------------------- SMA
+
+def _sma_init(columns: int, period: int) -> State:
+    return {"window": np.full((period - 1, columns), np.nan)}
+
+
+def _sma_step(state: State, close: np.ndarray, period: int) -> Tuple[np.ndarray, State]:
+    """窗口内任意值缺失时结果为 NaN，否则为窗口均值。"""
+    if len(close) == 0:
+        return np.empty(close.shape), state
+    joined = np.concatenate([state["window"], close])
+    out = sliding_window_view(joined, period, axis=0).mean(axis=-1)
+    return out, {"window": joined[len(joined) - (period - 1):]}
+
+
+# ---------------------------------------------------------------- Wilder 平滑
+
+def rsi_update(n: int, diff: float, gain: float, loss: float, period: int) -> Tuple[float, float, float]:
+    """
+    RSI 的单步递推：前 period 个涨跌幅取均值作种子，之后按 Wilder 方式平滑。
+
+    Args:
+        n: 本根K线之前已有的有效K线数量（至少为 1）
+        diff: 相对前一根收盘价的涨跌
+        gain, loss: 上一步的平均涨幅与平均跌幅（预热期内为累计值）
+        period: 周期
+
+    Returns:
+        Tuple: (gain, loss, rsi)，预热期内 rsi 为 NaN
+    """
+    if n <= period:
+        if diff < 0:
+            loss -= diff
+        else:
+            gain += diff
+        if n == period:
+            gain /= period
+            loss /= period
+    else:
+        gain *= period - 1
+        loss *= period - 1
+        if diff < 0:
+            loss -= diff
+        else:
+            gain += diff
+        gain /= period
+        loss /= period
+    if n < period:
+        return gain, loss, np.nan
+    total = gain + loss
+    # 零值判定与 TA-Lib 的 TA_IS_ZERO 一致
+    if -0.00000001 < total < 0.00000001:
+        return gain, loss, 0.0
+    return gain, loss, 100.0 * (gain / total)
+
+
+def atr_update(n: int, true_range: float, atr: float, period: int) -> Tuple[float, float]:
+    """
+    ATR 的单步递推：前 period 个真实波幅取均值作种子，之后按 Wilder 方式平滑。
+
+    参数含义同 `rsi_update`，返回 (atr, 指标值)，预热期内指标值为 NaN。
+    """
+    if n < period:
+        atr += true_range
+    elif n == period:
+        atr = (atr + true_range) / period
+    else:
+        atr = (atr * (period - 1) + true_range) / period
+    return atr, (atr if n >= period else np.nan)
+
+
+def _rsi_panel(close, count, prev_close, gain, loss, period, out):
+    """逐列递推 RSI，原地更新状态数组；NaN 收盘价跳过，不计入K线数量。"""
+    for j in range(close.shape[1]):
+        n, prev, g, l = count[j], prev_close[j], gain[j], loss[j]
+        for t in range(close.shape[0]):
+            c = close[t, j]
+            if np.isnan(c):
+                continue
+            if n > 0:
+                g, l, value = _rsi_update(n, c - prev, g, l, period)
+                out[t, j] = value
+            prev = c
+            n += 1
+        count[j], prev_close[j], gain[j], loss[j] = n, prev, g, l
+
+
+def _atr_panel(high, low, close, count, prev_close, atr, period, out):
+    """逐列递推 ATR，原地更新状态数组；NaN 收盘价跳过，不计入K线数量。"""
+    for j in range(close.shape[1]):
+        n, prev, a = count[j], prev_close[j], atr[j]
+        for t in range(close.shape[0]):
+            c = close[t, j]
+            if np.isnan(c):
+                continue
+            if n > 0:
+                h, lo = high[t, j], low[t, j]
+                true_range = max(h - lo, abs(h - prev), abs(lo - prev))
+                a, value = _atr_update(n, true_range, a, period)
+                out[t, j] = value
+            prev = c
+            n += 1
+        count[j], prev_close[j], atr[j] = n, prev, a
+
+
+def _jit(func):
+    return njit(cache=True, nogil=True)(func) if njit is not None else func
+
+
+# 面板递推在安装 numba 时 JIT 编译；增量计算器逐根调用的是未编译的 rsi_update / atr_update
+_rsi_update = _jit(rsi_update)
+_atr_update = _jit(atr_update)
+_rsi_kernel = _jit(_rsi_panel)
+_atr_kernel = _jit(_atr_panel)
+
+
+# ---------------------------------------------------------------- RSI
+
+def _rsi_init(columns: int, period: int) -> State:
+    return {
+        "count": np.zeros(columns, dtype=np.int64),
+        "prev_close": np.full(columns, np.nan),
+        "gain": np.zeros(columns),
+        "loss": np.zeros(columns),
+    }
+
+
+def _rsi_step(state: State, close: np.ndarray, period: int) -> Tuple[np.ndarray, State]:
+    """Wilder 平滑的 RSI，见 `rsi_update`。"""
+    state = {key: value.copy() for key, value in state.items()}
+    out = np.full(close.shape, np.nan)
+    _rsi_kernel(np.ascontiguousarray(close), state["count"], state["prev_close"], state["gain"], state["loss"],
+                int(period), out)
+    return out, state
+
+
+# ---------------------------------------------------------------- ATR
+
+def _atr_init(columns: int, period: int) -> State:
+    return {
+        "count": np.zeros(columns, dtype=np.int64),
+        "prev_close": np.full(columns, np.nan),
+        "atr": np.zeros(columns),
+    }
+
+
+def _atr_step(state: State, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+              period: int) -> Tuple[np.ndarray, State]:
+    """Wilder 平滑的 ATR，见 `atr_update`。"""
+    state = {key: value.copy() for key, value in state.items()}
+    out = np.full(close.shape, np.nan)
+    _atr_kernel(np.ascontiguousarray(high), np.ascontiguousarray(low), np.ascontiguousarray(close),
+                state["count"], state["prev_close"], state["atr"], int(period), out)
+    return out, state
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """指标定义：输入列、空状态构造函数与步进函数。"""
+
+    name: str
+    inputs: Tuple[str, ...]
+    init: Callable[..., State]
+    step: Callable[..., Tuple[np.ndarray, State]]
+
+    def compute(self, *arrays: np.ndarray, **params: int) -> Tuple[np.ndarray, State]:
+        """从空状态计算二维面板 ``(时间, 标的)``，返回指标值与末尾状态。"""
+        panels = [_as_2d(a) for a in arrays]
+        return self.step(self.init(panels[0].shape[1], **params), *panels, **params)
+
+    def extend(self, state: State, *arrays: np.ndarray, **params: int) -> Tuple[np.ndarray, State]:
+        """从保存的状态继续计算新追加的K线。"""
+        return self.step(state, *[_as_2d(a) for a in arrays], **params)
+
+
+INDICATORS: Dict[str, IndicatorSpec] = {
+    "sma": IndicatorSpec("sma", ("close",), _sma_init, _sma_step),
+    "rsi": IndicatorSpec("rsi", ("close",), _rsi_init, _rsi_step),
+    "atr": IndicatorSpec("atr", ("high", "low", "close"), _atr_init, _atr_step),
+}
+
+
+def _shaped(values: np.ndarray, like: np.ndarray) -> np.ndarray:
+    return values.reshape(np.shape(like))
+
+
+def sma(close: np.ndarray, period: int = 30) -> np.ndarray:
+    """简单移动平均，等价于 ``talib.SMA``。"""
+    return _shaped(INDICATORS["sma"].compute(close, period=period)[0], close)
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """相对强弱指标，等价于 ``talib.RSI``。"""
+    return _shaped(INDICATORS["rsi"].compute(close, period=period)[0], close)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """平均真实波幅，等价于 ``talib.ATR``。"""
+    return _shaped(INDICATORS["atr"].compute(high, low, close, period=period)[0], close)
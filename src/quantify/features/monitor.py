@@ -0,0 +1,306 @@
+"""盘中实时监控：按固定间隔轮询行情，在内存中维护最新快照并即时发出低估提醒。
+
+与每次从头扫描的 `main.py` 不同，监控进程常驻运行：
+
+- 交易时段内每隔 `interval` 秒批量拉取一次全部标的的报价，非交易时段休眠到下一次开盘；
+- 价格、估值上下限、是否被低估与是否已提醒都按标的存放在与代码列表对齐的 NumPy 数组中，
+  每次刷新只对价格发生变化的标的重新计算估值位置；
+- 证券之星估值分析每个标的每个交易日只抓取一次，在后台并发进行，
+  抓取完成后立即用最新价格判断一次，不必等到下一次刷新；
+- 标的由"不满足"变为"被低估且价格处于估值区间前半段"时产生提醒，立即交给 `on_alert`。
+
+行情与估值来自 `source`，需提供 ``async quotes(codes) -> DataFrame``（以代码为索引、含 price 列，
+与 `parse_tencent_quotes` 一致）与 ``async analysis(code) -> dict``（与 `parse_stock_analysis` 一致）；
+`ScannerSource` 通过 `AsyncScanner` 访问网络，测试可以换成本地桩。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+from ..strategies.screener import UNDERVALUED_KEYWORD, valuation_position
+from ..utils.cache import trading_day
+from ..utils.instrumentation import timed
+from ..utils.logging import get_logger
+from .A_stock import parse_relative_range
+
+if TYPE_CHECKING:
+    from ..data.calendar import TradingCalendar
+    from .scanner import AsyncScanner
+
+logger = get_logger(__name__)
+
+
+class QuoteSource(Protocol):
+    """监控使用的行情与估值数据源。"""
+
+    async def quotes(self, codes: Sequence[str]) -> pd.DataFrame: ...
+
+    async def analysis(self, code: str) -> Dict[str, Optional[str]]: ...
+
+
+class ScannerSource:
+    """通过 `AsyncScanner` 抓取腾讯行情与证券之星估值，在监控运行期间复用同一个会话。
+
+    需在 ``async with`` 中使用；行情不经过缓存，估值分析按扫描器的缓存配置读写。
+    """
+
+    def __init__(self, scanner: "AsyncScanner"):
+        self._scanner = scanner
+        self._connection = None
+        self._session = None
+        self._limiter = None
+
+    async def __aenter__(self) -> "ScannerSource":
+        self._connection = self._scanner.connect()
+        self._session, self._limiter = await self._connection.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await connection.__aexit__(*exc_info)
+
+    async def quotes(self, codes: Sequence[str]) -> pd.DataFrame:
+        return await self._scanner.fetch_quote_frame(self._session, self._limiter, codes)
+
+    async def analysis(self, code: str) -> Dict[str, Optional[str]]:
+        return await self._scanner.fetch_analysis(self._session, self._limiter, code)
+
+
+@dataclass
+class Alert:
+    """一次低估提醒。"""
+
+    code: str
+    price: float
+    lower: float
+    upper: float
+    discount: float
+    time: pd.Timestamp
+    name: str = ""
+    analysis: str = ""
+    relative_range: str = ""
+
+
+def print_alert(alert: Alert) -> None:
+    """默认的提醒输出，格式与逐只扫描时打印的低估信息一致。"""
+    print("==================")
+    print(f"[{alert.time:%H:%M:%S}] 股票代码：{alert.code} {alert.name}")
+    print(f"当前股价：{alert.price} 元，相对估值范围：{alert.relative_range}，距中点折价 {alert.discount:.1%}")
+    print(f"分析结果：{alert.analysis}")
+
+
+class LiveMonitor:
+    """常驻的盘中监控，`snapshot()` 返回最近一次刷新后的全部标的状态。"""
+
+    def __init__(
+        self,
+        codes: Sequence[str],
+        source: QuoteSource,
+        interval: float = 5.0,
+        calendar: Optional["TradingCalendar"] = None,
+        on_alert: Optional[Callable[[Alert], Any]] = print_alert,
+        analysis_concurrency: int = 10,
+        clock: Callable[[], pd.Timestamp] = pd.Timestamp.now,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        """
+        Args:
+            codes: 监控的股票代码
+            source: 行情与估值数据源，见 `QuoteSource`
+            interval: 行情刷新间隔（秒）
+            calendar: 交易日历，提供交易日与交易时段；为空时不区分交易时段，一直轮询
+            on_alert: 提醒回调，可以是普通函数或协程函数
+            analysis_concurrency: 同时抓取估值分析的股票数量上限
+            clock: 当前时间（交易所当地时间）
+            sleep: 等待函数，测试时可替换
+        """
+        self.codes = np.asarray(list(dict.fromkeys(code.strip() for code in codes)), dtype=str)
+        self._source = source
+        self.interval = interval
+        self._calendar = calendar
+        self._on_alert = on_alert
+        self._semaphore = asyncio.Semaphore(analysis_concurrency)
+        self._clock = clock
+        self._sleep = sleep
+
+        n = len(self.codes)
+        self.price = np.full(n, np.nan)
+        self.updated: Optional[pd.Timestamp] = None
+        self.alerts: List[Alert] = []
+        self.ticks = 0
+        self._day: Optional[str] = None
+        self._analysis: Dict[str, Dict[str, Optional[str]]] = {}
+        self._pending: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._reset_valuation()
+
+    @classmethod
+    def from_settings(cls, settings: Any, codes: Sequence[str], source: QuoteSource, **kwargs: Any) -> "LiveMonitor":
+        """根据 `Settings.monitor` 构造监控，交易时段取自配置交易所的日历。"""
+        from ..data.calendar import TradingCalendar
+
+        config = settings.monitor
+        options = {
+            "interval": config.interval,
+            "calendar": TradingCalendar.from_settings(settings, config.exchange),
+            "analysis_concurrency": config.analysis_concurrency,
+        }
+        options.update(kwargs)
+        return cls(codes, source, **options)
+
+    def _reset_valuation(self) -> None:
+        """新交易日清空估值与提醒状态，估值分析重新抓取。"""
+        n = len(self.codes)
+        self.lower = np.full(n, np.nan)
+        self.upper = np.full(n, np.nan)
+        self.undervalued = np.zeros(n, dtype=bool)
+        self.analysed = np.zeros(n, dtype=bool)
+        self.hit = np.zeros(n, dtype=bool)
+        self._analysis.clear()
+        # 前一交易日未完成的抓取结果作废
+        self._pending.clear()
+        self.alerts = []
+
+    def _roll_day(self, now: pd.Timestamp) -> bool:
+        """切换交易日时重置估值状态，返回是否发生了跨日。"""
+        day = trading_day(now.to_pydatetime())
+        rolled = self._day is not None and day != self._day
+        if rolled:
+            logger.info("进入新交易日 %s，重新抓取估值分析", day)
+            self._reset_valuation()
+        self._day = day
+        return rolled
+
+    @timed("monitor.tick")
+    async def tick(self, now: Optional[pd.Timestamp] = None) -> List[Alert]:
+        """刷新一次行情，返回本次刷新产生的提醒；价格未变化的标的不重新计算。"""
+        now = pd.Timestamp(now) if now is not None else self._clock()
+        rolled = self._roll_day(now)
+        quotes = await self._source.quotes(self.codes.tolist())
+        quotes = quotes[~quotes.index.duplicated(keep="last")]
+        prices = quotes["price"].reindex(self.codes).to_numpy(dtype=np.float64)
+        changed = np.flatnonzero(np.isfinite(prices) & (prices != self.price))
+        self.price[changed] = prices[changed]
+        if rolled:
+            # 跨日后估值已清空，价格与前一日相同的标的也要重新抓取分析
+            changed = np.flatnonzero(np.isfinite(self.price))
+        self.updated = now
+        self.ticks += 1
+
+        self._request_analysis(changed[~self.analysed[changed]])
+        return await self._evaluate(changed, now)
+
+    def _request_analysis(self, rows: np.ndarray) -> None:
+        for row in rows.tolist():
+            if row not in self._pending:
+                self._pending.add(row)
+                task = asyncio.create_task(self._fetch_analysis(row, self._day))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _fetch_analysis(self, row: int, day: Optional[str]) -> None:
+        code = str(self.codes[row])
+        async with self._semaphore:
+            try:
+                analysis = await self._source.analysis(code)
+            except Exception as exc:  # 失败的标的在价格下次变化时重试
+                logger.warning("获取 %s 估值分析失败: %s: %s", code, type(exc).__name__, exc)
+                analysis = None
+        # 前一交易日发起的抓取不得改动新交易日的状态，包括新交易日同一标的的待抓取标记
+        if day != self._day:
+            return
+        self._pending.discard(row)
+        if analysis is None:
+            return
+        self._analysis[code] = analysis
+        bounds = parse_relative_range(analysis.get("relative_range") or "")
+        self.lower[row], self.upper[row] = bounds if bounds else (np.nan, np.nan)
+        self.undervalued[row] = UNDERVALUED_KEYWORD in (analysis.get("analysis") or "")
+        self.analysed[row] = True
+        await self._evaluate(np.array([row]), self.updated or self._clock())
+
+    async def _evaluate(self, rows: np.ndarray, now: pd.Timestamp) -> List[Alert]:
+        """重新判断 `rows` 中已有估值的标的，对新满足条件的标的发出提醒。"""
+        rows = rows[self.analysed[rows]]
+        if not len(rows):
+            return []
+        price = self.price[rows]
+        _, front_half, discount, _ = valuation_position(price, self.lower[rows], self.upper[rows])
+        hit = self.undervalued[rows] & front_half & np.isfinite(price)
+        fresh = hit & ~self.hit[rows]
+        self.hit[rows] = hit
+
+        alerts = []
+        for row, d in zip(rows[fresh].tolist(), discount[fresh].tolist()):
+            code = str(self.codes[row])
+            analysis = self._analysis.get(code, {})
+            alerts.append(Alert(
+                code=code, price=float(self.price[row]), lower=float(self.lower[row]),
+                upper=float(self.upper[row]), discount=d, time=now, name=analysis.get("stock_text") or "",
+                analysis=analysis.get("analysis") or "", relative_range=analysis.get("relative_range") or "",
+            ))
+        for alert in alerts:
+            self.alerts.append(alert)
+            if self._on_alert is not None:
+                result = self._on_alert(alert)
+                if inspect.isawaitable(result):
+                    await result
+        return alerts
+
+    async def drain(self) -> None:
+        """等待已发起的估值分析抓取全部完成。"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def run(self, max_ticks: Optional[int] = None) -> None:
+        """
+        持续监控：交易时段内按间隔刷新，非交易时段休眠到下一次开盘。
+
+        Args:
+            max_ticks: 刷新次数上限，默认一直运行直到任务被取消
+        """
+        try:
+            while max_ticks is None or self.ticks < max_ticks:
+                now = self._clock()
+                if self._calendar is not None and not self._calendar.is_open(now):
+                    wait = (self._calendar.next_open(now) - now).total_seconds()
+                    logger.info("非交易时段，%.0f 秒后开盘", wait)
+                    await self._sleep(max(wait, 0.0))
+                    continue
+                started = time.perf_counter()
+                try:
+                    await self.tick(now)
+                except Exception as exc:  # 单次刷新失败不中断监控
+                    logger.warning("行情刷新失败: %s: %s", type(exc).__name__, exc)
+                    self.ticks += 1
+                await self._sleep(max(self.interval - (time.perf_counter() - started), 0.0))
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def snapshot(self) -> pd.DataFrame:
+        """最近一次刷新后的全部标的状态，以代码为索引。"""
+        _, front_half, discount, _ = valuation_position(self.price, self.lower, self.upper)
+        return pd.DataFrame(
+            {
+                "price": self.price,
+                "lower": self.lower,
+                "upper": self.upper,
+                "discount": discount,
+                "undervalued": self.undervalued,
+                "front_half": front_half,
+                "analysed": self.analysed,
+                "alerting": self.hit,
+            },
+            index=pd.Index(self.codes, name="code"),
+        )
@@ -0,0 +1,128 @@
+"""腾讯行情批量查询，一次请求获取多只股票的实时报价。
+
+`qt.gtimg.cn/q=` 接口支持逗号分隔的多个代码，返回内容为多行
+``v_sh600000="1~浦发银行~600000~10.50~...";``，字段以 ``~`` 分隔。
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ..utils.http import FetchPolicy, http_get
+from ..utils.instrumentation import timed
+from ..data.universe import registry
+from .A_stock import DEFAULT_HEADERS, TENCENT_QUOTE_URL
+
+if TYPE_CHECKING:
+    import requests
+
+# 一次请求包含的最大代码数量，过长的 URL 会被服务端截断
+DEFAULT_CHUNK_SIZE = 100
+
+# 腾讯行情字段位置 -> 列名，A 股与港股前 38 个字段含义一致
+QUOTE_TEXT_FIELDS = {1: "name", 30: "timestamp"}
+QUOTE_FLOAT_FIELDS = {
+    3: "price",
+    4: "prev_close",
+    5: "open",
+    6: "volume",
+    31: "change",
+    32: "change_pct",
+    33: "high",
+    34: "low",
+    37: "amount",
+}
+QUOTE_COLUMNS = ["symbol", "name", "price", "prev_close", "open", "high", "low", "volume", "amount",
+                 "change", "change_pct", "timestamp"]
+
+_QUOTE_LINE = re.compile(r'v_((?:sh|sz|hk)\d+)="([^"]*)"')
+
+
+def _to_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+@timed("parse.quotes")
+def parse_tencent_quotes(payload: str) -> pd.DataFrame:
+    """一次扫描解析多行行情返回内容，得到以股票代码为索引的报价表。
+
+    无效代码（如 ``v_pv_none_match``）与空行情会被跳过；缺失的数值字段记为 NaN。
+    """
+    codes: List[str] = []
+    columns: Dict[str, list] = {name: [] for name in QUOTE_COLUMNS}
+    for match in _QUOTE_LINE.finditer(payload):
+        symbol, raw = match.groups()
+        fields = raw.split("~")
+        if len(fields) <= 3:
+            continue
+        width = len(fields)
+        codes.append(symbol[2:])
+        columns["symbol"].append(symbol)
+        for pos, name in QUOTE_TEXT_FIELDS.items():
+            columns[name].append(fields[pos] if pos < width else "")
+        for pos, name in QUOTE_FLOAT_FIELDS.items():
+            columns[name].append(_to_float(fields[pos]) if pos < width else np.nan)
+
+    frame = pd.DataFrame(columns, index=pd.Index(codes, name="code"))
+    for name in QUOTE_FLOAT_FIELDS.values():
+        frame[name] = frame[name].astype(np.float64)
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"], format="mixed", errors="coerce")
+    return frame
+
+
+def chunked(items: Sequence[str], size: int) -> Iterable[Sequence[str]]:
+    """按固定大小切分序列。"""
+    if size < 1:
+        raise ValueError("chunk_size 必须为正整数")
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def quote_url(codes: Sequence[str], url_template: str = TENCENT_QUOTE_URL) -> str:
+    """拼接多代码行情请求地址。"""
+    universe = registry()
+    ids = universe.intern(codes)
+    return url_template.format(symbol=",".join(universe.symbols[ids]))
+
+
+@timed("http.quotes")
+def fetch_quotes(
+    codes: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    timeout: float = 5.0,
+    session: Optional[requests.Session] = None,
+    url_template: str = TENCENT_QUOTE_URL,
+    policy: Optional[FetchPolicy] = None,
+) -> pd.DataFrame:
+    """批量获取实时行情，返回以股票代码为索引的 DataFrame。
+
+    代码按 `chunk_size` 分组，每组一次请求，并复用同一个 HTTP 连接；
+    每组请求按 `policy` 重试与熔断，接口未返回的代码不会出现在结果中。
+    """
+    import requests
+
+    unique_codes = list(dict.fromkeys(code.strip() for code in codes))
+    own_session = session is None
+    session = session or requests.Session()
+    frames = []
+    try:
+        for group in chunked(unique_codes, chunk_size):
+            response = http_get(
+                quote_url(group, url_template), headers=DEFAULT_HEADERS, timeout=timeout, session=session, policy=policy
+            )
+            response.encoding = response.encoding or "gbk"
+            frames.append(parse_tencent_quotes(response.text))
+    finally:
+        if own_session:
+            session.close()
+    if not frames:
+        return parse_tencent_quotes("")
+    quotes = pd.concat(frames)
+    return quotes[~quotes.index.duplicated(keep="last")]
@@ -0,0 +1,281 @@
+"""基于 asyncio 的行情与估值扫描引擎。
+
+所有请求共享一个带连接池的 `aiohttp.ClientSession`，以固定数量的工作协程限制同时处理的股票数量，
+并按主机做请求速率限制，暂时性失败按 `FetchPolicy` 退避重试，主机持续故障时熔断快速失败。
+实时价格先按批次一次性取回，随后逐只抓取估值分析；
+每只股票处理完成后立即产出结果，调用方可以边扫描边消费。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+import pandas as pd
+
+from ..utils.cache import DiskCache
+from ..utils.http import FetchPolicy, HTTPStatusError, retry_after
+from ..utils.instrumentation import timed
+from .A_stock import (
+    ANALYSIS_CACHE_SOURCE,
+    DEFAULT_HEADERS,
+    QUOTE_CACHE_SOURCE,
+    STOCKSTAR_ANALYSIS_URL,
+    TENCENT_QUOTE_URL,
+    parse_stock_analysis,
+)
+from .quotes import DEFAULT_CHUNK_SIZE, chunked, parse_tencent_quotes, quote_url
+
+if TYPE_CHECKING:
+    from .checkpoint import ScanCheckpoint
+
+
+@dataclass
+class ScanResult:
+    """单只股票的扫描结果。"""
+
+    code: str
+    price: Optional[float] = None
+    analysis: Optional[Dict[str, Optional[str]]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class HostRateLimiter:
+    """按主机限制请求速率，同一主机的相邻请求至少间隔 1/rate 秒。"""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self._intervals = {host: 1.0 / rate for host, rate in (rates or {}).items() if rate > 0}
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, host: str) -> None:
+        interval = self._intervals.get(host)
+        if interval is None:
+            return
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncScanner:
+    """异步扫描器，抓取实时价格与证券之星估值分析。"""
+
+    def __init__(
+        self,
+        concurrency: int = 20,
+        timeout: float = 10.0,
+        host_rate_limits: Optional[Dict[str, float]] = None,
+        quote_url: str = TENCENT_QUOTE_URL,
+        analysis_url: str = STOCKSTAR_ANALYSIS_URL,
+        headers: Optional[Dict[str, str]] = None,
+        quote_chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cache: Optional[DiskCache] = None,
+        policy: Optional[FetchPolicy] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency 必须为正整数")
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._host_rate_limits = dict(host_rate_limits or {})
+        self._quote_url = quote_url
+        self._analysis_url = analysis_url
+        self._headers = dict(headers or DEFAULT_HEADERS)
+        self._quote_chunk_size = quote_chunk_size
+        self._cache = cache
+        self._policy = policy or FetchPolicy()
+
+    @classmethod
+    def from_settings(cls, settings, **kwargs) -> "AsyncScanner":
+        """根据 `Settings.scan` 构造扫描器，启用缓存时使用 `Settings.cache` 配置的磁盘缓存，
+        重试与熔断参数取自 `Settings.http`。"""
+        options = {
+            "concurrency": settings.scan.concurrency,
+            "timeout": settings.scan.timeout,
+            "host_rate_limits": settings.scan.host_rate_limits,
+            "cache": DiskCache.from_settings(settings) if settings.cache.enabled else None,
+            "policy": FetchPolicy.from_settings(settings),
+        }
+        options.update(kwargs)
+        return cls(**options)
+
+    @property
+    def policy(self) -> FetchPolicy:
+        """重试与熔断策略，扫描结束后可从中读取各主机的失败计数。"""
+        return self._policy
+
+    @asynccontextmanager
+    async def connect(self) -> AsyncIterator[Tuple[aiohttp.ClientSession, HostRateLimiter]]:
+        """打开共享连接池的会话与主机限速器，供 `fetch_*` 系列方法在多次调用间复用。"""
+        limiter = HostRateLimiter(self._host_rate_limits)
+        connector = aiohttp.TCPConnector(limit=self._concurrency)
+        timeout = aiohttp.ClientTimeout(total=self._timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self._headers) as session:
+            yield session, limiter
+
+    async def _get_text(
+        self,
+        session: aiohttp.ClientSession,
+        limiter: HostRateLimiter,
+        url: str,
+        default_encoding: str,
+    ) -> str:
+        host = urlsplit(url).hostname or ""
+
+        async def fetch() -> str:
+            # 每次重试同样受主机限速约束
+            await limiter.acquire(host)
+            async with session.get(url) as response:
+                if response.status != 200:
+                    raise HTTPStatusError(response.status, url, retry_after(response.headers))
+                body = await response.read()
+                return body.decode(response.charset or default_encoding, errors="replace")
+
+        return await self._policy.acall(url, fetch)
+
+    @timed("scan.prices")
+    async def fetch_prices(
+        self, session: aiohttp.ClientSession, limiter: HostRateLimiter, codes: Sequence[str]
+    ) -> Dict[str, float]:
+        """分批并发获取实时价格，返回 代码 -> 价格；请求失败或无报价的代码不在结果中。
+
+        配置了缓存时先读取缓存，只对未命中的代码发起请求。
+        """
+        prices: Dict[str, float] = {}
+        if self._cache is not None:
+            for code in codes:
+                cached = self._cache.get(QUOTE_CACHE_SOURCE, code)
+                if cached is not None:
+                    prices[code] = cached
+            codes = [code for code in codes if code not in prices]
+
+        async def fetch_chunk(group: Sequence[str]) -> Dict[str, float]:
+            text = await self._get_text(session, limiter, quote_url(group, self._quote_url), "gbk")
+            prices = parse_tencent_quotes(text)["price"].dropna()
+            return {code: float(price) for code, price in prices.items()}
+
+        groups = list(chunked(list(codes), self._quote_chunk_size))
+        for chunk_prices in await asyncio.gather(*(fetch_chunk(g) for g in groups), return_exceptions=True):
+            if not isinstance(chunk_prices, dict):
+                continue
+            prices.update(chunk_prices)
+            if self._cache is not None:
+                for code, price in chunk_prices.items():
+                    self._cache.set(QUOTE_CACHE_SOURCE, code, price)
+        return prices
+
+    @timed("scan.quotes")
+    async def fetch_quote_frame(
+        self, session: aiohttp.ClientSession, limiter: HostRateLimiter, codes: Sequence[str]
+    ) -> pd.DataFrame:
+        """分批并发获取完整报价表（见 `parse_tencent_quotes`），不读写缓存；失败的批次不在结果中。"""
+        groups = list(chunked(list(codes), self._quote_chunk_size))
+        texts = await asyncio.gather(
+            *(self._get_text(session, limiter, quote_url(g, self._quote_url), "gbk") for g in groups),
+            return_exceptions=True,
+        )
+        return parse_tencent_quotes("\n".join(text for text in texts if isinstance(text, str)))
+
+    @timed("scan.analysis")
+    async def fetch_analysis(
+        self, session: aiohttp.ClientSession, limiter: HostRateLimiter, code: str
+    ) -> Dict[str, Optional[str]]:
+        if self._cache is not None:
+            cached = self._cache.get(ANALYSIS_CACHE_SOURCE, code)
+            if cached is not None:
+                return cached
+        url = self._analysis_url.format(code=code)
+        analysis = parse_stock_analysis(await self._get_text(session, limiter, url, "utf-8"))
+        if self._cache is not None:
+            self._cache.set(ANALYSIS_CACHE_SOURCE, code, analysis)
+        return analysis
+
+    async def _process(
+        self,
+        session: aiohttp.ClientSession,
+        limiter: HostRateLimiter,
+        code: str,
+        price: Optional[float],
+    ) -> ScanResult:
+        if price is None:
+            return ScanResult(code=code, error="ValueError: 未获取到实时价格")
+        try:
+            analysis = await self.fetch_analysis(session, limiter, code)
+        except Exception as exc:  # 单只股票失败不影响整体扫描
+            return ScanResult(code=code, price=price, error=f"{type(exc).__name__}: {exc}")
+        return ScanResult(code=code, price=price, analysis=analysis)
+
+    async def scan(
+        self, codes: Iterable[str], checkpoint: Optional["ScanCheckpoint"] = None
+    ) -> AsyncIterator[ScanResult]:
+        """并发扫描全部代码，按完成顺序逐个产出结果。
+
+        传入断点时跳过断点中已完成的代码，每个成功结果在产出前先追加到断点文件。
+        """
+        codes = [code.strip() for code in codes]
+        if checkpoint is not None:
+            codes = [code for code in codes if code not in checkpoint]
+        total = len(codes)
+        if total == 0:
+            return
+        pending: asyncio.Queue = asyncio.Queue()
+        valid_codes = []
+        for code in codes:
+            pending.put_nowait(code)
+            if code.isdigit() and len(code) in (5, 6):
+                valid_codes.append(code)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async with self.connect() as (session, limiter):
+            prices = await self.fetch_prices(session, limiter, list(dict.fromkeys(valid_codes)))
+
+            async def worker() -> None:
+                while True:
+                    try:
+                        code = pending.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    await results.put(await self._process(session, limiter, code, prices.get(code)))
+
+            workers = [asyncio.create_task(worker()) for _ in range(min(self._concurrency, total))]
+            try:
+                for _ in range(total):
+                    result = await results.get()
+                    if checkpoint is not None:
+                        checkpoint.append(result)
+                    yield result
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+    def run(self, codes: Iterable[str], checkpoint: Optional["ScanCheckpoint"] = None) -> List[ScanResult]:
+        """同步入口：扫描全部代码并返回本次扫描的结果列表。"""
+
+        async def collect() -> List[ScanResult]:
+            return [result async for result in self.scan(codes, checkpoint)]
+
+        return asyncio.run(collect())
+
+    def close(self) -> None:
+        """关闭扫描器持有的磁盘缓存连接。"""
+        if self._cache is not None:
+            self._cache.close()
+
+    def __enter__(self) -> "AsyncScanner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
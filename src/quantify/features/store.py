@@ -0,0 +1,246 @@
+"""指标特征仓库，在多个策略与参数扫描之间共享指标计算结果。
+
+条目以 (标的, 指标, 参数, 数据版本) 为键，数据版本由行数、首末K线时间与输入列内容摘要组成：
+
+* 同一份数据重复请求直接命中内存；复权方式不同或历史被改写的数据摘要不同，不会命中旧条目；
+* 数据只是在末尾追加了新K线、原有部分未变时，从保存的指标状态继续计算新增部分，旧版本条目随即失效；
+* 多只标的同时缺失时，右对齐放进一个二维面板一次性向量化计算。
+
+内存按字节预算做 LRU 淘汰，配置了落盘目录时被淘汰的条目写入 ``Settings.cache_dir/features``，
+之后命中时再读回内存。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.instrumentation import timed
+from .indicators import INDICATORS, State
+
+Params = Tuple[Tuple[str, Any], ...]
+Version = Tuple[int, int, int, str]
+
+
+def _digest(frame: pd.DataFrame, columns: Tuple[str, ...]) -> str:
+    """K线时间与输入列取值的内容摘要。"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(frame.index.asi8))
+    for column in columns:
+        digest.update(np.ascontiguousarray(frame[column].to_numpy(dtype=np.float64)))
+    return digest.hexdigest()
+
+
+def data_version(frame: pd.DataFrame, columns: Tuple[str, ...] = ("close",)) -> Version:
+    """数据版本：(行数, 首根K线时间, 末根K线时间, 输入列摘要)，时间以纳秒表示。"""
+    if len(frame) == 0:
+        return (0, 0, 0, "")
+    return (len(frame), int(frame.index[0].value), int(frame.index[-1].value), _digest(frame, columns))
+
+
+@dataclass(frozen=True)
+class FeatureKey:
+    """特征条目键。"""
+
+    symbol: str
+    indicator: str
+    params: Params
+    version: Version
+
+    @property
+    def series(self) -> Tuple[str, str, Params]:
+        """去掉数据版本后的键，同一序列的新旧版本共享。"""
+        return (self.symbol, self.indicator, self.params)
+
+    def filename(self) -> str:
+        return hashlib.sha1(repr(self).encode("utf-8")).hexdigest() + ".npz"
+
+
+@dataclass
+class _Entry:
+    values: np.ndarray
+    state: State = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + sum(a.nbytes for a in self.state.values())
+
+
+def _normalize(params: Mapping[str, Any]) -> Params:
+    return tuple(sorted(params.items()))
+
+
+def _column_state(state: State, column: int) -> State:
+    """从面板状态中取出单列，保持末维为 1 以便继续步进。"""
+    return {name: array[..., column:column + 1].copy() for name, array in state.items()}
+
+
+class FeatureStore:
+    """带字节预算 LRU 与磁盘溢出的指标缓存。"""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, spill_dir: Optional[Path] = None):
+        self._max_bytes = max_bytes
+        self._spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self._entries: "OrderedDict[FeatureKey, _Entry]" = OrderedDict()
+        self._latest: Dict[Tuple[str, str, Params], FeatureKey] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "FeatureStore":
+        """根据 `Settings.features` 构造，落盘目录位于 `Settings.cache_dir` 下。"""
+        config = settings.features
+        spill_dir = Path(settings.cache_dir) / config.dirname if config.spill else None
+        return cls(max_bytes=int(config.max_memory_mb * 1024 * 1024), spill_dir=spill_dir)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, symbol: str, data: pd.DataFrame, indicator: str, **params: Any) -> np.ndarray:
+        """获取单只标的的指标序列。"""
+        return self.compute({symbol: data}, indicator, **params)[symbol]
+
+    @timed("features.compute")
+    def compute(self, data: Mapping[str, pd.DataFrame], indicator: str, **params: Any) -> Dict[str, np.ndarray]:
+        """
+        获取一组标的的指标序列，未命中的标的合并成一个面板批量计算
+
+        Args:
+            data: 标的代码 -> 按时间升序的K线数据
+            indicator: 指标名称，见 `INDICATORS`
+            **params: 指标参数，如 ``period=14``
+
+        Returns:
+            Dict[str, np.ndarray]: 标的代码 -> 与输入等长的指标数组（只读）
+        """
+        spec = INDICATORS[indicator]
+        normalized = _normalize(params)
+        results: Dict[str, np.ndarray] = {}
+        missing: List[Tuple[str, FeatureKey]] = []
+        with self._lock:
+            for symbol, frame in data.items():
+                key = FeatureKey(symbol, indicator, normalized, data_version(frame, spec.inputs))
+                entry = self._lookup(key)
+                if entry is None:
+                    entry = self._extend(key, frame, params)
+                if entry is None:
+                    missing.append((symbol, key))
+                    self.misses += 1
+                else:
+                    results[symbol] = entry.values
+
+        if missing:
+            lengths = [key.version[0] for _, key in missing]
+            height = max(lengths)
+            panels = []
+            for column in spec.inputs:
+                panel = np.full((height, len(missing)), np.nan)
+                for j, (symbol, _) in enumerate(missing):
+                    if lengths[j]:
+                        panel[height - lengths[j]:, j] = data[symbol][column].to_numpy(dtype=np.float64)
+                panels.append(panel)
+            values, state = spec.compute(*panels, **params)
+            with self._lock:
+                for j, (symbol, key) in enumerate(missing):
+                    entry = _Entry(values[height - lengths[j]:, j].copy(), _column_state(state, j))
+                    self._put(key, entry)
+                    results[symbol] = entry.values
+        return {symbol: results[symbol] for symbol in data}
+
+    def _lookup(self, key: FeatureKey) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        entry = self._load(key)
+        if entry is not None:
+            self._put(key, entry)
+            self.hits += 1
+        return entry
+
+    def _extend(self, key: FeatureKey, frame: pd.DataFrame, params: Mapping[str, Any]) -> Optional[_Entry]:
+        """数据在末尾追加了K线、且原有K线未被改写时，从上一版本的状态继续计算。"""
+        previous = self._latest.get(key.series)
+        if previous is None:
+            return None
+        rows, first, last, digest = previous.version
+        if not (0 < rows < key.version[0] and first == key.version[1]
+                and int(frame.index[rows - 1].value) == last):
+            return None
+        spec = INDICATORS[key.indicator]
+        if _digest(frame.iloc[:rows], spec.inputs) != digest:
+            return None
+        base = self._entries.get(previous) or self._load(previous)
+        if base is None:
+            return None
+        tail = frame.iloc[rows:]
+        values, state = spec.extend(base.state, *(tail[c].to_numpy(dtype=np.float64) for c in spec.inputs), **params)
+        entry = _Entry(np.concatenate([base.values, values[:, 0]]), state)
+        self._discard(previous)
+        self._put(key, entry)
+        self.extensions += 1
+        return entry
+
+    def _put(self, key: FeatureKey, entry: _Entry) -> None:
+        entry.values.setflags(write=False)
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key).nbytes
+        self._entries[key] = entry
+        self._bytes += entry.nbytes
+        # 同一序列只保留最新版本
+        stale = self._latest.get(key.series)
+        self._latest[key.series] = key
+        if stale is not None and stale != key:
+            self._discard(stale)
+        while self._bytes > self._max_bytes and len(self._entries) > 1:
+            old_key, old_entry = self._entries.popitem(last=False)
+            self._bytes -= old_entry.nbytes
+            self._spill(old_key, old_entry)
+
+    def _discard(self, key: FeatureKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+        if self._spill_dir is not None:
+            (self._spill_dir / key.filename()).unlink(missing_ok=True)
+
+    def _spill(self, key: FeatureKey, entry: _Entry) -> None:
+        if self._spill_dir is None:
+            return
+        self._spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self._spill_dir / key.filename()
+        tmp = path.with_suffix(".tmp.npz")
+        np.savez(tmp, values=entry.values, **{f"state_{k}": v for k, v in entry.state.items()})
+        tmp.replace(path)
+
+    def _load(self, key: FeatureKey) -> Optional[_Entry]:
+        if self._spill_dir is None:
+            return None
+        path = self._spill_dir / key.filename()
+        if not path.exists():
+            return None
+        with np.load(path) as archive:
+            state = {name[len("state_"):]: archive[name] for name in archive.files if name.startswith("state_")}
+            return _Entry(archive["values"], state)
+
+    def clear(self) -> None:
+        """清空内存中的条目，磁盘上的溢出文件保持不变。"""
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self._bytes = 0
@@ -1,4 +1,16 @@
 """策略模块，包含所有可用交易策略。"""
 
-from .base import BaseStrategy, Signal, StrategyContext
-__all__ = ["BaseStrategy", "Signal", "StrategyContext"]
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "BaseStrategy": "base",
+        "CrossSectionalStrategy": "cross_section",
+        "FactorStrategy": "cross_section",
+        "Signal": "base",
+        "SignalFrame": "signals",
+        "StrategyContext": "base",
+    },
+    submodules=["analysis", "base", "cross_section", "screener", "signals"],
+)
@@ -1,6 +1,6 @@
 from typing import Dict, Any, Optional
+from quantify.data.universe import registry
 from quantify.features.A_stock import print_info_from_url
-import pandas as pd
 def check_and_print_if_undervalued(code: str, current_price: float, analysis_data: Dict[str, Optional[str]]):
     """
     检查分析结果，如果是'股价被低估'，则打印详细信息。
@@ -38,10 +38,9 @@ def get_filtered_stock_list(file_path: str = 'a_stock_list.csv') -> list:
     读取a_stock_list.csv文件，过滤所有st，st*的股票，返回股票代码列表
     """
     try:
-        df = pd.read_csv(file_path, dtype=str)
-        # 过滤掉名字中包含 'ST' 的股票
-        filtered_df = df[~df['股票名称'].str.contains('ST', case=False, na=False)]
-        return filtered_df['股票代码'].tolist()
+        universe = registry()
+        # 过滤掉名字中包含 'ST' 的股票，ST 标记在登记时已计算
+        return universe.code_list(universe.select(universe.load_csv(file_path), exclude_st=True))
     except FileNotFoundError:
         print(f"文件 {file_path} 未找到")
         return []
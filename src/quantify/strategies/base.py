@@ -11,6 +11,7 @@ class Signal:
     price: Optional[float] = None
     volume: Optional[float] = None
     reason: str = ""
+    timestamp: Optional[pd.Timestamp] = None  # 信号所在K线时间，组合回测据此对齐
 
 class StrategyContext(ABC):
     """策略运行上下文接口。"""
@@ -35,7 +36,7 @@ class BaseStrategy(ABC):
 
     @abstractmethod
     def generate_signals(self, data: pd.DataFrame, context: StrategyContext) -> Iterator[Signal]:
-        """根据数据生成交易信号。"""
+        """根据数据生成交易信号，也可以直接返回列式的 `SignalFrame`。"""
         pass
 
     def on_finish(self, context: StrategyContext) -> None:
@@ -0,0 +1,119 @@
+"""截面策略：每个日期在全部标的之间打分、排名，持有排名靠前的标的。
+
+与逐个标的生成信号的 `BaseStrategy` 不同，截面策略一次性读取 日期 × 标的 的 `Panel`：
+
+1. `score(panel)` 返回同形状的因子得分，越大越好；
+2. 得分按日期转换为百分位排名（当日无收盘价的标的不参与）；
+3. `on_ranks(ranks, panel)` 把排名转换为目标权重，默认等权持有前 `top_n` 名；
+4. 非调仓日沿用上一个调仓日的权重。
+
+`CrossSectionalEngine` 直接使用 `target_weights` 做组合回测；策略同时实现了
+`generate_signals`，先调用 `prepare(panel)` 后也可以交给按标的运行的 `BacktestEngine`，
+每个标的进入持仓的日期产生 BUY、退出持仓的日期产生 SELL。
+"""
+
+from abc import abstractmethod
+from typing import Any, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..data.panel import Panel
+from ..features.factors import FACTORS, composite, rank, top_n
+from .base import BaseStrategy, StrategyContext
+from .signals import SignalFrame
+
+
+class CrossSectionalStrategy(BaseStrategy):
+    """截面策略基类，子类实现 `score`，可覆盖 `on_ranks` 自定义由排名到权重的规则。"""
+
+    def __init__(self, top_n: int = 50, rebalance_every: int = 1):
+        """
+        Args:
+            top_n: 每个调仓日持有的标的数量
+            rebalance_every: 调仓间隔（交易日），1 为每日调仓
+        """
+        if rebalance_every < 1:
+            raise ValueError("rebalance_every 至少为 1")
+        self.top_n = top_n
+        self.rebalance_every = rebalance_every
+        self._weights: Optional[np.ndarray] = None
+        self._dates: Optional[pd.DatetimeIndex] = None
+        self._symbols: Optional[pd.Index] = None
+
+    @abstractmethod
+    def score(self, panel: Panel) -> np.ndarray:
+        """返回 日期 × 标的 的得分，越大越优先持有，无法打分处为 NaN。"""
+
+    def ranks(self, panel: Panel) -> np.ndarray:
+        """当日有收盘价的标的按得分计算的百分位排名，得分最高者为 1。"""
+        scores = self.score(panel)
+        if "close" in panel:
+            scores = np.where(np.isnan(panel["close"]), np.nan, scores)
+        return rank(scores, pct=True)
+
+    def on_ranks(self, ranks: np.ndarray, panel: Panel) -> np.ndarray:
+        """由排名得到目标权重，默认等权持有每日排名前 `top_n` 的标的。"""
+        held = top_n(ranks, self.top_n)
+        count = held.sum(axis=1, keepdims=True)
+        return held / np.maximum(count, 1).astype(np.float32)
+
+    def target_weights(self, panel: Panel) -> np.ndarray:
+        """日期 × 标的 的目标权重，每行之和不超过 1；非调仓日沿用最近一个调仓日的权重。"""
+        weights = np.asarray(self.on_ranks(self.ranks(panel), panel), dtype=np.float32)
+        if self.rebalance_every > 1:
+            rows = np.arange(len(weights)) // self.rebalance_every * self.rebalance_every
+            weights = weights[rows]
+        return weights
+
+    def prepare(self, panel: Panel) -> np.ndarray:
+        """计算并保存目标权重，之后 `generate_signals` 按标的输出进出信号。"""
+        self._weights = self.target_weights(panel)
+        self._dates = panel.dates
+        self._symbols = panel.symbols
+        return self._weights
+
+    def generate_signals(self, data: pd.DataFrame, context: StrategyContext) -> SignalFrame:
+        """把 `prepare` 得到的持仓转换为该标的的 BUY / SELL 信号，标的不在面板中时没有信号。"""
+        if self._weights is None:
+            raise RuntimeError("截面策略需先调用 prepare(panel) 计算目标权重")
+        symbol = str(data.attrs.get("symbol", ""))
+        column = self._symbols.get_indexer([symbol])[0]
+        if column < 0 or data.empty:
+            return SignalFrame.empty()
+        rows = self._dates.get_indexer(data.index)
+        held = np.where(rows >= 0, self._weights[np.maximum(rows, 0), column] > 0, False)
+        change = np.diff(held.astype(np.int8), prepend=np.int8(0))
+        price = data["close"] if "close" in data.columns else None
+        return SignalFrame.from_series(symbol, pd.Series(change, index=data.index), price)
+
+
+class FactorStrategy(CrossSectionalStrategy):
+    """多因子截面策略：各因子截面 z-score 的加权和作为得分。
+
+    例如 ``FactorStrategy({"momentum": 1.0, "volatility": -0.5})`` 偏好动量强、波动低的标的；
+    因子名称见 `quantify.features.factors.FACTORS`。
+    """
+
+    def __init__(
+        self,
+        weights: Mapping[str, float],
+        params: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        top_n: int = 50,
+        rebalance_every: int = 1,
+    ):
+        """
+        Args:
+            weights: 因子名称 -> 权重，负权重表示因子值越小越好
+            params: 因子名称 -> 因子参数，例如 ``{"momentum": {"lookback": 126}}``
+        """
+        super().__init__(top_n=top_n, rebalance_every=rebalance_every)
+        unknown = set(weights) - set(FACTORS)
+        if unknown:
+            raise KeyError(f"未知的因子: {sorted(unknown)}，可用因子: {sorted(FACTORS)}")
+        self.weights = dict(weights)
+        self.params = {name: dict(values) for name, values in (params or {}).items()}
+
+    def score(self, panel: Panel) -> np.ndarray:
+        factors = {name: FACTORS[name](panel, **self.params.get(name, {})) for name in self.weights}
+        return composite(factors, self.weights)
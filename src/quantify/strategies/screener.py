@@ -0,0 +1,107 @@
+"""全市场估值区间批量筛选。
+
+把行情价格与估值页面的原始字段整理成一张表后，估值范围用一次向量化的正则提取解析为
+上下限两个 float 数组，"被低估"、"处于前半区间"与相对中点的折价都是整列的数组运算，
+最后按 低估 → 前半区间 → 折价 排序输出。几千只股票的快照在内存中筛选只需毫秒级。
+"""
+
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..features.A_stock import RANGE_PATTERN
+from ..utils.instrumentation import timed
+
+UNDERVALUED_KEYWORD = "被低估"
+
+# 估值页面解析出的字段，见 `parse_stock_analysis`
+ANALYSIS_FIELDS = ["stock_text", "analysis", "relative_range", "absolute_range", "accuracy"]
+
+# 导出报告的列名，与逐只筛选时保存的 CSV 一致
+REPORT_COLUMNS = {
+    "code": "股票代码",
+    "price": "当前股价",
+    "stock_text": "股票名称",
+    "analysis": "分析结果",
+    "relative_range": "相对估值范围",
+    "absolute_range": "绝对估值范围",
+    "accuracy": "估值准确性",
+    "discount": "距中点折价",
+}
+
+
+def parse_ranges(texts: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """解析估值范围文本，返回 (下限, 上限)；无法解析的行为 NaN，上下限颠倒时自动交换。"""
+    bounds = texts.astype("string").str.extract(RANGE_PATTERN).astype(np.float64).to_numpy()
+    first, second = bounds[:, 0], bounds[:, 1]
+    return np.fmin(first, second), np.fmax(first, second)
+
+
+def valuation_position(
+    price: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    价格相对估值区间的位置，返回 (中点, 是否处于前半区间, 相对中点的折价, 区间内相对位置)。
+
+    上下限相等时价格不高于下限即视为处于前半区间；区间无法解析（NaN）时不处于前半区间。
+    """
+    midpoint = (lower + upper) / 2
+    width = upper - lower
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discount = (midpoint - price) / midpoint
+        position = np.where(width > 0, (price - lower) / width, np.nan)
+    front_half = np.where(width > 0, (price >= lower) & (price <= midpoint), price <= lower)
+    return midpoint, front_half, discount, position
+
+
+def scan_frame(results: Iterable) -> pd.DataFrame:
+    """将扫描结果（`ScanResult` 或同名属性的对象）整理为以代码为索引的表，失败的结果被忽略。"""
+    rows = [{"code": r.code, "price": r.price, **(r.analysis or {})} for r in results if r.error is None]
+    frame = pd.DataFrame(rows, columns=["code", "price", *ANALYSIS_FIELDS])
+    return frame.set_index("code")
+
+
+@timed("screen.valuation")
+def screen(
+    frame: pd.DataFrame,
+    price_column: str = "price",
+    range_column: str = "relative_range",
+    analysis_column: str = "analysis",
+    keyword: str = UNDERVALUED_KEYWORD,
+) -> pd.DataFrame:
+    """
+    批量计算估值筛选指标，返回按吸引力排序的新表（保留原有列）。
+
+    新增列：
+        lower / upper / midpoint: 估值范围的下限、上限与中点
+        undervalued: 分析结果包含 `keyword`
+        front_half: 价格处于 [下限, 中点]；上下限相等时价格不高于下限即可
+        discount: 相对中点的折价比例，正数表示低于中点
+        position: 价格在区间内的相对位置，0 为下限、1 为上限
+    """
+    price = pd.to_numeric(frame[price_column], errors="coerce").to_numpy(dtype=np.float64)
+    lower, upper = parse_ranges(frame[range_column])
+    midpoint, front_half, discount, position = valuation_position(price, lower, upper)
+
+    result = frame.assign(
+        lower=lower,
+        upper=upper,
+        midpoint=midpoint,
+        undervalued=frame[analysis_column].astype("string").str.contains(keyword, regex=False).fillna(False)
+        .to_numpy(dtype=bool),
+        front_half=front_half,
+        discount=discount,
+        position=position,
+    )
+    return result.sort_values(["undervalued", "front_half", "discount"], ascending=False, na_position="last",
+                              kind="stable")
+
+
+def undervalued_report(screened: pd.DataFrame, limit: Optional[int] = None) -> pd.DataFrame:
+    """筛选结果中被低估的股票，按报告列名输出。"""
+    hits = screened[screened["undervalued"]].rename_axis("code").reset_index()
+    if limit is not None:
+        hits = hits.head(limit)
+    columns = [column for column in REPORT_COLUMNS if column in hits.columns]
+    return hits[columns].rename(columns=REPORT_COLUMNS)
@@ -0,0 +1,198 @@
+"""列式信号容器：以并列的 NumPy 数组保存全部信号，替代逐条的 `Signal` 对象。
+
+每条信号占用 8（时间）+ 4（标的编号）+ 1（动作）+ 8（价格）+ 8（数量）字节，
+标的代码只在 `symbols` 表中保存一次。切片返回共享底层数组的视图；
+多个标的的信号拼接时只重映射标的编号；需要时再按条转换为 `Signal` 或 DataFrame。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .base import Signal
+
+BUY = 1
+SELL = -1
+ACTION_NAMES = {BUY: "BUY", SELL: "SELL"}
+ACTION_CODES = {"BUY": BUY, "SELL": SELL}
+
+# NaT 的纳秒表示，未携带时间的信号使用该值
+NAT = np.iinfo(np.int64).min
+
+
+class SignalFrame:
+    """列式信号容器，行为类似只读的 `Signal` 序列。"""
+
+    __slots__ = ("timestamp", "symbol_id", "action", "price", "volume", "reason", "symbols")
+
+    def __init__(
+        self,
+        timestamp: np.ndarray,
+        symbol_id: np.ndarray,
+        action: np.ndarray,
+        price: Optional[np.ndarray] = None,
+        volume: Optional[np.ndarray] = None,
+        symbols: Sequence[str] = (),
+        reason: Optional[np.ndarray] = None,
+    ):
+        """
+        Args:
+            timestamp: int64 纳秒时间戳，未知时为 `NAT`
+            symbol_id: int32 标的编号，对应 `symbols` 中的位置
+            action: int8 动作，1 买入、-1 卖出
+            price: float64 价格，缺失为 NaN
+            volume: float64 数量，缺失为 NaN
+            symbols: 标的代码表
+            reason: 可选的信号原因（object 数组），不使用时为 None 以节省内存
+        """
+        n = len(action)
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.symbol_id = np.asarray(symbol_id, dtype=np.int32)
+        self.action = np.asarray(action, dtype=np.int8)
+        self.price = np.full(n, np.nan) if price is None else np.asarray(price, dtype=np.float64)
+        self.volume = np.full(n, np.nan) if volume is None else np.asarray(volume, dtype=np.float64)
+        self.reason = reason
+        self.symbols: Tuple[str, ...] = tuple(symbols)
+
+    @classmethod
+    def empty(cls) -> "SignalFrame":
+        return cls(np.empty(0, np.int64), np.empty(0, np.int32), np.empty(0, np.int8))
+
+    @classmethod
+    def from_signals(cls, signals: Iterable[Signal]) -> "SignalFrame":
+        """由 `Signal` 对象构造，动作不是 BUY/SELL 的信号被忽略。"""
+        signals = [s for s in signals if s.action.upper() in ACTION_CODES]
+        ids: Dict[str, int] = {}
+        symbol_id = np.fromiter((ids.setdefault(s.symbol, len(ids)) for s in signals), np.int32, len(signals))
+        timestamp = np.fromiter(
+            (pd.Timestamp(s.timestamp).value if s.timestamp is not None else NAT for s in signals),
+            np.int64, len(signals),
+        )
+        action = np.fromiter((ACTION_CODES[s.action.upper()] for s in signals), np.int8, len(signals))
+        price = np.fromiter((np.nan if s.price is None else s.price for s in signals), np.float64, len(signals))
+        volume = np.fromiter((np.nan if s.volume is None else s.volume for s in signals), np.float64, len(signals))
+        reason = None
+        if any(s.reason for s in signals):
+            reason = np.array([s.reason for s in signals], dtype=object)
+        return cls(timestamp, symbol_id, action, price, volume, list(ids), reason)
+
+    @classmethod
+    def from_series(cls, symbol: str, actions: pd.Series, price: Optional[pd.Series] = None) -> "SignalFrame":
+        """由 1/-1/0 动作序列构造单个标的的信号，`price` 与 `actions` 同索引时记录对应价格。"""
+        values = np.asarray(actions, dtype=np.int64)
+        rows = np.flatnonzero(values)
+        index = pd.DatetimeIndex(actions.index)
+        return cls(
+            index.asi8[rows],
+            np.zeros(len(rows), dtype=np.int32),
+            np.sign(values[rows]),
+            None if price is None else np.asarray(price, dtype=np.float64)[rows],
+            symbols=[symbol],
+        )
+
+    def to_actions(self, index: pd.DatetimeIndex) -> pd.Series:
+        """`from_series` 的逆变换：按 `index` 展开为 1/-1/0 动作序列，不在 `index` 中的信号被忽略。"""
+        values = np.zeros(len(index), dtype=np.int64)
+        rows = pd.DatetimeIndex(index).get_indexer(pd.DatetimeIndex(self.timestamp.view("datetime64[ns]")))
+        found = rows >= 0
+        values[rows[found]] = self.action[found]
+        return pd.Series(values, index=index)
+
+    @classmethod
+    def concat(cls, frames: Sequence["SignalFrame"]) -> "SignalFrame":
+        """拼接多个容器，合并标的代码表并重映射编号。"""
+        frames = [f for f in frames if f is not None]
+        if not frames:
+            return cls.empty()
+        if len(frames) == 1:
+            return frames[0]
+        table: Dict[str, int] = {}
+        ids = []
+        for frame in frames:
+            mapping = np.fromiter((table.setdefault(s, len(table)) for s in frame.symbols), np.int32,
+                                  len(frame.symbols))
+            ids.append(mapping[frame.symbol_id] if len(frame) else frame.symbol_id)
+        reason = None
+        if any(f.reason is not None for f in frames):
+            reason = np.concatenate([
+                f.reason if f.reason is not None else np.full(len(f), "", dtype=object) for f in frames
+            ])
+        return cls(
+            np.concatenate([f.timestamp for f in frames]),
+            np.concatenate(ids),
+            np.concatenate([f.action for f in frames]),
+            np.concatenate([f.price for f in frames]),
+            np.concatenate([f.volume for f in frames]),
+            list(table),
+            reason,
+        )
+
+    def __len__(self) -> int:
+        return len(self.action)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ("timestamp", "symbol_id", "action", "price", "volume"))
+
+    def _signal(self, i: int) -> Signal:
+        ts = self.timestamp[i]
+        return Signal(
+            symbol=self.symbols[self.symbol_id[i]],
+            action=ACTION_NAMES[int(self.action[i])],
+            price=None if np.isnan(self.price[i]) else float(self.price[i]),
+            volume=None if np.isnan(self.volume[i]) else float(self.volume[i]),
+            reason=self.reason[i] if self.reason is not None else "",
+            timestamp=None if ts == NAT else pd.Timestamp(ts),
+        )
+
+    def __getitem__(self, key: Union[int, slice, np.ndarray]) -> Union[Signal, "SignalFrame"]:
+        """整数下标返回单个 `Signal`；切片返回共享数组的视图；布尔掩码或下标数组返回副本。"""
+        if isinstance(key, (int, np.integer)):
+            return self._signal(range(len(self))[key])
+        return SignalFrame(
+            self.timestamp[key], self.symbol_id[key], self.action[key], self.price[key], self.volume[key],
+            self.symbols, self.reason[key] if self.reason is not None else None,
+        )
+
+    def __iter__(self) -> Iterator[Signal]:
+        for i in range(len(self)):
+            yield self._signal(i)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, SignalFrame):
+            return self.to_signals() == other.to_signals()
+        if isinstance(other, list):
+            return self.to_signals() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SignalFrame({len(self)} signals, {len(self.symbols)} symbols)"
+
+    def for_symbol(self, symbol: str) -> "SignalFrame":
+        if symbol not in self.symbols:
+            return self[np.zeros(len(self), dtype=bool)]
+        return self[self.symbol_id == self.symbols.index(symbol)]
+
+    def symbol_codes(self) -> np.ndarray:
+        """每条信号的标的代码（object 数组）。"""
+        return np.asarray(self.symbols, dtype=object)[self.symbol_id] if len(self) else np.empty(0, dtype=object)
+
+    def to_signals(self) -> List[Signal]:
+        return list(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        """转换为 DataFrame，标的与动作列为 Categorical。"""
+        frame = pd.DataFrame({
+            "timestamp": self.timestamp.view("datetime64[ns]"),
+            "symbol": pd.Categorical.from_codes(self.symbol_id, categories=list(self.symbols)) if self.symbols
+            else pd.Categorical([]),
+            "action": pd.Categorical.from_codes((self.action > 0).astype(np.int8), categories=["SELL", "BUY"]),
+            "price": self.price,
+            "volume": self.volume,
+        })
+        if self.reason is not None:
+            frame["reason"] = self.reason
+        return frame
@@ -1,6 +1,9 @@
 """工具模块，提供通用辅助函数。"""
 
-from .logging import get_logger
-
-__all__ = ["get_logger"]
+from .._lazy import attach
 
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {"DiskCache": "cache", "get_logger": "logging", "trading_day": "cache"},
+    submodules=["cache", "http", "instrumentation", "logging"],
+)
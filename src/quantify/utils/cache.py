@@ -0,0 +1,183 @@
+"""持久化 TTL 缓存，用于估值分析、实时行情等网络数据。
+
+缓存以 SQLite 文件保存在 `Settings.cache_dir` 下，键为 (来源, 代码, 交易日)，
+每个来源可单独设置过期时间；条目数超过上限时按最近访问时间淘汰。
+SQLite 以 WAL 模式运行，每个线程使用独立连接，可在多线程与多进程间安全共享。
+用完后调用 `close()`（或以 `with DiskCache(...) as cache:` 使用）关闭所有线程打开的连接。
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 每写入这么多条检查一次容量，避免每次写入都统计全表
+_EVICT_CHECK_INTERVAL = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    source   TEXT NOT NULL,
+    code     TEXT NOT NULL,
+    day      TEXT NOT NULL,
+    value    TEXT NOT NULL,
+    expires  REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (source, code, day)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed);
+"""
+
+
+def trading_day(now: Optional[datetime] = None) -> str:
+    """返回当前对应的交易日字符串，周末回退到上一个周五。"""
+    current: date = (now or datetime.now()).date()
+    if current.weekday() >= 5:
+        current -= timedelta(days=current.weekday() - 4)
+    return current.isoformat()
+
+
+class DiskCache:
+    """基于 SQLite 的持久化 TTL 缓存。"""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: Optional[Dict[str, float]] = None,
+        default_ttl: float = 86400.0,
+        max_entries: int = 200_000,
+        timeout: float = 30.0,
+    ):
+        self._path = Path(path)
+        self._ttl = dict(ttl or {})
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._timeout = timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._conn_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "DiskCache":
+        """根据 `Settings.cache` 构造缓存，文件位于 `Settings.cache_dir` 下。"""
+        config = settings.cache
+        return cls(
+            Path(settings.cache_dir) / config.filename,
+            ttl=config.ttl,
+            default_ttl=config.default_ttl,
+            max_entries=config.max_entries,
+        )
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 连接仍只在创建它的线程中使用；关闭允许 `close()` 在任意线程统一进行
+            conn = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn_lock:
+                self._connections.append(conn)
+                self._local.conn = conn
+        return conn
+
+    def ttl_for(self, source: str) -> float:
+        return self._ttl.get(source, self._default_ttl)
+
+    def get(self, source: str, code: str, day: Optional[str] = None) -> Optional[Any]:
+        """读取未过期的缓存值，不存在或已过期时返回 None。"""
+        day = day or trading_day()
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, expires FROM entries WHERE source = ? AND code = ? AND day = ?",
+            (source, code, day),
+        ).fetchone()
+        if row is None or row[1] <= now:
+            self._count(hit=False)
+            return None
+        conn.execute(
+            "UPDATE entries SET accessed = ? WHERE source = ? AND code = ? AND day = ?",
+            (now, source, code, day),
+        )
+        self._count(hit=True)
+        return json.loads(row[0])
+
+    def set(self, source: str, code: str, value: Any, day: Optional[str] = None) -> None:
+        """写入缓存值，值需可 JSON 序列化。"""
+        day = day or trading_day()
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (source, code, day, value, expires, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+            (source, code, day, json.dumps(value, ensure_ascii=False), now + self.ttl_for(source), now),
+        )
+        with self._stats_lock:
+            self._writes += 1
+            check = self._writes % _EVICT_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+
+    def get_or_fetch(self, source: str, code: str, fetch: Callable[[], T], day: Optional[str] = None) -> T:
+        """命中缓存直接返回，否则调用 `fetch` 获取并写入缓存。"""
+        cached = self.get(source, code, day)
+        if cached is not None:
+            return cached
+        value = fetch()
+        if value is not None:
+            self.set(source, code, value, day)
+        return value
+
+    def evict(self) -> None:
+        """条目数超过上限时，删除过期条目与最久未访问的条目。"""
+        conn = self._connection()
+        count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count <= self._max_entries:
+            return
+        conn.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),))
+        overflow = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self._max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries ORDER BY accessed LIMIT ?)",
+                (overflow,),
+            )
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM entries")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        """关闭所有线程打开的数据库连接；之后再次使用时按需重新连接。"""
+        with self._conn_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+    def __enter__(self) -> "DiskCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
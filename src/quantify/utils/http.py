@@ -0,0 +1,320 @@
+"""统一的 HTTP 抓取策略：指数退避重试、按主机熔断与按失败类型计数。
+
+同步（requests）与异步（aiohttp）抓取共用同一个 `FetchPolicy`（`call` / `acall`）：
+
+* 超时、连接错误与 429/5xx 状态码视为暂时性失败，按带抖动的指数退避重试；
+  429 响应带 ``Retry-After`` 时优先使用其等待时间。
+* 每个主机一个熔断器，连续失败达到阈值后进入打开状态，期间的请求直接抛出
+  `CircuitOpenError` 而不占用连接与线程；冷却时间过后放行一个探测请求，成功则恢复。
+* 每次失败按 (主机, 失败类型) 计数，便于扫描结束后查看失败分布。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, FrozenSet, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from .logging import get_logger
+
+if TYPE_CHECKING:
+    import requests
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 熔断器状态
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class HTTPStatusError(RuntimeError):
+    """服务端返回了非 200 状态码。"""
+
+    def __init__(self, status: int, url: str, retry_after: Optional[float] = None):
+        super().__init__(f"请求失败，状态码 {status}: {url}")
+        self.status = status
+        self.url = url
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RuntimeError):
+    """主机处于熔断状态，请求未发出。"""
+
+
+@dataclass
+class RetryPolicy:
+    """指数退避重试参数，第 n 次重试前等待 ``uniform(0, min(max_delay, base_delay * 2**n))`` 秒。"""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    retry_statuses: FrozenSet[int] = field(default_factory=lambda: frozenset({429, 500, 502, 503, 504}))
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(self.max_delay, max(0.0, retry_after))
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """单个主机的熔断器，线程安全。"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = CLOSED
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """是否放行一个请求；冷却结束后只放行一个探测请求，结果返回前其他请求仍被拒绝。"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+                self._state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self._failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+
+    def release(self) -> None:
+        """探测请求没有得出结论（被取消、中断或与主机无关的错误）时重新进入冷却，不计失败次数。"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = OPEN
+                self._opened_at = self._clock()
+
+
+# requests 与 aiohttp 只在真正发起请求时导入；尚未导入的库不可能抛出其异常，分类时无需加载
+_TIMEOUT_ERRORS = (("requests", "Timeout"), ("aiohttp", "ServerTimeoutError"))
+_CONNECTION_ERRORS = (("requests", "ConnectionError"), ("aiohttp", "ClientConnectionError"))
+
+
+def _loaded(specs: Tuple[Tuple[str, str], ...]) -> Tuple[type, ...]:
+    return tuple(getattr(sys.modules[module], name) for module, name in specs if module in sys.modules)
+
+
+def classify_error(exc: BaseException) -> str:
+    """将异常归类为计数用的失败类型。"""
+    if isinstance(exc, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(exc, HTTPStatusError):
+        if exc.status == 429:
+            return "http_429"
+        return "http_5xx" if exc.status >= 500 else "http_4xx"
+    if isinstance(exc, (asyncio.TimeoutError, *_loaded(_TIMEOUT_ERRORS))):
+        return "timeout"
+    if isinstance(exc, (ConnectionError, *_loaded(_CONNECTION_ERRORS))):
+        return "connection"
+    return "other"
+
+
+class FetchPolicy:
+    """重试、熔断与错误计数的组合，可在多个线程与协程间共享。"""
+
+    def __init__(
+        self,
+        retry: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.retry = retry or RetryPolicy()
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._errors: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "FetchPolicy":
+        """根据 `Settings.http` 构造。"""
+        config = settings.http
+        retry = RetryPolicy(
+            max_attempts=config.max_attempts, base_delay=config.backoff_base, max_delay=config.backoff_max
+        )
+        return cls(retry, failure_threshold=config.failure_threshold, reset_timeout=config.reset_timeout)
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self._failure_threshold, self._reset_timeout, self._clock)
+                self._breakers[host] = breaker
+            return breaker
+
+    @property
+    def errors(self) -> Dict[str, Dict[str, int]]:
+        """主机 -> {失败类型: 次数}。"""
+        with self._lock:
+            snapshot: Dict[str, Dict[str, int]] = {}
+            for (host, kind), count in self._errors.items():
+                snapshot.setdefault(host, {})[kind] = count
+            return snapshot
+
+    def error_totals(self) -> Dict[str, int]:
+        """按失败类型汇总全部主机的次数。"""
+        totals: Counter = Counter()
+        with self._lock:
+            for (_, kind), count in self._errors.items():
+                totals[kind] += count
+        return dict(totals)
+
+    def _count(self, host: str, kind: str) -> None:
+        with self._lock:
+            self._errors[(host, kind)] += 1
+
+    def _before(self, host: str, url: str) -> CircuitBreaker:
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            self._count(host, "circuit_open")
+            raise CircuitOpenError(f"{host} 处于熔断状态，跳过请求: {url}")
+        return breaker
+
+    def _after_failure(self, host: str, breaker: CircuitBreaker, exc: BaseException, attempt: int) -> Optional[float]:
+        """记录一次失败，返回重试前的等待秒数；不应重试时返回 None。"""
+        kind = classify_error(exc)
+        self._count(host, kind)
+        if isinstance(exc, HTTPStatusError):
+            retryable = exc.status in self.retry.retry_statuses
+        else:
+            retryable = kind in ("timeout", "connection")
+        if not retryable:
+            if isinstance(exc, HTTPStatusError) and exc.status < 500:
+                # 4xx 重试也不会成功，但说明主机在正常响应
+                breaker.record_success()
+            elif isinstance(exc, HTTPStatusError):
+                breaker.record_failure()
+            else:
+                # 解析错误等与主机健康无关，熔断状态不变；若为半开探测则重新冷却，避免一直停在半开
+                breaker.release()
+            return None
+        breaker.record_failure()
+        if attempt + 1 >= self.retry.max_attempts:
+            return None
+        return self.retry.delay(attempt, getattr(exc, "retry_after", None))
+
+    def call(self, url: str, fetch: Callable[[], T]) -> T:
+        """在重试与熔断保护下执行同步请求 `fetch`。"""
+        host = urlsplit(url).hostname or ""
+        attempt = 0
+        while True:
+            breaker = self._before(host, url)
+            try:
+                result = fetch()
+            except Exception as exc:
+                delay = self._after_failure(host, breaker, exc, attempt)
+                if delay is None:
+                    raise
+                logger.debug("请求 %s 失败（%s），%.2f 秒后第 %d 次重试", url, exc, delay, attempt + 1)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # 取消或中断：结果未知，半开探测不能一直占着名额
+                breaker.release()
+                raise
+            breaker.record_success()
+            return result
+
+    async def acall(self, url: str, fetch: Callable[[], Awaitable[T]]) -> T:
+        """`call` 的异步版本，`fetch` 每次调用返回一个新的协程。"""
+        host = urlsplit(url).hostname or ""
+        attempt = 0
+        while True:
+            breaker = self._before(host, url)
+            try:
+                result = await fetch()
+            except Exception as exc:
+                delay = self._after_failure(host, breaker, exc, attempt)
+                if delay is None:
+                    raise
+                logger.debug("请求 %s 失败（%s），%.2f 秒后第 %d 次重试", url, exc, delay, attempt + 1)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                # 取消或中断：结果未知，半开探测不能一直占着名额
+                breaker.release()
+                raise
+            breaker.record_success()
+            return result
+
+
+def retry_after(headers: Any) -> Optional[float]:
+    """解析 ``Retry-After`` 响应头中的秒数，缺失或为日期格式时返回 None。"""
+    value = headers.get("Retry-After") if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+_default_policy: Optional[FetchPolicy] = None
+_default_lock = threading.Lock()
+
+
+def default_policy() -> FetchPolicy:
+    """进程内共享的默认策略，未显式传入策略的抓取函数共用同一组熔断器与计数。"""
+    global _default_policy
+    with _default_lock:
+        if _default_policy is None:
+            _default_policy = FetchPolicy()
+        return _default_policy
+
+
+def http_get(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 10.0,
+    session: Optional[requests.Session] = None,
+    policy: Optional[FetchPolicy] = None,
+) -> requests.Response:
+    """带重试与熔断的同步 GET，非 200 状态码抛出 `HTTPStatusError`。"""
+    import requests
+
+    policy = policy or default_policy()
+    getter = session.get if session is not None else requests.get
+
+    def fetch() -> requests.Response:
+        response = getter(url, headers=headers, timeout=timeout)
+        if response.status_code != 200:
+            raise HTTPStatusError(response.status_code, url, retry_after(response.headers))
+        return response
+
+    return policy.call(url, fetch)
@@ -0,0 +1,244 @@
+"""热点路径埋点：按阶段统计耗时分位数与吞吐，可选导出 JSON 与 cProfile 结果。
+
+用 `timed` 标记需要统计的阶段，既可作装饰器（同步或异步函数），也可作上下文管理器::
+
+    @timed("http.analysis")
+    def fetch_stock_analysis(...): ...
+
+    with timed("parse.stockstar"):
+        ...
+
+埋点默认关闭，关闭时装饰器只多一次函数调用与一次全局开关判断，不读取时钟也不记录数据。
+调用 `enable()`、设置环境变量 ``QUANTIFY_INSTRUMENT=1`` 或使用 `InstrumentedRun` 开启；
+运行结束后 `format_report()` 输出各阶段调用次数、p50/p95/p99 延迟与吞吐。
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TextIO, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = os.environ.get("QUANTIFY_INSTRUMENT", "").lower() not in ("", "0", "false", "no")
+# 阶段名 -> 每次调用的耗时（纳秒）；list.append 在 GIL 下是原子的，记录时无需加锁
+_durations: Dict[str, List[int]] = defaultdict(list)
+_counters: Dict[str, int] = defaultdict(int)
+_counter_lock = threading.Lock()
+_started = time.perf_counter()
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """清空已记录的数据，吞吐的墙钟起点重置为当前时间。"""
+    global _started
+    _durations.clear()
+    _counters.clear()
+    _started = time.perf_counter()
+
+
+def record(name: str, elapsed_ns: int) -> None:
+    """直接记录一次耗时，适用于无法用装饰器包裹的代码。"""
+    if _enabled:
+        _durations[name].append(elapsed_ns)
+
+
+def count(name: str, n: int = 1) -> None:
+    """累加计数器，如处理的K线数、请求字节数。"""
+    if _enabled:
+        with _counter_lock:
+            _counters[name] += n
+
+
+class timed:  # noqa: N801 - 作为装饰器使用，保持函数式命名
+    """阶段计时器，可作装饰器或上下文管理器。
+
+    作上下文管理器时每次使用新建一个实例，同一实例不可在多个线程中同时进入。
+    """
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = 0
+
+    def __enter__(self) -> "timed":
+        if _enabled:
+            self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if _enabled and self._start:
+            _durations[self.name].append(time.perf_counter_ns() - self._start)
+            self._start = 0
+
+    def __call__(self, func: F) -> F:
+        name = self.name
+        samples = _durations
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    samples[name].append(time.perf_counter_ns() - start)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples[name].append(time.perf_counter_ns() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+
+def _percentile(ordered: List[int], q: float) -> float:
+    """线性插值分位数，`ordered` 须已升序。"""
+    if len(ordered) == 1:
+        return float(ordered[0])
+    pos = (len(ordered) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def summary() -> Dict[str, Any]:
+    """返回各阶段统计与计数器，时间单位为毫秒，吞吐为每秒调用次数。
+
+    ``busy_per_s`` 按该阶段累计耗时计算，``wall_per_s`` 按开启以来的墙钟时间计算。
+    """
+    wall = max(time.perf_counter() - _started, 1e-9)
+    stages: Dict[str, Dict[str, float]] = {}
+    for name, samples in sorted(_durations.items()):
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        total = sum(ordered)
+        stages[name] = {
+            "calls": len(ordered),
+            "total_ms": total / 1e6,
+            "mean_ms": total / len(ordered) / 1e6,
+            "p50_ms": _percentile(ordered, 0.50) / 1e6,
+            "p95_ms": _percentile(ordered, 0.95) / 1e6,
+            "p99_ms": _percentile(ordered, 0.99) / 1e6,
+            "max_ms": ordered[-1] / 1e6,
+            "busy_per_s": len(ordered) / (total / 1e9) if total else float("inf"),
+            "wall_per_s": len(ordered) / wall,
+        }
+    return {"wall_s": wall, "stages": stages, "counters": dict(sorted(_counters.items()))}
+
+
+def format_report(data: Optional[Dict[str, Any]] = None) -> str:
+    """格式化为文本表格。"""
+    data = data or summary()
+    header = f"{'stage':<28}{'calls':>9}{'total ms':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'calls/s':>12}"
+    lines = [f"耗时统计（墙钟 {data['wall_s']:.2f} s）", header, "-" * len(header)]
+    for name, s in data["stages"].items():
+        lines.append(
+            f"{name:<28}{s['calls']:>9,}{s['total_ms']:>12.1f}{s['p50_ms']:>10.3f}{s['p95_ms']:>10.3f}"
+            f"{s['p99_ms']:>10.3f}{s['max_ms']:>10.3f}{s['busy_per_s']:>12,.0f}"
+        )
+    if data["counters"]:
+        lines.append("")
+        lines.extend(f"{name:<28}{value:>9,}" for name, value in data["counters"].items())
+    return "\n".join(lines)
+
+
+def dump_json(path: Path) -> Dict[str, Any]:
+    """将 `summary()` 写入 JSON 文件并返回。"""
+    data = summary()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        json.dump(data, fh, ensure_ascii=False, indent=2)
+    return data
+
+
+class InstrumentedRun:
+    """在一次运行期间开启埋点，结束时输出报告，可选导出 JSON 与 cProfile 统计文件。
+
+    profile 文件可用 ``python -m pstats <file>`` 或 snakeviz 查看。
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        json_path: Optional[Path] = None,
+        profile_path: Optional[Path] = None,
+        stream: Optional[TextIO] = None,
+    ):
+        self._enabled = enabled
+        self._json_path = json_path
+        self._profile_path = profile_path
+        self._stream = stream
+        self._profiler: Optional[cProfile.Profile] = None
+        self._was_enabled = False
+
+    @classmethod
+    def from_settings(cls, settings: Any, **kwargs: Any) -> "InstrumentedRun":
+        """根据 `Settings.instrumentation` 构造。"""
+        config = settings.instrumentation
+        options = {
+            "enabled": config.enabled or _enabled,
+            "json_path": config.json_path,
+            "profile_path": config.profile_path,
+        }
+        options.update(kwargs)
+        return cls(**options)
+
+    def __enter__(self) -> "InstrumentedRun":
+        if not self._enabled:
+            return self
+        self._was_enabled = _enabled
+        reset()
+        enable()
+        if self._profile_path is not None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if not self._enabled:
+            return
+        if self._profiler is not None:
+            self._profiler.disable()
+            path = Path(self._profile_path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(str(path))
+            self._profiler = None
+        data = dump_json(self._json_path) if self._json_path is not None else summary()
+        if not self._was_enabled:
+            disable()
+        print(format_report(data), file=self._stream or sys.stdout)
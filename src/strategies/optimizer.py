@@ -0,0 +1,325 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from quantify.features.store import FeatureStore
+from strategies.strategy_one import (
+    StrategyOne, _DAY_NS, _NAT_NS, _align_index_close, _signal_kernel, _signal_kernel_jit,
+)
+
+# 影响指标计算的参数，其余参数只影响信号状态机
+INDICATOR_PARAMS = ('short_window', 'long_window', 'rsi_period', 'atr_period')
+
+# 指标越小越好的评价指标
+LOWER_IS_BETTER = {'max_drawdown'}
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+@dataclass
+class _ArraySpec:
+    """共享内存中单个数组的位置描述"""
+    offset: int
+    length: int
+    dtype: str
+
+
+class SharedArrays:
+    """
+    将多个一维数组打包进同一块共享内存，子进程按名称挂载后零拷贝读取
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        specs: Dict[str, _ArraySpec] = {}
+        offset = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            specs[name] = _ArraySpec(offset, array.size, array.dtype.str)
+            # 按 8 字节对齐，保证每个视图都满足 float64/int64 对齐要求
+            offset += (array.nbytes + 7) // 8 * 8
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+        self.specs = specs
+        for name, array in arrays.items():
+            self.view(name)[:] = np.ravel(array)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def view(self, name: str) -> np.ndarray:
+        return _view(self.shm, self.specs[name])
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _view(shm: shared_memory.SharedMemory, spec: _ArraySpec) -> np.ndarray:
+    return np.ndarray((spec.length,), dtype=np.dtype(spec.dtype), buffer=shm.buf, offset=spec.offset)
+
+
+class IndicatorPanel:
+    """
+    多标的行情与指标面板
+
+    各标的数据首尾拼接成一维数组（offsets 记录每个标的的起止位置），
+    每个不同的 SMA 窗口、RSI/ATR 周期只计算一次，供所有参数组合共享；
+    指标取自 FeatureStore，多次扫描或其他策略已算过的指标直接复用。
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], offsets: np.ndarray, symbols: List[str]):
+        self.arrays = arrays
+        self.offsets = offsets
+        self.symbols = symbols
+
+    @classmethod
+    def build(cls, data: Dict[str, pd.DataFrame], combos: Sequence[Dict[str, Any]],
+              index_data: Optional[pd.DataFrame] = None,
+              store: Optional[FeatureStore] = None) -> 'IndicatorPanel':
+        """
+        根据全部参数组合预计算所需指标
+
+        Args:
+            data: 标的代码 -> OHLCV 数据
+            combos: 完整参数组合列表
+            index_data: 可选的指数数据，按与 StrategyOne 相同的规则对齐到各标的日期
+            store: 指标仓库，默认新建一个仅本次使用的仓库
+
+        Returns:
+            IndicatorPanel: 指标面板
+        """
+        symbols = list(data)
+        sma_windows = sorted({c['short_window'] for c in combos} | {c['long_window'] for c in combos})
+        rsi_periods = sorted({c['rsi_period'] for c in combos})
+        atr_periods = sorted({c['atr_period'] for c in combos})
+
+        store = store if store is not None else FeatureStore()
+        frames = {symbol: data[symbol].sort_index() for symbol in symbols}
+
+        columns: Dict[str, List[np.ndarray]] = {'close': [], 'times': [], 'index_close': []}
+        for frame in frames.values():
+            columns['close'].append(frame['close'].to_numpy(dtype=np.float64))
+            columns['times'].append(frame.index.asi8)
+            if index_data is not None:
+                columns['index_close'].append(_align_index_close(frame.index, index_data))
+        for window in sma_windows:
+            columns[f'sma_{window}'] = list(store.compute(frames, 'sma', period=window).values())
+        for period in rsi_periods:
+            columns[f'rsi_{period}'] = list(store.compute(frames, 'rsi', period=period).values())
+        for period in atr_periods:
+            columns[f'atr_{period}'] = list(store.compute(frames, 'atr', period=period).values())
+
+        lengths = [len(frame) for frame in frames.values()]
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        arrays = {
+            name: (np.concatenate(parts) if parts else np.empty(0, dtype=np.float64))
+            for name, parts in columns.items()
+        }
+        return cls(arrays, offsets, symbols)
+
+
+# 子进程内挂载的共享内存与面板视图
+_WORKER: Dict[str, Any] = {}
+
+
+def _attach(shm_name: str, specs: Dict[str, _ArraySpec], offsets: np.ndarray, use_numba: bool) -> None:
+    """进程池初始化：挂载共享内存，整个进程生命周期内复用"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER['shm'] = shm
+    _WORKER['arrays'] = {name: _view(shm, spec) for name, spec in specs.items()}
+    _WORKER['offsets'] = offsets
+    _WORKER['use_numba'] = use_numba
+
+
+def _symbol_metrics(close: np.ndarray, signals: np.ndarray) -> Tuple[float, float, float, int]:
+    """根据信号计算单个标的的收益、夏普、最大回撤与交易次数（收盘价成交，满仓/空仓）"""
+    rows = np.where(signals != 0, np.arange(len(signals)), -1)
+    last = np.maximum.accumulate(rows)
+    held = (last >= 0) & (signals[np.maximum(last, 0)] > 0)
+    returns = np.zeros(len(close))
+    returns[1:] = np.where(held[:-1], close[1:] / close[:-1] - 1.0, 0.0)
+    equity = np.cumprod(1.0 + returns)
+    std = returns[1:].std(ddof=1) if len(returns) > 2 else 0.0
+    sharpe = float(returns[1:].mean() / std * np.sqrt(TRADING_DAYS_PER_YEAR)) if std > 0 else 0.0
+    peak = np.maximum.accumulate(equity)
+    max_drawdown = float((1.0 - equity / peak).max()) if len(equity) else 0.0
+    return float(equity[-1] - 1.0) if len(equity) else 0.0, sharpe, max_drawdown, int((signals > 0).sum())
+
+
+def _evaluate(params: Dict[str, Any], arrays: Dict[str, np.ndarray], offsets: np.ndarray,
+              use_numba: bool, now_ns: int) -> Dict[str, Any]:
+    """在全部标的上评估一组参数，返回各标的指标的平均值"""
+    kernel = _signal_kernel_jit if (use_numba and _signal_kernel_jit is not None) else _signal_kernel
+    sma_short = arrays[f"sma_{params['short_window']}"]
+    sma_long = arrays[f"sma_{params['long_window']}"]
+    rsi = arrays[f"rsi_{params['rsi_period']}"]
+    atr = arrays[f"atr_{params['atr_period']}"]
+    has_index = arrays['index_close'].size > 0
+    suspend_ns = int(pd.Timedelta(days=params['suspend_days']).value)
+    empty_index = np.empty(0, dtype=np.float64)
+
+    stats = []
+    for k in range(len(offsets) - 1):
+        lo, hi = offsets[k], offsets[k + 1]
+        close = arrays['close'][lo:hi]
+        if hi - lo < params['long_window']:
+            signals = np.zeros(hi - lo, dtype=np.int64)
+        else:
+            int_state = np.array([0, _NAT_NS, 0, _NAT_NS], dtype=np.int64)
+            float_state = np.zeros(3, dtype=np.float64)
+            signals = kernel(
+                close, arrays['times'][lo:hi], sma_short[lo:hi], sma_long[lo:hi], rsi[lo:hi], atr[lo:hi],
+                arrays['index_close'][lo:hi] if has_index else empty_index,
+                params['long_window'], int_state, float_state,
+                float(params['atr_multiplier']), int(params['max_hold_days']), float(params['max_drawdown']),
+                suspend_ns, float(params['index_drop_threshold']), now_ns, _DAY_NS,
+            )
+        stats.append(_symbol_metrics(close, signals))
+
+    values = np.array(stats, dtype=np.float64).reshape(-1, 4)
+    return {
+        **params,
+        'total_return': float(values[:, 0].mean()) if len(values) else 0.0,
+        'sharpe': float(values[:, 1].mean()) if len(values) else 0.0,
+        'max_drawdown': float(values[:, 2].mean()) if len(values) else 0.0,
+        'trades': int(values[:, 3].sum()),
+    }
+
+
+def _evaluate_chunk(combos: List[Dict[str, Any]], now_ns: int) -> List[Dict[str, Any]]:
+    """子进程任务：评估一批参数组合"""
+    return [_evaluate(params, _WORKER['arrays'], _WORKER['offsets'], _WORKER['use_numba'], now_ns)
+            for params in combos]
+
+
+def _valid(combos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """去掉长均线不长于短均线、没有意义的组合"""
+    return [c for c in combos if c['short_window'] < c['long_window']]
+
+
+class ParameterSweep:
+    """
+    StrategyOne 参数优化器，支持网格搜索与随机搜索
+
+    特点：
+    1. 指标共享：每个不同的均线窗口、RSI/ATR 周期只计算一次
+    2. 共享内存：行情与指标面板放入一块共享内存，子进程挂载后零拷贝读取
+    3. 并行评估：参数组合分批交给进程池，按指定评价指标排序
+    """
+
+    def __init__(self, data: Dict[str, pd.DataFrame], grid: Dict[str, Sequence[Any]],
+                 base_params: Optional[Dict[str, Any]] = None, metric: str = 'sharpe',
+                 index_data: Optional[pd.DataFrame] = None, max_workers: Optional[int] = None,
+                 chunk_size: int = 16, use_numba: bool = True, store: Optional[FeatureStore] = None):
+        """
+        初始化优化器
+
+        Args:
+            data: 标的代码 -> OHLCV 数据
+            grid: 参数名 -> 候选值列表，参数名与 StrategyOne 的参数一致
+            base_params: 不参与搜索的固定参数
+            metric: 排序指标，可选 total_return / sharpe / max_drawdown / trades
+            index_data: 可选的指数数据，用于大盘熔断判断
+            max_workers: 进程数，默认 CPU 核数；为 1 时在当前进程内计算
+            chunk_size: 每个进程任务包含的参数组合数
+            use_numba: 安装了 numba 时是否使用 JIT 编译的状态机
+            store: 共享的指标仓库，多次 run 之间复用已计算的指标
+        """
+        unknown = set(grid) - set(self.defaults())
+        if unknown:
+            raise ValueError(f"未知的策略参数: {sorted(unknown)}")
+        self.data = data
+        self.grid = {name: list(values) for name, values in grid.items()}
+        self.base_params = dict(base_params or {})
+        self.metric = metric
+        self.index_data = index_data
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.use_numba = use_numba
+        self.store = store if store is not None else FeatureStore()
+
+    @staticmethod
+    def defaults() -> Dict[str, Any]:
+        """StrategyOne 的默认参数"""
+        strategy = StrategyOne({})
+        return {
+            'short_window': strategy.short_window,
+            'long_window': strategy.long_window,
+            'rsi_period': strategy.rsi_period,
+            'atr_period': strategy.atr_period,
+            'atr_multiplier': strategy.atr_multiplier,
+            'max_hold_days': strategy.max_hold_days,
+            'max_drawdown': strategy.max_drawdown,
+            'suspend_days': strategy.suspend_days,
+            'index_drop_threshold': strategy.index_drop_threshold,
+        }
+
+    def grid_combinations(self) -> List[Dict[str, Any]]:
+        """网格搜索：全部有效的参数组合"""
+        base = {**self.defaults(), **self.base_params}
+        names = list(self.grid)
+        return _valid([{**base, **dict(zip(names, values))} for values in itertools.product(*self.grid.values())])
+
+    def random_combinations(self, n_iter: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """随机搜索：从网格的有效组合中无放回抽取 n_iter 组参数"""
+        combos = self.grid_combinations()
+        rng = np.random.default_rng(seed)
+        picks = rng.choice(len(combos), size=min(n_iter, len(combos)), replace=False)
+        return [combos[i] for i in sorted(picks)]
+
+    def run(self, n_iter: Optional[int] = None, seed: Optional[int] = None,
+            combos: Optional[Iterable[Dict[str, Any]]] = None) -> pd.DataFrame:
+        """
+        执行参数搜索
+
+        Args:
+            n_iter: 指定时做随机搜索，否则做完整网格搜索
+            seed: 随机搜索的随机种子
+            combos: 直接指定待评估的参数组合
+
+        Returns:
+            pd.DataFrame: 每行一组参数及其评价指标，按 metric 排序
+        """
+        if combos is not None:
+            combos = _valid([{**self.defaults(), **self.base_params, **c} for c in combos])
+        elif n_iter is not None:
+            combos = self.random_combinations(n_iter, seed)
+        else:
+            combos = self.grid_combinations()
+        if not combos:
+            return pd.DataFrame()
+
+        panel = IndicatorPanel.build(self.data, combos, self.index_data, self.store)
+        now_ns = pd.Timestamp.now().value
+        if self.max_workers == 1:
+            rows = [_evaluate(c, panel.arrays, panel.offsets, self.use_numba, now_ns) for c in combos]
+        else:
+            rows = self._run_pool(panel, combos, now_ns)
+        return self.rank(pd.DataFrame(rows))
+
+    def _run_pool(self, panel: IndicatorPanel, combos: List[Dict[str, Any]], now_ns: int) -> List[Dict[str, Any]]:
+        shared = SharedArrays(panel.arrays)
+        try:
+            chunks = [combos[i:i + self.chunk_size] for i in range(0, len(combos), self.chunk_size)]
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(chunks)),
+                initializer=_attach,
+                initargs=(shared.name, shared.specs, panel.offsets, self.use_numba),
+            ) as pool:
+                results = pool.map(_evaluate_chunk, chunks, itertools.repeat(now_ns))
+                return [row for chunk in results for row in chunk]
+        finally:
+            shared.close()
+
+    def rank(self, results: pd.DataFrame) -> pd.DataFrame:
+        """按评价指标排序并添加名次列"""
+        ascending = self.metric in LOWER_IS_BETTER
+        ranked = results.drop(columns='rank', errors='ignore').sort_values(self.metric, ascending=ascending, kind='stable').reset_index(drop=True)
+        ranked.insert(0, 'rank', np.arange(1, len(ranked) + 1))
+        return ranked
@@ -1,9 +1,192 @@
 import pandas as pd
 import numpy as np
+from collections import deque
 from typing import Dict, List, Any, Optional, Tuple
 from src.core.signal_result import SignalResult
+from quantify.features.indicators import atr_update, rsi_update
+from quantify.strategies.signals import SignalFrame
+from quantify.utils.instrumentation import timed
 from dataclasses import dataclass
-import talib as ta
+
+
+class RollingIndicators:
+    """
+    增量指标计算器，逐根K线更新 SMA/RSI/ATR
+
+    计算口径与 TA-Lib 的 SMA、RSI（Wilder 平滑）、ATR（Wilder 平滑）保持一致，
+    每根K线的更新成本为 O(1)，不依赖历史长度。
+    """
+
+    def __init__(self, short_window: int, long_window: int, rsi_period: int, atr_period: int):
+        self.short_window = short_window
+        self.long_window = long_window
+        self.rsi_period = rsi_period
+        self.atr_period = atr_period
+        self.reset()
+
+    def reset(self) -> None:
+        """清空全部指标状态"""
+        self.count = 0
+        self._closes = deque(maxlen=max(self.short_window, self.long_window))
+        self._short_sum = 0.0
+        self._long_sum = 0.0
+        self._prev_close = np.nan
+        # RSI 状态：预热期累计涨跌幅，之后为 Wilder 平滑均值
+        self._gain = 0.0
+        self._loss = 0.0
+        # ATR 状态：预热期累计真实波幅，之后为 Wilder 平滑均值
+        self._atr = 0.0
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float, float, float]:
+        """
+        追加一根K线并返回最新指标值
+        
+        Args:
+            high: 最高价
+            low: 最低价
+            close: 收盘价
+            
+        Returns:
+            Tuple: (short_ma, long_ma, rsi, atr)，预热期内对应值为 NaN
+        """
+        n = self.count
+        closes = self._closes
+        # SMA：维护窗口内累计和，移除最旧的一根后加入新值
+        if n >= self.short_window:
+            self._short_sum -= closes[-self.short_window]
+        if n >= self.long_window:
+            self._long_sum -= closes[-self.long_window]
+        closes.append(close)
+        self._short_sum += close
+        self._long_sum += close
+        short_ma = self._short_sum / self.short_window if n + 1 >= self.short_window else np.nan
+        long_ma = self._long_sum / self.long_window if n + 1 >= self.long_window else np.nan
+
+        rsi = np.nan
+        atr = np.nan
+        if n > 0:
+            prev_close = self._prev_close
+            # RSI/ATR 与指标仓库共用同一份 Wilder 递推
+            self._gain, self._loss, rsi = rsi_update(n, close - prev_close, self._gain, self._loss,
+                                                     self.rsi_period)
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            self._atr, atr = atr_update(n, true_range, self._atr, self.atr_period)
+
+        self._prev_close = close
+        self.count = n + 1
+        return short_ma, long_ma, rsi, atr
+
+try:  # numba 为可选依赖，安装后信号状态机会被 JIT 编译
+    from numba import njit
+except ImportError:  # pragma: no cover - 取决于运行环境
+    njit = None
+
+_DAY_NS = 86_400_000_000_000
+_NAT_NS = np.iinfo(np.int64).min
+
+# 状态数组下标
+_POSITION, _ENTRY_TIME, _SUSPENDED, _SUSPEND_UNTIL = 0, 1, 2, 3
+_ENTRY_PRICE, _HIGHEST_PRICE, _STOP_LOSS = 0, 1, 2
+
+
+def _align_index_close(index: pd.DatetimeIndex, index_data: pd.DataFrame) -> np.ndarray:
+    """指数收盘价按日期对齐到标的的K线：取不晚于该K线的最近一个指数收盘价，指数尚无数据时为 NaN（不触发熔断）
+
+    批量、增量模式与参数优化器共用这一对齐规则。
+    """
+    return index_data['close'].sort_index().reindex(index, method='ffill').to_numpy(dtype=np.float64)
+
+
+def _signal_kernel(close, clock, short_ma, long_ma, rsi, atr, index_close, start,
+                   int_state, float_state, atr_multiplier, max_hold_days, max_drawdown,
+                   suspend_span, index_drop_threshold, now, unit):
+    """
+    在纯 NumPy 数组上运行 StrategyOne 的信号状态机
+    
+    规则与 generate_signals 的逐K线实现完全一致。时间 `clock` 为 int64，`unit` 为一天的长度：
+    不使用交易日历时为纳秒时间戳与 _DAY_NS；使用交易日历时为交易日序号与 1，
+    此时持仓天数与暂停期都按交易日计算。`now` 为 _NAT_NS 时大盘熔断暂停到下一个时间单位，
+    否则暂停到 now + unit。
+    int_state/float_state 为可变状态数组，运行结束后保存最终状态。
+    
+    Returns:
+        np.ndarray: int64 信号数组，1 买入，-1 卖出，0 无信号
+    """
+    n = close.shape[0]
+    n_index = index_close.shape[0]
+    signals = np.zeros(n, dtype=np.int64)
+    position = int_state[_POSITION]
+    entry_time = int_state[_ENTRY_TIME]
+    suspended = int_state[_SUSPENDED]
+    suspend_until = int_state[_SUSPEND_UNTIL]
+    entry_price = float_state[_ENTRY_PRICE]
+    highest = float_state[_HIGHEST_PRICE]
+    stop_loss = float_state[_STOP_LOSS]
+
+    for i in range(start, n):
+        t = clock[i]
+        # 跳过暂停交易期
+        if suspended:
+            if t >= suspend_until:
+                suspended = 0
+            continue
+
+        # 检查大盘条件（指数收盘价已按日期对齐到 close，见 _align_index_close）
+        j = min(i, n_index - 1)
+        if j >= 1:
+            index_return = index_close[j] / index_close[j - 1] - 1
+            if index_return < -index_drop_threshold:
+                suspended = 1
+                suspend_until = (t if now == _NAT_NS else now) + unit
+                continue
+
+        price = close[i]
+
+        # 如果已有持仓，检查是否需要平仓
+        if position:
+            exit_now = False
+            if price < stop_loss:
+                exit_now = True
+            elif (t - entry_time) // unit > max_hold_days and price <= highest:
+                exit_now = True
+            else:
+                highest = max(highest, price)
+                if 1 - price / highest > max_drawdown:
+                    suspended = 1
+                    suspend_until = t + suspend_span
+                    exit_now = True
+            if exit_now:
+                signals[i] = -1
+                position = 0
+                continue
+
+        # 生成买入信号
+        trend_up = (price > long_ma[i]) and (short_ma[i] > long_ma[i])
+        momentum_ok = (rsi[i] > 50) and (rsi[i] < 70)
+
+        if not position and trend_up and momentum_ok:
+            signals[i] = 1
+            position = 1
+            entry_price = price
+            entry_time = t
+            highest = price
+            stop_loss = price - atr_multiplier * atr[i]
+        # 生成卖出信号（趋势破坏）
+        elif position and not trend_up:
+            signals[i] = -1
+            position = 0
+
+    int_state[_POSITION] = position
+    int_state[_ENTRY_TIME] = entry_time
+    int_state[_SUSPENDED] = suspended
+    int_state[_SUSPEND_UNTIL] = suspend_until
+    float_state[_ENTRY_PRICE] = entry_price
+    float_state[_HIGHEST_PRICE] = highest
+    float_state[_STOP_LOSS] = stop_loss
+    return signals
+
+
+_signal_kernel_jit = njit(cache=True, nogil=True)(_signal_kernel) if njit is not None else None
 
 
 @dataclass
@@ -43,6 +226,11 @@ class StrategyOne:
                 - max_drawdown: 最大回撤阈值（默认0.15）
                 - suspend_days: 触发回撤后暂停天数（默认5）
                 - index_drop_threshold: 大盘熔断阈值（默认0.03）
+                - use_numba: 安装了 numba 时是否使用 JIT 编译的信号状态机（默认True）
+                - feature_store: 可选的 quantify.features.FeatureStore，
+                  数据带有 attrs['symbol'] 时从中获取指标，与其他策略共享计算结果
+                - calendar: 可选的 quantify.data.calendar.TradingCalendar，设置后最大持仓天数、
+                  回撤暂停天数与大盘熔断均按交易日计算（默认按自然日）
         """
         # 技术指标参数
         self.short_window = params.get('short_window', 5)
@@ -56,40 +244,83 @@ class StrategyOne:
         self.max_drawdown = params.get('max_drawdown', 0.15)
         self.suspend_days = params.get('suspend_days', 5)
         self.index_drop_threshold = params.get('index_drop_threshold', 0.03)
+        self.use_numba = params.get('use_numba', True)
+        self.feature_store = params.get('feature_store')
+        self.calendar = params.get('calendar')
         
         # 策略状态
         self.state = StrategyState()
+        
+        # 增量模式状态
+        self._rolling = RollingIndicators(self.short_window, self.long_window, self.rsi_period, self.atr_period)
+        self._prev_index_close: Optional[float] = None
 
-    def _check_market_condition(self, index_data: pd.DataFrame) -> bool:
+    def _market_allows(self, prev_close: Optional[float], close: float,
+                       timestamp: Optional[pd.Timestamp] = None) -> bool:
         """
-        检查大盘条件是否允许交易
+        根据指数前后两日收盘价判断是否允许交易，触发熔断时更新策略状态
         
         Args:
-            index_data: 指数数据，包含'close'列
+            prev_close: 指数前一日收盘价，没有时视为允许交易
+            close: 指数当日收盘价
+            timestamp: 当前K线时间，设置了交易日历时暂停到其下一个交易日
             
         Returns:
             bool: 是否允许交易
         """
-        if len(index_data) < 2:
+        if prev_close is None:
             return True
             
         # 计算指数日涨跌幅
-        index_return = (index_data['close'].iloc[-1] / index_data['close'].iloc[-2] - 1)
+        index_return = (close / prev_close - 1)
         
         # 如果指数跌幅超过阈值，触发熔断机制
         if index_return < -self.index_drop_threshold:
             self.state.trading_suspended = True
-            self.state.suspend_until = pd.Timestamp.now() + pd.Timedelta(days=1)
+            if self.calendar is not None and timestamp is not None:
+                self.state.suspend_until = self._session_after(timestamp, 1)
+            else:
+                self.state.suspend_until = pd.Timestamp.now() + pd.Timedelta(days=1)
             return False
             
         return True
 
-    def _check_position_risk(self, data: pd.DataFrame) -> bool:
+    def _to_clock(self, timestamp: Optional[pd.Timestamp]) -> int:
+        """状态中的时间转换为信号状态机使用的整数时钟：交易日序号或纳秒时间戳"""
+        if timestamp is None:
+            return _NAT_NS
+        return self.calendar.index(timestamp, side="prev") if self.calendar is not None else timestamp.value
+
+    def _from_clock(self, value: int) -> Optional[pd.Timestamp]:
+        """`_to_clock` 的逆变换，超出日历范围的交易日序号按自然日外推"""
+        if value == _NAT_NS:
+            return None
+        if self.calendar is None:
+            return pd.Timestamp(value)
+        last = len(self.calendar) - 1
+        if value < 0:
+            return self.calendar.session(0) + pd.Timedelta(days=int(value))
+        if value > last:
+            return self.calendar.session(last) + pd.Timedelta(days=int(value - last))
+        return self.calendar.session(int(value))
+
+    def _session_after(self, timestamp: pd.Timestamp, n: int) -> pd.Timestamp:
+        """timestamp 所在交易日之后第 n 个交易日"""
+        return self._from_clock(self._to_clock(timestamp) + n)
+
+    def _held_days(self, timestamp: pd.Timestamp) -> int:
+        """已持仓天数，设置了交易日历时为交易日数"""
+        if self.calendar is not None:
+            return int(self.calendar.distance(self.state.entry_time, timestamp))
+        return (timestamp - self.state.entry_time).days
+
+    def _position_exit(self, timestamp: pd.Timestamp, current_price: float) -> bool:
         """
-        检查持仓风险，判断是否需要强制平仓
+        根据当前时间与价格检查持仓风险，判断是否需要强制平仓
         
         Args:
-            data: 交易数据
+            timestamp: 当前K线时间
+            current_price: 当前价格
             
         Returns:
             bool: 是否需要平仓
@@ -97,14 +328,12 @@ class StrategyOne:
         if not self.state.position:
             return False
             
-        current_price = data['close'].iloc[-1]
-        
         # 1. 止损检查
         if current_price < self.state.stop_loss_price:
             return True
             
         # 2. 时间止损检查
-        if (data.index[-1] - self.state.entry_time).days > self.max_hold_days:
+        if self._held_days(timestamp) > self.max_hold_days:
             # 如果超过最大持仓天数且没有创新高，平仓
             if current_price <= self.state.highest_price:
                 return True
@@ -116,11 +345,38 @@ class StrategyOne:
         current_drawdown = 1 - current_price / self.state.highest_price
         if current_drawdown > self.max_drawdown:
             self.state.trading_suspended = True
-            self.state.suspend_until = data.index[-1] + pd.Timedelta(days=self.suspend_days)
+            self.state.suspend_until = (self._session_after(timestamp, self.suspend_days) if self.calendar is not None
+                                        else timestamp + pd.Timedelta(days=self.suspend_days))
             return True
             
         return False
 
+    def _check_market_condition(self, index_data: pd.DataFrame) -> bool:
+        """
+        检查大盘条件是否允许交易
+        
+        Args:
+            index_data: 指数数据，包含'close'列
+            
+        Returns:
+            bool: 是否允许交易
+        """
+        if len(index_data) < 2:
+            return True
+        return self._market_allows(index_data['close'].iloc[-2], index_data['close'].iloc[-1], index_data.index[-1])
+
+    def _check_position_risk(self, data: pd.DataFrame) -> bool:
+        """
+        检查持仓风险，判断是否需要强制平仓
+        
+        Args:
+            data: 交易数据
+            
+        Returns:
+            bool: 是否需要平仓
+        """
+        return self._position_exit(data.index[-1], data['close'].iloc[-1])
+
     def generate_signals(self, data: pd.DataFrame, index_data: Optional[pd.DataFrame] = None) -> SignalResult:
         """
         生成交易信号
@@ -133,73 +389,210 @@ class StrategyOne:
             SignalResult: 包含交易信号的结果对象
         """
         # 检查数据有效性
+        symbol = data.attrs.get('symbol', '')
         if len(data) < self.long_window:
-            return SignalResult(pd.Series(0, index=data.index))
+            return SignalResult(frame=SignalFrame.from_series(symbol, pd.Series(0, index=data.index)), index=data.index)
             
         # 计算技术指标
-        close = data['close']
-        high = data['high']
-        low = data['low']
-        
-        short_ma = ta.SMA(close, timeperiod=self.short_window)
-        long_ma = ta.SMA(close, timeperiod=self.long_window)
-        rsi = ta.RSI(close, timeperiod=self.rsi_period)
-        atr = ta.ATR(high, low, close, timeperiod=self.atr_period)
-        
-        # 初始化信号数组
-        signals = pd.Series(0, index=data.index)
-        
-        # 对每个时间点生成信号
-        for i in range(self.long_window, len(data)):
-            # 跳过暂停交易期
-            if self.state.trading_suspended:
-                if data.index[i] >= self.state.suspend_until:
-                    self.state.trading_suspended = False
-                continue
-                
-            # 检查大盘条件
-            if index_data is not None and not self._check_market_condition(index_data.iloc[:i+1]):
-                continue
-                
-            current_price = close[i]
+        short_ma, long_ma, rsi, atr = self._indicators(data)
+        
+        actions = pd.Series(self._run_kernel(data, short_ma, long_ma, rsi, atr, index_data), index=data.index)
+        stop_loss = self.state.stop_loss_price if self.state.position else np.nan
+        index = data.index
+        
+        def metadata() -> Dict[str, pd.Series]:
+            return {
+                'short_ma': short_ma,
+                'long_ma': long_ma,
+                'rsi': rsi,
+                'atr': atr,
+                'stop_loss': pd.Series(np.full(len(index), stop_loss), index=index),
+            }
+        
+        # 结果只保存列式信号，逐K线的信号序列与元数据在访问时才构造
+        return SignalResult(frame=SignalFrame.from_series(symbol, actions, data['close']), index=index,
+                            metadata=metadata)
+
+    @timed("strategy.indicators")
+    def _indicators(self, data: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
+        """
+        计算 SMA/RSI/ATR，配置了指标仓库且数据带有标的代码时从仓库获取
+        
+        Returns:
+            Tuple: (short_ma, long_ma, rsi, atr)
+        """
+        symbol = data.attrs.get('symbol')
+        if self.feature_store is None or symbol is None:
+            # TA-Lib 只在直接计算指标时导入，使用指标仓库或只导入策略时不加载
+            import talib as ta
+
+            close = data['close']
+            return (ta.SMA(close, timeperiod=self.short_window),
+                    ta.SMA(close, timeperiod=self.long_window),
+                    ta.RSI(close, timeperiod=self.rsi_period),
+                    ta.ATR(data['high'], data['low'], close, timeperiod=self.atr_period))
+        
+        store = self.feature_store
+        return tuple(pd.Series(values, index=data.index) for values in (
+            store.get(symbol, data, 'sma', period=self.short_window),
+            store.get(symbol, data, 'sma', period=self.long_window),
+            store.get(symbol, data, 'rsi', period=self.rsi_period),
+            store.get(symbol, data, 'atr', period=self.atr_period),
+        ))
+
+    @timed("strategy.kernel")
+    def _run_kernel(self, data: pd.DataFrame, short_ma, long_ma, rsi, atr,
+                    index_data: Optional[pd.DataFrame] = None) -> np.ndarray:
+        """
+        将行情与指标转换为 NumPy 数组并运行信号状态机，结束后回写策略状态
+        
+        Returns:
+            np.ndarray: int64 信号数组
+        """
+        state = self.state
+        int_state = np.array([
+            int(state.position),
+            self._to_clock(state.entry_time),
+            int(state.trading_suspended),
+            self._to_clock(state.suspend_until),
+        ], dtype=np.int64)
+        if self.calendar is not None:
+            # 按交易日计算：时钟为交易日序号，一天为 1，熔断暂停到下一个交易日
+            clock = np.asarray(self.calendar.index(data.index, side="prev"), dtype=np.int64)
+            unit, suspend_span, now = 1, int(self.suspend_days), _NAT_NS
+        else:
+            clock = data.index.asi8
+            unit, suspend_span, now = _DAY_NS, int(pd.Timedelta(days=self.suspend_days).value), pd.Timestamp.now().value
+        float_state = np.array([state.entry_price, state.highest_price, state.stop_loss_price], dtype=np.float64)
+        index_close = (_align_index_close(data.index, index_data) if index_data is not None
+                       else np.empty(0, dtype=np.float64))
+        
+        kernel = _signal_kernel_jit if (self.use_numba and _signal_kernel_jit is not None) else _signal_kernel
+        signals = kernel(
+            data['close'].to_numpy(dtype=np.float64),
+            clock,
+            np.asarray(short_ma, dtype=np.float64),
+            np.asarray(long_ma, dtype=np.float64),
+            np.asarray(rsi, dtype=np.float64),
+            np.asarray(atr, dtype=np.float64),
+            index_close,
+            self.long_window,
+            int_state,
+            float_state,
+            float(self.atr_multiplier),
+            int(self.max_hold_days),
+            float(self.max_drawdown),
+            suspend_span,
+            float(self.index_drop_threshold),
+            now,
+            unit,
+        )
+        
+        state.position = bool(int_state[_POSITION])
+        state.entry_time = self._from_clock(int_state[_ENTRY_TIME])
+        state.trading_suspended = bool(int_state[_SUSPENDED])
+        state.suspend_until = self._from_clock(int_state[_SUSPEND_UNTIL])
+        state.entry_price, state.highest_price, state.stop_loss_price = (float(v) for v in float_state)
+        return signals
+
+    def reset(self) -> None:
+        """清空策略状态与增量指标状态，重新开始增量处理"""
+        self.state = StrategyState()
+        self._rolling.reset()
+        self._prev_index_close = None
+
+    def on_bar(self, timestamp: pd.Timestamp, high: float, low: float, close: float,
+               index_close: Optional[float] = None) -> int:
+        """
+        增量模式：处理一根新K线并返回该K线的信号
+        
+        与 generate_signals 使用相同的信号与风控规则，但只维护滚动指标状态，
+        单根K线的处理成本为 O(1)，适合以实时行情逐笔驱动。
+        
+        Args:
+            timestamp: K线时间
+            high: 最高价
+            low: 最低价
+            close: 收盘价
+            index_close: 可选的同一时间指数收盘价，用于大盘熔断判断
+            
+        Returns:
+            int: 1 买入，-1 卖出，0 无信号
+        """
+        short_ma, long_ma, rsi, atr = self._rolling.update(high, low, close)
+        prev_index_close = self._prev_index_close
+        if index_close is not None:
+            self._prev_index_close = index_close
+        
+        # 与批量模式一致：前 long_window 根K线只用于预热指标
+        if self._rolling.count <= self.long_window:
+            return 0
+        
+        timestamp = pd.Timestamp(timestamp)
+        return self._step(timestamp, close, short_ma, long_ma, rsi, atr, index_close, prev_index_close)
+
+    def _step(self, timestamp: pd.Timestamp, current_price: float, short_ma: float, long_ma: float,
+              rsi: float, atr: float, index_close: Optional[float], prev_index_close: Optional[float]) -> int:
+        """
+        执行单根K线的状态机：暂停检查、大盘熔断、持仓风控与开平仓
+        
+        Returns:
+            int: 1 买入，-1 卖出，0 无信号
+        """
+        # 跳过暂停交易期
+        if self.state.trading_suspended:
+            if timestamp >= self.state.suspend_until:
+                self.state.trading_suspended = False
+            return 0
             
-            # 如果已有持仓，检查是否需要平仓
-            if self.state.position:
-                if self._check_position_risk(data.iloc[:i+1]):
-                    signals[i] = -1
-                    self.state.position = False
-                    continue
-                    
-            # 生成买入信号
-            trend_up = (current_price > long_ma[i]) and (short_ma[i] > long_ma[i])
-            momentum_ok = (rsi[i] > 50) and (rsi[i] < 70)
+        # 检查大盘条件
+        if index_close is not None and not self._market_allows(prev_index_close, index_close, timestamp):
+            return 0
             
-            if not self.state.position and trend_up and momentum_ok:
-                signals[i] = 1
-                self.state.position = True
-                self.state.entry_price = current_price
-                self.state.entry_time = data.index[i]
-                self.state.highest_price = current_price
-                self.state.stop_loss_price = current_price - self.atr_multiplier * atr[i]
-                
-            # 生成卖出信号（趋势破坏）
-            elif self.state.position and not trend_up:
-                signals[i] = -1
+        # 如果已有持仓，检查是否需要平仓
+        if self.state.position:
+            if self._position_exit(timestamp, current_price):
                 self.state.position = False
+                return -1
+                
+        # 生成买入信号
+        trend_up = (current_price > long_ma) and (short_ma > long_ma)
+        momentum_ok = (rsi > 50) and (rsi < 70)
         
-        # 创建结果对象
-        result = SignalResult()
-        result.signals = signals
-        result.metadata = {
-            'short_ma': short_ma,
-            'long_ma': long_ma,
-            'rsi': rsi,
-            'atr': atr,
-            'stop_loss': pd.Series([self.state.stop_loss_price if self.state.position else np.nan for _ in range(len(data))],
-                                 index=data.index)
-        }
-        
-        return result
+        if not self.state.position and trend_up and momentum_ok:
+            self.state.position = True
+            self.state.entry_price = current_price
+            self.state.entry_time = timestamp
+            self.state.highest_price = current_price
+            self.state.stop_loss_price = current_price - self.atr_multiplier * atr
+            return 1
+            
+        # 生成卖出信号（趋势破坏）
+        if self.state.position and not trend_up:
+            self.state.position = False
+            return -1
+        return 0
+
+    def update(self, data: pd.DataFrame, index_data: Optional[pd.DataFrame] = None) -> pd.Series:
+        """
+        增量模式：按顺序处理一小批新K线
+        
+        Args:
+            data: 新增的交易数据，包含 high/low/close 列
+            index_data: 可选的指数数据，按日期与 data 对齐
+            
+        Returns:
+            pd.Series: 新增K线对应的信号
+        """
+        high = data['high'].to_numpy(dtype=float)
+        low = data['low'].to_numpy(dtype=float)
+        close = data['close'].to_numpy(dtype=float)
+        index_close = _align_index_close(data.index, index_data) if index_data is not None else None
+        signals = np.zeros(len(data), dtype=np.int64)
+        for i, timestamp in enumerate(data.index):
+            signals[i] = self.on_bar(timestamp, high[i], low[i], close[i],
+                                     index_close[i] if index_close is not None else None)
+        return pd.Series(signals, index=data.index)
 
     def calculate_position_size(self, portfolio_value: float, current_price: float, atr: float) -> int:
         """
@@ -0,0 +1,151 @@
+"""测试共用的辅助对象与 fixture，供各测试模块复用。"""
+
+import sys
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantify.config import Settings
+from quantify.features.scanner import AsyncScanner
+from quantify.strategies import BaseStrategy, Signal, StrategyContext
+
+FIXTURE = Path(__file__).resolve().parents[1] / "data" / "stockstar_GZAppraisement_03690.html"
+
+
+class _MemoryLoader:
+    """内存数据加载器，便于构造测试行情。"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self._frames = frames
+
+    def load(self, symbol: str, **kwargs) -> pd.DataFrame:
+        return self._frames[symbol].copy()
+
+
+class _ScheduleStrategy(BaseStrategy):
+    """按预设日期发出买卖信号的策略。"""
+
+    def __init__(self, schedule: Dict[str, list]):
+        self._schedule = schedule
+
+    def generate_signals(self, data: pd.DataFrame, context: StrategyContext) -> Iterator[Signal]:
+        symbol = data.attrs["symbol"]
+        for date, action in self._schedule.get(symbol, []):
+            yield Signal(symbol=symbol, action=action, timestamp=pd.Timestamp(date))
+
+
+def _bars(closes, start="2021-01-04") -> pd.DataFrame:
+    index = pd.bdate_range(start, periods=len(closes))
+    closes = np.asarray(closes, dtype=float)
+    return pd.DataFrame(
+        {"open": closes, "high": closes, "low": closes, "close": closes, "volume": 1000.0},
+        index=index,
+    )
+
+
+def _settings(capital: float = 1_000_000) -> Settings:
+    settings = Settings()
+    settings.backtest.start = "2021-01-01"
+    settings.backtest.end = "2021-12-31"
+    settings.backtest.initial_capital = capital
+    return settings
+
+
+def _history(start="2023-01-02", end="2024-03-29") -> pd.DataFrame:
+    dates = pd.bdate_range(start, end)
+    close = 100 + np.arange(len(dates), dtype=float)
+    return pd.DataFrame({
+        "日期": dates.strftime("%Y-%m-%d"),
+        "开盘": close, "收盘": close, "最高": close + 1, "最低": close - 1,
+        "成交量": np.arange(len(dates), dtype=np.int64), "成交额": close * 10, "股票代码": "600000",
+    })
+
+
+@pytest.fixture
+def fake_akshare(monkeypatch):
+    """记录每次调用参数的 akshare 替身。"""
+    module = types.ModuleType("akshare")
+    module.calls = []
+    history = _history()
+
+    def stock_zh_a_hist(symbol, period, start_date, end_date, adjust):
+        module.calls.append((symbol, start_date, end_date))
+        dates = pd.to_datetime(history["日期"])
+        return history[(dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))].copy()
+
+    def stock_hk_index_daily_sina(symbol):
+        module.calls.append((symbol,))
+        frame = history.rename(columns={"日期": "date", "开盘": "open", "收盘": "close",
+                                        "最高": "high", "最低": "low", "成交量": "volume"})
+        return frame[["date", "open", "high", "low", "close", "volume"]]
+
+    module.stock_zh_a_hist = stock_zh_a_hist
+    module.stock_hk_index_daily_sina = stock_hk_index_daily_sina
+    monkeypatch.setitem(sys.modules, "akshare", module)
+    return module
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """根据路径返回腾讯行情或证券之星页面，记录并发请求数。"""
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server 约定
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.hits.append((self.path, time.monotonic()))
+        try:
+            time.sleep(server.delay)
+            if self.path.startswith("/q="):
+                lines = []
+                for symbol in self.path[len("/q="):].split(","):
+                    if symbol.endswith("99999"):
+                        lines.append('v_pv_none_match="1";')
+                    else:
+                        lines.append(f'v_{symbol}="1~测试~{symbol[2:]}~12.34~12.00~";')
+                self._send(200, "\n".join(lines).encode("gbk"), "text/html; charset=GBK")
+            elif self.path.startswith("/analysis/"):
+                self._send(200, server.page, "text/html; charset=utf-8")
+            else:
+                self._send(404, b"")
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/plain") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:  # 静默日志
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.hits = []
+    server.delay = 0.02
+    server.page = FIXTURE.read_bytes()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _scanner(server, **kwargs) -> AsyncScanner:
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return AsyncScanner(quote_url=base + "/q={symbol}", analysis_url=base + "/analysis/{code}", **kwargs)
@@ -0,0 +1,79 @@
+"""A 股行情与估值页面解析测试。"""
+
+from pathlib import Path
+
+import pytest
+
+from quantify.features.A_stock import parse_realtime_price, parse_stock_analysis, tencent_symbol
+
+FIXTURE = Path(__file__).resolve().parents[1] / "data" / "stockstar_GZAppraisement_03690.html"
+
+
+def test_parse_stock_analysis_fixture() -> None:
+    """单次扫描从保存的页面中取出全部五个字段。"""
+    result = parse_stock_analysis(FIXTURE.read_text(encoding="utf-8"))
+    assert result == {
+        "stock_text": "美团-W (03690)",
+        "analysis": "股价合理",
+        "relative_range": "93.16-102.97",
+        "absolute_range": "--",
+        "accuracy": "B",
+    }
+
+
+def test_parse_stock_analysis_missing_fields() -> None:
+    """缺失字段返回 None，页头缺失时回退到页面标题。"""
+    result = parse_stock_analysis("<html><title>估值分析</title><p>分析结果:<b>股价被低估</b></p></html>")
+    assert result["stock_text"] == "估值分析"
+    assert result["analysis"] == "股价被低估"
+    assert result["relative_range"] is None
+
+
+def test_tencent_symbol_and_price() -> None:
+    """市场前缀与单条行情价格解析。"""
+    assert tencent_symbol("600000") == "sh600000"
+    assert tencent_symbol("000001") == "sz000001"
+    assert tencent_symbol("00700") == "hk00700"
+    with pytest.raises(ValueError):
+        tencent_symbol("abc")
+    assert parse_realtime_price('v_sh600000="1~浦发银行~600000~10.50~10.40";') == 10.5
+
+
+def test_parse_relative_range_treats_dash_as_separator() -> None:
+    """"93.16-102.97" 中的 "-" 是分隔符，不是上限的负号。"""
+    from quantify.features.A_stock import is_price_in_front_half, parse_relative_range
+
+    assert parse_relative_range("93.16-102.97") == (93.16, 102.97)
+    assert parse_relative_range("-5.2--3.1") == (-5.2, -3.1)
+    assert parse_relative_range("--") is None
+    assert is_price_in_front_half(95.0, "93.16-102.97")
+    assert not is_price_in_front_half(100.0, "93.16-102.97")
+
+
+def test_cache_hits_are_not_timed_as_http(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """只有真正发起请求的调用计入 http.quote，缓存命中不产生样本。"""
+    from types import SimpleNamespace
+
+    from quantify.features import A_stock
+    from quantify.utils import instrumentation as inst
+    from quantify.utils.cache import DiskCache
+
+    requests = []
+
+    def fake_http_get(url, **kwargs):
+        requests.append(url)
+        return SimpleNamespace(text='v_sh600000="1~浦发银行~600000~10.50~";')
+
+    monkeypatch.setattr(A_stock, "http_get", fake_http_get)
+    was_enabled = inst.is_enabled()
+    inst.reset()
+    inst.enable()
+    try:
+        cache = DiskCache(tmp_path / "c.sqlite3")
+        assert [A_stock.fetch_realtime_price("600000", cache=cache) for _ in range(3)] == [10.5] * 3
+        stages = inst.summary()["stages"]
+    finally:
+        inst.reset()
+        (inst.enable if was_enabled else inst.disable)()
+    assert len(requests) == 1
+    assert stages["http.quote"]["calls"] == 1
@@ -0,0 +1,108 @@
+"""akshare 加载器测试，使用注入的 akshare 替身，不访问网络。"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantify.data import AkshareHKIndexLoader, AkshareLoader, BarStore
+from tests.conftest import _history
+
+TODAY = pd.Timestamp("2024-03-29")
+# 盘中：当天K线尚未定型
+NOW = pd.Timestamp("2024-03-29 10:30")
+
+
+def _loader(tmp_path, **kwargs) -> AkshareLoader:
+    return AkshareLoader(BarStore(tmp_path), now=lambda: NOW, **kwargs)
+
+
+def test_downloads_only_missing_ranges(tmp_path, fake_akshare) -> None:
+    loader = _loader(tmp_path)
+    first = loader.load("600000", start="2023-06-01", end="2023-12-29")
+    assert first.index[0] == pd.Timestamp("2023-06-01") and first.index[-1] == pd.Timestamp("2023-12-29")
+    assert list(first.columns) == ["open", "close", "high", "low", "volume", "amount"]
+    assert fake_akshare.calls == [("600000", "20230601", "20231229")]
+
+    # 完全命中缓存，不访问接口
+    loader.load("600000", start="2023-07-01", end="2023-09-29")
+    assert len(fake_akshare.calls) == 1
+
+    # 两端扩展，只下载缺失部分
+    wider = loader.load("600000", start="2023-03-01", end="2024-02-29")
+    assert fake_akshare.calls[1:] == [("600000", "20230301", "20230531"), ("600000", "20231230", "20240229")]
+    history = _history()
+    expected = history.set_index(pd.to_datetime(history["日期"])).loc["2023-03-01":"2024-02-29", "收盘"]
+    np.testing.assert_array_equal(wider["close"].to_numpy(), expected.to_numpy())
+
+
+def test_today_is_refetched_and_offline_fallback(tmp_path, fake_akshare, monkeypatch) -> None:
+    loader = _loader(tmp_path)
+    first = loader.load("600000", start="2024-03-01")
+    second = loader.load("600000", start="2024-03-01")
+    # 盘中的当天K线不写入缓存，每次都重新请求当天
+    assert fake_akshare.calls == [("600000", "20240301", "20240328"), ("600000", "20240329", "20240329"),
+                                  ("600000", "20240329", "20240329")]
+    assert first.index[-1] == second.index[-1] == TODAY
+    assert loader.store.read(loader.cache_key("600000")).index[-1] == pd.Timestamp("2024-03-28")
+
+    def broken(**kwargs):
+        raise ConnectionError("network down")
+
+    monkeypatch.setattr(fake_akshare, "stock_zh_a_hist", broken)
+    cached = loader.load("600000", start="2024-03-01")
+    assert cached.index[-1] == pd.Timestamp("2024-03-28")
+
+    offline = _loader(tmp_path, offline=True)
+    assert len(offline.load("600000", start="2024-03-01", end="2024-03-15")) == 11
+    with pytest.raises(FileNotFoundError):
+        offline.load("000001")
+    with pytest.raises(ConnectionError):
+        loader.load("000001")
+
+
+def test_hk_index_loader(tmp_path, fake_akshare) -> None:
+    loader = AkshareHKIndexLoader(BarStore(tmp_path), now=lambda: NOW)
+    data = loader.load("HSTECH", start="2024-01-01", end="2024-01-31")
+    assert len(data) == len(pd.bdate_range("2024-01-01", "2024-01-31"))
+    assert loader.cache_key("HSTECH") == "hk_index_HSTECH"
+    assert loader.store.has("hk_index_HSTECH")
+    loader.load("HSTECH", start="2024-01-02", end="2024-01-15")
+    assert fake_akshare.calls == [("HSTECH",)]
+
+
+def test_tail_update_appends_without_rewriting(tmp_path, fake_akshare) -> None:
+    """收盘后向后延伸只追加列文件，已有数据文件不被替换。"""
+    loader = AkshareLoader(BarStore(tmp_path), now=lambda: pd.Timestamp("2024-03-29 16:00"))
+    loader.load("600000", start="2024-01-02", end="2024-02-29")
+    close_file = loader.store.symbol_dir(loader.cache_key("600000")) / "close.bin"
+    inode = close_file.stat().st_ino
+
+    data = loader.load("600000", start="2024-01-02")
+    assert data.index[-1] == TODAY
+    assert close_file.stat().st_ino == inode
+    meta = loader.store.meta(loader.cache_key("600000"))
+    assert meta["rows"] == len(pd.bdate_range("2024-01-02", TODAY))
+    assert meta["source"]["fetched_end"] == TODAY.isoformat()
+
+
+def test_non_adjacent_requests_fill_the_gap(tmp_path, fake_akshare) -> None:
+    """与缓存不相邻的请求连同中间的空档一起下载，之后的大区间请求不会缺数据。"""
+    loader = _loader(tmp_path)
+    loader.load("600000", start="2023-04-03", end="2023-04-28")
+    loader.load("600000", start="2023-09-01", end="2023-09-29")
+    loader.load("600000", start="2023-01-02", end="2023-02-28")
+    assert fake_akshare.calls[1:] == [("600000", "20230429", "20230929"), ("600000", "20230102", "20230402")]
+
+    data = loader.load("600000", start="2023-01-02", end="2023-09-29")
+    assert len(fake_akshare.calls) == 3
+    np.testing.assert_array_equal(data.index, pd.bdate_range("2023-01-02", "2023-09-29"))
+
+
+def test_intraday_request_for_today_on_empty_cache(tmp_path, fake_akshare) -> None:
+    """缓存为空时只请求当天：不下载倒置的区间，也不写入首末颠倒的缓存元数据。"""
+    loader = _loader(tmp_path)
+    assert loader.missing_ranges("600000", TODAY, TODAY - pd.Timedelta(days=1)) == []
+    data = loader.load("600000", start=TODAY)
+    assert fake_akshare.calls == [("600000", "20240329", "20240329")]
+    assert data.index.tolist() == [TODAY]
+    assert not loader.store.has(loader.cache_key("600000"))
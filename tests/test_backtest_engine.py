@@ -0,0 +1,45 @@
+"""组合回测引擎的基础测试。"""
+
+import pandas as pd
+import pytest
+
+from quantify.backtest import BacktestEngine
+from tests.conftest import _MemoryLoader, _ScheduleStrategy, _bars, _settings
+
+
+def test_run_universe_portfolio_equity() -> None:
+    """两只标的各占一半资金，净值应等于子账户收益之和。"""
+    frames = {
+        "AAA": _bars([10, 11, 12, 12, 6]),
+        "BBB": _bars([20, 20, 10, 15, 15]),
+    }
+    dates = frames["AAA"].index
+    schedule = {
+        "AAA": [(dates[0], "BUY"), (dates[2], "SELL")],
+        "BBB": [(dates[2], "BUY")],
+    }
+    engine = BacktestEngine(_settings(), _MemoryLoader(frames), _ScheduleStrategy(schedule))
+    result = engine.run_universe(["AAA", "BBB"])
+
+    # AAA: 10 -> 12 获利 20%；BBB: 10 -> 15 获利 50%
+    assert result.symbol_metrics.loc["AAA", "total_return"] == pytest.approx(0.2)
+    assert result.symbol_metrics.loc["BBB", "total_return"] == pytest.approx(0.5)
+    assert result.equity_curve.iloc[-1] == pytest.approx(500_000 * 1.2 + 500_000 * 1.5)
+    assert result.metrics["total_return"] == pytest.approx(0.35)
+    assert result.positions.loc[dates[1], "AAA"] == pytest.approx(50_000)
+    assert result.positions.loc[dates[3], "AAA"] == 0
+    assert result.cash.iloc[-1] == pytest.approx(600_000)
+    assert list(result.fills["side"]) == ["BUY", "SELL", "BUY"]
+
+
+def test_run_universe_honours_date_window() -> None:
+    """回测窗口之外的数据与信号不参与计算。"""
+    frames = {"AAA": _bars([10, 20, 30, 40], start="2020-12-30")}
+    dates = frames["AAA"].index
+    schedule = {"AAA": [(dates[0], "BUY")]}
+    engine = BacktestEngine(_settings(), _MemoryLoader(frames), _ScheduleStrategy(schedule))
+    result = engine.run_universe(["AAA"])
+
+    assert result.equity_curve.index[0] >= pd.Timestamp("2021-01-01")
+    assert result.metrics["trade_count"] == 0
+    assert result.metrics["final_equity"] == pytest.approx(1_000_000)
@@ -0,0 +1,93 @@
+"""列式K线仓库的基础测试。"""
+
+import os
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantify.data import BarStore, BarStoreLoader, LocalCSVLoader
+
+
+def _write_csv(path: Path, periods: int = 30) -> pd.DataFrame:
+    index = pd.bdate_range("2022-01-03", periods=periods, name="date")
+    close = 10 + np.arange(periods, dtype=float)
+    frame = pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.arange(periods, dtype=np.int64) * 100,
+        },
+        index=index,
+    )
+    frame.to_csv(path)
+    return frame
+
+
+def test_loader_converts_once_and_slices(tmp_path: Path) -> None:
+    """首次加载转换 CSV，之后只做内存映射切片。"""
+    expected = _write_csv(tmp_path / "600000.csv")
+    loader = BarStoreLoader(BarStore(tmp_path / "bars"), LocalCSVLoader(tmp_path))
+
+    full = loader.load("600000")
+    pd.testing.assert_frame_equal(full, expected, check_freq=False)
+    assert full["volume"].dtype == np.int64
+
+    with mock.patch("quantify.data.local.pd.read_csv") as read_csv:
+        part = loader.load("600000", start="2022-01-10", end="2022-01-14")
+    read_csv.assert_not_called()
+    assert list(part.index) == list(pd.bdate_range("2022-01-10", "2022-01-14"))
+    assert part["close"].tolist() == expected.loc["2022-01-10":"2022-01-14", "close"].tolist()
+
+
+def test_loader_reconverts_when_csv_changes(tmp_path: Path) -> None:
+    """源 CSV 被修改后重新转换。"""
+    csv_path = tmp_path / "000001.csv"
+    _write_csv(csv_path, periods=10)
+    loader = BarStoreLoader(BarStore(tmp_path / "bars"), LocalCSVLoader(tmp_path))
+    assert len(loader.load("000001")) == 10
+
+    _write_csv(csv_path, periods=12)
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert len(loader.load("000001")) == 12
+
+
+def test_store_reads_empty_range(tmp_path: Path) -> None:
+    """区间内没有数据时返回空表且保留字段。"""
+    store = BarStore(tmp_path)
+    frame = pd.DataFrame({"close": [1.0, 2.0]}, index=pd.to_datetime(["2022-01-03", "2022-01-04"]))
+    store.write("X", frame)
+    empty = store.read("X", start="2023-01-01")
+    assert empty.empty
+    assert list(empty.columns) == ["close"]
+
+
+def test_append_recovers_from_interrupted_write(tmp_path: Path) -> None:
+    """追加前截断上次中断遗留的半截列数据，已有数据文件不被替换。"""
+    store = BarStore(tmp_path)
+    frame = pd.DataFrame(
+        {"close": [1.0, 2.0], "volume": np.array([10, 20], dtype=np.int64)},
+        index=pd.to_datetime(["2022-01-03", "2022-01-04"]),
+    )
+    store.write("X", frame)
+    close_file = store.symbol_dir("X") / "close.bin"
+    inode = close_file.stat().st_ino
+    # 模拟中断：列文件已写入部分字节，但 meta.json 尚未提交
+    with close_file.open("ab") as fh:
+        fh.write(b"\x00" * 5)
+    assert len(store.read("X")) == 2
+
+    store.append("X", pd.DataFrame({"close": [3.0], "volume": [30]}, index=pd.to_datetime(["2022-01-05"])))
+    data = store.read("X")
+    assert data["close"].tolist() == [1.0, 2.0, 3.0]
+    assert data["volume"].tolist() == [10, 20, 30]
+    assert close_file.stat().st_ino == inode
+    assert close_file.stat().st_size == 3 * 8
+
+    with pytest.raises(ValueError):
+        store.append("X", pd.DataFrame({"close": [9.0], "volume": [1]}, index=pd.to_datetime(["2022-01-05"])))
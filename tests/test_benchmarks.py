@@ -0,0 +1,42 @@
+"""基准套件冒烟测试：小规模运行一次，并验证结果对比能识别回退。"""
+
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+BENCH_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+
+
+def _module(name: str):
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", BENCH_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_synthetic_ohlcv_is_reproducible() -> None:
+    suite = _module("suite")
+    first, second = suite.synthetic_ohlcv(500), suite.synthetic_ohlcv(500)
+    pd.testing.assert_frame_equal(first, second)
+    assert (first["high"] >= first[["open", "close"]].max(axis=1)).all()
+    assert (first["low"] <= first[["open", "close"]].min(axis=1)).all()
+    assert suite.parse_sizes("1k,100k,10m,250") == [1_000, 100_000, 10_000_000, 250]
+
+
+def test_suite_results_round_trip_and_compare(tmp_path) -> None:
+    suite, compare = _module("suite"), _module("compare")
+    report = suite.run_suite([300], ["load_csv", "validate", "parse_stockstar"], repeat=1,
+                             workdir=tmp_path, log=lambda line: None)
+    assert [(r["case"], r["bars"]) for r in report["results"]] == [
+        ("load_csv", 300), ("validate", 300), ("parse_stockstar", 300)]
+    path = suite.save(report, tmp_path / "results")
+    assert compare.resolve(str(path)) == path
+
+    slower = compare.load(path)
+    slower["results"][0]["best_s"] *= 1.5
+    rows = {row["case"]: row for row in compare.compare(report, slower, threshold=0.1)}
+    assert rows["load_csv"]["status"] == "regression"
+    assert rows["load_csv"]["change"] == pytest.approx(0.5)
+    assert rows["validate"]["status"] == "same"
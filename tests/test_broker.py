@@ -0,0 +1,141 @@
+"""模拟券商撮合规则与回测引擎接入测试。"""
+
+import pandas as pd
+import pytest
+
+from quantify.backtest import BacktestEngine
+from quantify.execution import PaperBroker
+from quantify.execution.broker import CANCELLED, FILLED, LIMIT, PENDING, REJECTED, STOP
+from tests.conftest import _MemoryLoader, _ScheduleStrategy, _bars, _settings
+
+DAY1 = pd.Timestamp("2024-01-02 10:00")
+DAY2 = pd.Timestamp("2024-01-03 10:00")
+
+
+def _broker(**kwargs) -> PaperBroker:
+    params = dict(cash=100_000, commission_rate=0.001, min_commission=5.0, stamp_duty=0.001)
+    params.update(kwargs)
+    return PaperBroker(**params)
+
+
+def test_market_order_fills_at_open_with_costs() -> None:
+    broker = _broker()
+    order = broker.submit("600000", "BUY", 1050)
+    assert order.quantity == 1000  # 向下取整到整手
+    assert broker.on_bar("600000", DAY1, 10.0, 10.5, 9.8, 10.2) == 1
+    assert order.status == FILLED
+    assert broker.position("600000") == 1000
+    assert broker.cash == pytest.approx(100_000 - 10_000 - 10.0)
+
+    fills = broker.fills_frame()
+    assert list(fills["side"]) == ["BUY"]
+    assert fills.loc[0, "price"] == 10.0 and fills.loc[0, "commission"] == pytest.approx(10.0)
+
+
+def test_t_plus_one_and_stamp_duty() -> None:
+    broker = _broker()
+    broker.submit("600000", "BUY", 500)
+    broker.on_tick("600000", DAY1, 10.0)
+    sell = broker.submit("600000", "SELL", 500)
+    # 当日买入不可卖出，委托继续挂单
+    assert broker.on_tick("600000", DAY1 + pd.Timedelta(hours=1), 11.0) == 0
+    assert sell.status == PENDING and broker.sellable("600000") == 0
+
+    assert broker.on_tick("600000", DAY2, 12.0) == 1
+    assert broker.position("600000") == 0
+    # 卖出 6000：最低佣金 6、印花税 6
+    assert broker.cash == pytest.approx(100_000 - 5_005 + 6_000 - 6.0 - 6.0)
+
+
+def test_limit_and_stop_orders() -> None:
+    broker = _broker(t_plus_one=False)
+    limit = broker.submit("000001", "BUY", 100, LIMIT, limit_price=9.5)
+    stop = broker.submit("000001", "BUY", 100, STOP, stop_price=11.0)
+    broker.on_bar("000001", DAY1, 10.0, 10.5, 9.6, 10.0)
+    assert limit.status == PENDING and stop.status == PENDING
+
+    broker.on_bar("000001", DAY2, 9.4, 11.2, 9.0, 11.0)
+    fills = broker.fills_frame().set_index("order_id")
+    assert fills.loc[limit.order_id, "price"] == 9.4  # 跳空低开，以开盘价成交
+    assert fills.loc[stop.order_id, "price"] == 11.0
+
+    stop_sell = broker.submit("000001", "SELL", 200, STOP, stop_price=10.0)
+    broker.on_bar("000001", DAY2 + pd.Timedelta(days=1), 10.5, 10.6, 9.7, 9.8)
+    assert stop_sell.status == FILLED
+    assert broker.fills_frame()["price"].iloc[-1] == 10.0
+
+
+def test_lot_rules_rejections_and_cancel() -> None:
+    broker = _broker(t_plus_one=False)
+    assert broker.submit("600000", "BUY", 99).status == REJECTED
+    assert broker.submit("600000", "SELL", 100).status == PENDING
+    broker.on_tick("600000", DAY1, 10.0)
+    assert broker.orders[-1].status == REJECTED  # 无持仓不可卖空
+
+    broker.submit("600000", "BUY", 300)
+    broker.on_tick("600000", DAY1, 10.0)
+    assert broker.submit("600000", "SELL", 150).status == REJECTED
+    assert broker.submit("600000", "SELL", 300).status == PENDING  # 全部持仓可含零股
+
+    big = broker.submit("600001", "BUY", 1_000_000, LIMIT, limit_price=1.0)
+    assert broker.cancel(big.order_id) and big.status == CANCELLED
+    assert not broker.cancel(big.order_id)
+    assert broker.submit("600001", "BUY", 100_000).order_id > 0
+    broker.on_tick("600001", DAY1, 10.0)
+    assert broker.orders[-1].status == REJECTED and broker.orders[-1].reason == "资金不足"
+
+
+def test_fill_log_grows() -> None:
+    broker = _broker(cash=1e12, fill_capacity=2, t_plus_one=False)
+    for i in range(50):
+        broker.submit("600000", "BUY" if i % 2 == 0 else "SELL", 100)
+        broker.on_tick("600000", DAY1.value + i, 10.0)
+    assert len(broker.fills) == 50
+    assert list(broker.fills_frame()["side"][:2]) == ["BUY", "SELL"]
+
+
+def test_engine_routes_signals_through_broker() -> None:
+    """信号在当根收盘后下单，下一根开盘成交，净值计入手续费。"""
+    frames = {"AAA": _bars([10, 10, 12, 12, 12]), "BBB": _bars([20, 20, 20, 20, 20])}
+    dates = frames["AAA"].index
+    schedule = {"AAA": [(dates[0], "BUY"), (dates[2], "SELL")]}
+    engine = BacktestEngine(_settings(), _MemoryLoader(frames), _ScheduleStrategy(schedule),
+                            broker_factory=lambda: _broker(cash=200_000))
+    result = engine.run_universe(["AAA", "BBB"])
+
+    fills = result.fills
+    assert list(fills["side"]) == ["BUY", "SELL"]
+    assert list(fills["date"]) == [dates[1], dates[3]]
+    # 子账户 100000，按 10 元含佣金可买 9900 股
+    assert fills.loc[0, "shares"] == 9900
+    assert result.positions.loc[dates[1], "AAA"] == 9900
+    expected = 200_000 + 9900 * 2 - 99.0 - 118.8 - 118.8
+    assert result.equity_curve.iloc[-1] == pytest.approx(expected)
+    assert result.cash.iloc[-1] == pytest.approx(expected)
+    assert result.metrics["commission"] == pytest.approx(99.0 + 118.8)
+    assert result.metrics["tax"] == pytest.approx(118.8)
+    assert result.symbol_metrics.loc["AAA", "trade_count"] == 1
+    assert result.symbol_metrics.loc["BBB", "total_return"] == 0
+
+    # 同一引擎再次回测使用新的券商，结果与第一次相同
+    again = engine.run_universe(["AAA", "BBB"])
+    assert again.metrics["initial_capital"] == 200_000
+    assert again.metrics["total_return"] == pytest.approx(result.metrics["total_return"])
+    assert again.fills.equals(fills)
+    pd.testing.assert_frame_equal(again.positions, result.positions)
+
+
+def test_has_open_orders_tracks_pending_orders() -> None:
+    broker = _broker(t_plus_one=False)
+    assert not broker.has_open_orders("600000")
+    order = broker.submit("600000", "BUY", 100, LIMIT, limit_price=9.0)
+    assert broker.has_open_orders("600000")
+    broker.cancel(order.order_id)
+    assert not broker.has_open_orders("600000")
+    broker.submit("600000", "BUY", 100)
+    broker.on_tick("600000", DAY1, 10.0)
+    assert not broker.has_open_orders("600000")
+    broker.submit("600000", "SELL", 200)
+    broker.on_tick("600000", DAY1, 10.0)
+    # 持仓不足被拒的挂单不再计入
+    assert not broker.has_open_orders("600000") and broker.open_orders("600000") == []
@@ -0,0 +1,77 @@
+"""持久化 TTL 缓存测试。"""
+
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from quantify.utils.cache import DiskCache, trading_day
+
+
+def test_get_set_and_ttl(tmp_path: Path) -> None:
+    """按来源设置过期时间，过期后视为未命中。"""
+    cache = DiskCache(tmp_path / "c.sqlite3", ttl={"quote": 0.05, "analysis": 3600})
+    cache.set("quote", "600000", 10.5, day="2024-01-05")
+    cache.set("analysis", "600000", {"analysis": "股价被低估"}, day="2024-01-05")
+
+    assert cache.get("quote", "600000", day="2024-01-05") == 10.5
+    assert cache.get("analysis", "600000", day="2024-01-06") is None
+    time.sleep(0.06)
+    assert cache.get("quote", "600000", day="2024-01-05") is None
+    assert cache.get("analysis", "600000", day="2024-01-05") == {"analysis": "股价被低估"}
+
+
+def test_get_or_fetch_persists_across_instances(tmp_path: Path) -> None:
+    """新实例可以读到之前写入的值，命中时不再调用 fetch。"""
+    path = tmp_path / "c.sqlite3"
+    calls = []
+    DiskCache(path).get_or_fetch("analysis", "000001", lambda: calls.append(1) or {"v": 1})
+    value = DiskCache(path).get_or_fetch("analysis", "000001", lambda: calls.append(1) or {"v": 2})
+    assert value == {"v": 1}
+    assert len(calls) == 1
+
+
+def test_eviction_keeps_recent_entries(tmp_path: Path) -> None:
+    """超过容量上限时淘汰最久未访问的条目。"""
+    cache = DiskCache(tmp_path / "c.sqlite3", max_entries=10)
+    for i in range(20):
+        cache.set("quote", f"{i:06d}", float(i), day="d")
+    cache.evict()
+    assert len(cache) == 10
+    assert cache.get("quote", "000019", day="d") == 19.0
+    assert cache.get("quote", "000000", day="d") is None
+
+
+def test_concurrent_threads(tmp_path: Path) -> None:
+    """多线程并发读写不报错。"""
+    cache = DiskCache(tmp_path / "c.sqlite3")
+
+    def work(offset: int) -> None:
+        for i in range(50):
+            cache.set("quote", f"{offset}-{i}", i)
+            assert cache.get("quote", f"{offset}-{i}") == i
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 400
+
+
+def test_trading_day_rolls_weekend_back() -> None:
+    assert trading_day(datetime(2024, 1, 6, 10)) == "2024-01-05"
+    assert trading_day(datetime(2024, 1, 7, 10)) == "2024-01-05"
+    assert trading_day(datetime(2024, 1, 8, 10)) == "2024-01-08"
+
+
+def test_close_releases_connections_from_all_threads(tmp_path: Path) -> None:
+    """close 关闭所有线程打开的连接，之后仍可按需重新连接。"""
+    with DiskCache(tmp_path / "c.sqlite3") as cache:
+        worker = threading.Thread(target=cache.set, args=("quote", "600000", 10.5))
+        worker.start()
+        worker.join()
+        assert len(cache._connections) == 2
+    assert cache._connections == []
+    assert cache.get("quote", "600000") == 10.5
+    cache.close()
@@ -0,0 +1,102 @@
+"""交易日历的测试。"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantify.backtest import BacktestEngine
+from quantify.config import Settings
+from quantify.data.calendar import TradingCalendar
+from tests.conftest import _MemoryLoader, _ScheduleStrategy, _settings
+
+HOLIDAYS = ["2021-02-11", "2021-02-12"]
+
+
+@pytest.fixture()
+def calendar() -> TradingCalendar:
+    return TradingCalendar.weekdays("2021-01-04", "2021-03-31", holidays=HOLIDAYS, name="TEST")
+
+
+def test_index_offset_and_distance(calendar) -> None:
+    assert calendar.index("2021-01-04") == 0
+    assert calendar.index(pd.Timestamp("2021-02-10 14:55")) == calendar.index("2021-02-10")
+    with pytest.raises(KeyError):
+        calendar.index("2021-02-11")
+    assert calendar.session(calendar.index("2021-02-11", side="next")) == pd.Timestamp("2021-02-15")
+    assert calendar.session(calendar.index("2021-02-13", side="prev")) == pd.Timestamp("2021-02-10")
+    assert calendar.offset("2021-02-10", 1) == pd.Timestamp("2021-02-15")
+    assert calendar.distance("2021-02-10", "2021-02-15") == 1
+
+    dates = pd.DatetimeIndex(["2021-01-04", "2021-02-10", "2021-03-31"])
+    assert calendar.offset(dates[:2], 2).tolist() == [pd.Timestamp("2021-01-06"), pd.Timestamp("2021-02-16")]
+    with pytest.raises(IndexError):
+        calendar.offset(dates, 2)
+    assert list(calendar.is_session(pd.DatetimeIndex(["2021-02-11", "2021-02-15", "2020-01-01"]))) == [False, True, False]
+
+
+def test_out_of_range_lookups_raise(calendar) -> None:
+    """日历范围之外的日期与序号不会被静默折算成首末交易日。"""
+    with pytest.raises(KeyError):
+        calendar.index("2020-12-25", side="prev")
+    with pytest.raises(KeyError):
+        calendar.index(pd.DatetimeIndex(["2021-01-04", "2020-12-31"]), side="prev")
+    with pytest.raises(KeyError):
+        calendar.index("2021-04-01", side="next")
+    with pytest.raises(KeyError):
+        calendar.offset("2020-12-25", 0)
+    with pytest.raises(KeyError):
+        calendar.distance("2020-06-01", "2021-01-06")
+    with pytest.raises(IndexError):
+        calendar.session(-1)
+    with pytest.raises(IndexError):
+        calendar.session(len(calendar))
+    # grid 把区间截取到日历范围内
+    assert calendar.grid("2020-12-01", "2021-01-05").tolist() == [pd.Timestamp("2021-01-04"), pd.Timestamp("2021-01-05")]
+    assert len(calendar.grid("2021-03-30", "2021-06-01")) == 2
+    assert len(calendar.grid("2020-01-01", "2020-12-31")) == 0
+
+
+def test_file_round_trip_and_fallback(calendar, tmp_path) -> None:
+    settings = Settings(cache_dir=tmp_path)
+    fallback = TradingCalendar.from_settings(settings)
+    assert fallback.is_session("2021-02-11")  # 没有日历文件时为工作日日历
+
+    calendar.save(tmp_path / "calendars" / "cn.txt")
+    loaded = TradingCalendar.from_settings(settings, exchange="SZSE")
+    assert loaded.sessions.equals(calendar.sessions)
+    assert not loaded.is_session("2021-02-11")
+
+
+def test_reindex_marks_suspended_days(calendar) -> None:
+    frame = pd.DataFrame(
+        {"close": [10.0, 11.0, 12.0], "volume": [100, 200, 300]},
+        index=pd.DatetimeIndex(["2021-02-09", "2021-02-15", "2021-02-18"]),
+    )
+    aligned = calendar.reindex(frame, start="2021-02-08")
+    assert aligned.index.tolist() == list(pd.DatetimeIndex(
+        ["2021-02-08", "2021-02-09", "2021-02-10", "2021-02-15", "2021-02-16", "2021-02-17", "2021-02-18"]))
+    np.testing.assert_array_equal(aligned["close"], [np.nan, 10, 10, 11, 11, 11, 12])
+    np.testing.assert_array_equal(aligned["volume"], [np.nan, 100, 0, 200, 0, 0, 300])
+    assert aligned["suspended"].tolist() == [False, False, True, False, True, True, False]
+
+
+def test_engine_aligns_panel_on_calendar(calendar) -> None:
+    index = pd.DatetimeIndex(["2021-02-08", "2021-02-09", "2021-02-15", "2021-02-16"])
+    frames = {"AAA": pd.DataFrame({"close": [10.0, 11.0, 12.0, 13.0]}, index=index)}
+    schedule = {"AAA": [(index[0], "BUY")]}
+    result = BacktestEngine(_settings(), _MemoryLoader(frames), _ScheduleStrategy(schedule),
+                            calendar=calendar).run_universe(["AAA"])
+    assert result.equity_curve.index.tolist() == list(calendar.grid("2021-02-08", "2021-02-16"))
+    assert result.equity_curve.loc["2021-02-10"] == result.equity_curve.loc["2021-02-09"]
+
+
+def test_session_hours() -> None:
+    sse = TradingCalendar.weekdays("2024-01-01", "2024-01-31", name="SSE")
+    hkex = TradingCalendar.weekdays("2024-01-01", "2024-01-31", name="HKEX")
+
+    assert sse.is_open("2024-01-05 10:00") and not sse.is_open("2024-01-05 11:30")
+    assert hkex.is_open("2024-01-05 11:30") and not hkex.is_open("2024-01-06 10:00")
+    assert sse.next_open("2024-01-05 10:00") == pd.Timestamp("2024-01-05 10:00")
+    assert sse.next_open("2024-01-05 08:00") == pd.Timestamp("2024-01-05 09:30")
+    assert sse.next_open("2024-01-05 12:00") == pd.Timestamp("2024-01-05 13:00")
+    assert sse.next_open("2024-01-05 15:00") == pd.Timestamp("2024-01-08 09:30")
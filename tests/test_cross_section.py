@@ -0,0 +1,130 @@
+"""截面因子、面板与截面组合回测的测试。"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantify.backtest import BacktestEngine, CrossSectionalEngine
+from quantify.data.panel import Panel
+from quantify.features.factors import momentum, rank, top_n, valuation_discount, volatility, zscore
+from quantify.strategies import CrossSectionalStrategy, FactorStrategy
+from tests.conftest import _bars, _MemoryLoader, _settings
+
+
+def _random(shape, seed=0, missing=0.2) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=shape).astype(np.float32)
+    values[rng.random(shape) < missing] = np.nan
+    return values
+
+
+def test_cross_sectional_ops_match_pandas() -> None:
+    values = _random((40, 25))
+    frame = pd.DataFrame(values)
+    np.testing.assert_allclose(rank(values), frame.rank(axis=1, pct=True).to_numpy(), atol=1e-6)
+    expected = frame.sub(frame.mean(axis=1), axis=0).div(frame.std(axis=1), axis=0).to_numpy()
+    np.testing.assert_allclose(zscore(values), expected, atol=1e-5)
+
+    mask = top_n(values, 5)
+    assert (mask.sum(axis=1) == 5).all()
+    # 选中的最小值不低于未选中的最大值，且不会选中 NaN
+    picked = np.where(mask, values, np.inf).min(axis=1)
+    rest = np.where(mask | np.isnan(values), -np.inf, values).max(axis=1)
+    assert (picked >= rest).all()
+    assert not (mask & np.isnan(values)).any()
+
+
+def test_time_series_factors_match_pandas() -> None:
+    rng = np.random.default_rng(1)
+    close = (10 * np.exp(np.cumsum(rng.normal(0, 0.02, (120, 6)), axis=0))).astype(np.float32)
+    close[50, 2] = np.nan
+    frame = pd.DataFrame(close, dtype=np.float64)
+
+    np.testing.assert_allclose(momentum(close, 20, 5), (frame.shift(5) / frame.shift(25) - 1).to_numpy(),
+                               rtol=1e-5, atol=1e-6)
+    expected = np.log(frame).diff().rolling(20).std().to_numpy()
+    np.testing.assert_allclose(volatility(close, 20, block=4), expected, rtol=1e-4)
+    assert valuation_discount(np.float32(8), np.float32(8), np.float32(12)) == pytest.approx(0.2)
+
+
+def test_panel_from_frames_aligns_dates_and_checks_budget() -> None:
+    frames = {"AAA": _bars([1, 2, 3]), "BBB": _bars([5, 6], start="2021-01-05"), "CCC": _bars([])}
+    panel = Panel.from_frames(frames, fields=("close", "volume"))
+
+    assert list(panel.symbols) == ["AAA", "BBB"]
+    assert panel.shape == (3, 2)
+    assert panel["close"].dtype == np.float32
+    np.testing.assert_array_equal(panel["close"][:, 1], [np.nan, 5, 6])
+    with pytest.raises(MemoryError):
+        Panel.from_frames(frames, max_bytes=16)
+
+
+class _FixedScores(CrossSectionalStrategy):
+    def __init__(self, scores: np.ndarray, **kwargs):
+        super().__init__(**kwargs)
+        self._scores = scores
+
+    def score(self, panel: Panel) -> np.ndarray:
+        return self._scores
+
+
+def test_engine_rebalances_into_top_ranked_symbols() -> None:
+    frames = {
+        "AAA": _bars([10, 11, 11, 22]),
+        "BBB": _bars([10, 10, 20, 20]),
+        "CCC": _bars([10, 5, 5, 5]),
+    }
+    panel = Panel.from_frames(frames)
+    scores = np.array([[3, 2, 1], [1, 3, 2], [3, 1, 2], [3, 1, 2]], dtype=np.float32)
+    settings = _settings()
+    settings.cross_section.cost_rate = 0.0
+    result = CrossSectionalEngine(settings, _FixedScores(scores, top_n=1)).run(panel)
+
+    # 第 0 日持有 AAA（+10%），第 1 日换到 BBB（+100%），第 2 日换回 AAA（+100%）
+    np.testing.assert_allclose(result.returns.to_numpy(), [0, 0.1, 1.0, 1.0], rtol=1e-6)
+    assert result.metrics["final_equity"] == pytest.approx(1_000_000 * 1.1 * 2 * 2, rel=1e-6)
+    assert list(result.holdings(panel.dates[1]).index) == ["BBB"]
+    np.testing.assert_allclose(result.turnover.to_numpy(), [1, 2, 2, 0])
+
+    settings.cross_section.cost_rate = 0.001
+    costly = CrossSectionalEngine(settings, _FixedScores(scores, top_n=1)).run(panel)
+    assert costly.returns.iloc[1] == pytest.approx(0.1 - 0.002, rel=1e-5)
+
+
+def test_suspended_holding_keeps_weight() -> None:
+    frames = {"AAA": _bars([10, 11, 12]), "BBB": _bars([10, 10, 10])}
+    frames["AAA"] = frames["AAA"].drop(frames["AAA"].index[1])
+    panel = Panel.from_frames(frames)
+    scores = np.array([[2, 1], [1, 2], [1, 2]], dtype=np.float32)
+    settings = _settings()
+    settings.cross_section.cost_rate = 0.0
+    result = CrossSectionalEngine(settings, _FixedScores(scores, top_n=1)).run(panel)
+
+    # AAA 第 1 日停牌无法卖出，复牌日按停牌前收盘价计算收益
+    np.testing.assert_array_equal(result.weights[1], [1, 0])
+    np.testing.assert_allclose(result.returns.to_numpy(), [0, 0, 0.2], rtol=1e-6)
+
+
+def test_engine_enforces_memory_budget() -> None:
+    panel = Panel.from_frames({"AAA": _bars([1, 2, 3])})
+    settings = _settings()
+    settings.cross_section.max_memory_mb = 1e-6
+    with pytest.raises(MemoryError):
+        CrossSectionalEngine(settings, FactorStrategy({"momentum": 1.0})).run(panel)
+
+
+def test_prepared_strategy_drives_per_symbol_engine() -> None:
+    frames = {"AAA": _bars([10, 11, 12, 13]), "BBB": _bars([10, 10, 10, 10])}
+    panel = Panel.from_frames(frames)
+    strategy = _FixedScores(np.array([[2, 1], [2, 1], [1, 2], [1, 2]], dtype=np.float32), top_n=1)
+    strategy.prepare(panel)
+    result = BacktestEngine(_settings(), _MemoryLoader(frames), strategy).run_universe(["AAA", "BBB"])
+
+    signals = result.signals.to_frame()
+    assert list(zip(signals["symbol"], signals["action"])) == [("AAA", "BUY"), ("AAA", "SELL"), ("BBB", "BUY")]
+    assert result.symbol_metrics.loc["AAA", "total_return"] == pytest.approx(0.2)
+
+
+def test_factor_strategy_rejects_unknown_factor() -> None:
+    with pytest.raises(KeyError):
+        FactorStrategy({"alpha": 1.0})
@@ -0,0 +1,97 @@
+"""向量化指标与指标特征仓库测试。"""
+
+import numpy as np
+import pandas as pd
+import pytest
+import talib as ta
+
+from quantify.features import FeatureStore, INDICATORS, atr, rsi, sma
+
+
+def _bars(seed: int, n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame(
+        {"high": close * (1 + rng.random(n) * 0.02), "low": close * (1 - rng.random(n) * 0.02), "close": close},
+        index=pd.bdate_range("2021-01-04", periods=n),
+    )
+
+
+@pytest.mark.parametrize("period", [2, 5, 14])
+def test_indicators_match_talib(period) -> None:
+    frame = _bars(0, 200)
+    close, high, low = frame["close"].to_numpy(), frame["high"].to_numpy(), frame["low"].to_numpy()
+    np.testing.assert_allclose(sma(close, period), ta.SMA(close, period), rtol=1e-10, equal_nan=True)
+    np.testing.assert_allclose(rsi(close, period), ta.RSI(close, period), rtol=1e-10, equal_nan=True)
+    np.testing.assert_allclose(atr(high, low, close, period), ta.ATR(high, low, close, period),
+                               rtol=1e-10, equal_nan=True)
+
+
+def test_panel_with_leading_nan_matches_per_column() -> None:
+    """右对齐的二维面板逐列结果与单独计算一致。"""
+    short, long_ = _bars(1, 40)["close"].to_numpy(), _bars(2, 120)["close"].to_numpy()
+    panel = np.full((120, 2), np.nan)
+    panel[:, 0] = long_
+    panel[80:, 1] = short
+    out = rsi(panel, 14)
+    np.testing.assert_allclose(out[80:, 1], ta.RSI(short, 14), rtol=1e-10, equal_nan=True)
+    np.testing.assert_allclose(out[:, 0], ta.RSI(long_, 14), rtol=1e-10, equal_nan=True)
+
+
+def test_extend_continues_from_state() -> None:
+    close = _bars(3, 150)["close"].to_numpy()
+    spec = INDICATORS["rsi"]
+    head, state = spec.compute(close[:100], period=14)
+    tail, _ = spec.extend(state, close[100:], period=14)
+    np.testing.assert_allclose(np.concatenate([head[:, 0], tail[:, 0]]), ta.RSI(close, 14), rtol=1e-10, equal_nan=True)
+
+
+def test_store_memoizes_and_extends_on_append() -> None:
+    store = FeatureStore()
+    frame = _bars(4, 300)
+    data = {"A": frame.iloc[:250], "B": _bars(5, 80)}
+
+    first = store.compute(data, "atr", period=14)
+    assert store.misses == 2
+    again = store.compute(data, "atr", period=14)
+    assert store.hits == 2 and again["A"] is first["A"]
+
+    extended = store.get("A", frame, "atr", period=14)
+    assert store.extensions == 1
+    np.testing.assert_allclose(extended, ta.ATR(frame["high"], frame["low"], frame["close"], 14),
+                               rtol=1e-10, equal_nan=True)
+    # 旧版本已失效，每个序列只保留最新版本
+    assert len(store) == 2
+
+    # 历史数据被改写（起点不同）时重新计算
+    store.get("A", frame.iloc[10:], "atr", period=14)
+    assert store.misses == 3
+
+
+def test_store_detects_revised_data() -> None:
+    """同样的日期但价格被改写（如复权方式不同）时不命中旧条目，也不在旧状态上追加。"""
+    store = FeatureStore()
+    frame = _bars(7, 60)
+    store.get("X", frame.iloc[:40], "sma", period=5)
+
+    revised = frame.copy()
+    revised["close"] /= 2
+    halved = store.get("X", revised.iloc[:40], "sma", period=5)
+    assert store.hits == 0 and store.misses == 2
+    np.testing.assert_allclose(halved, ta.SMA(revised["close"].to_numpy()[:40], 5), equal_nan=True)
+
+    extended = store.get("X", frame, "sma", period=5)
+    assert store.extensions == 0 and store.misses == 3
+    np.testing.assert_allclose(extended, ta.SMA(frame["close"].to_numpy(), 5), equal_nan=True)
+
+
+def test_store_lru_spills_to_disk(tmp_path) -> None:
+    frame = _bars(6, 1000)
+    store = FeatureStore(max_bytes=20_000, spill_dir=tmp_path)
+    values = {p: store.get("A", frame, "sma", period=p).copy() for p in (5, 10, 20)}
+    assert store.nbytes <= 20_000
+    assert list(tmp_path.glob("*.npz"))
+
+    hits = store.hits
+    np.testing.assert_array_equal(store.get("A", frame, "sma", period=5), values[5])
+    assert store.hits == hits + 1
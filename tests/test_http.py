@@ -0,0 +1,201 @@
+"""HTTP 重试与熔断测试，使用按脚本注入故障的本地桩服务器。"""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import pytest
+import requests
+
+from quantify.utils.http import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitOpenError,
+    FetchPolicy,
+    HTTPStatusError,
+    RetryPolicy,
+    http_get,
+)
+
+
+class _FaultHandler(BaseHTTPRequestHandler):
+    """按路径预设的故障序列依次响应：状态码、"slow"（超时）或 "drop"（断开连接），用完后返回 200。"""
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server 约定
+        server = self.server
+        with server.lock:
+            server.hits[self.path] += 1
+            faults = server.faults.get(self.path, [])
+            fault = faults.pop(0) if faults else 200
+        if fault == "slow":
+            time.sleep(0.5)
+            fault = 200
+        if fault == "drop":
+            self.close_connection = True
+            self.connection.close()
+            return
+        body = b"ok" if fault == 200 else b"fail"
+        try:
+            self.send_response(fault)
+            if fault == 429:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端已超时断开
+            pass
+
+    def log_message(self, format, *args) -> None:  # 静默日志
+        pass
+
+
+@pytest.fixture
+def fault_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FaultHandler)
+    server.lock = threading.Lock()
+    server.hits = defaultdict(int)
+    server.faults = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _policy(**kwargs) -> FetchPolicy:
+    return FetchPolicy(RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.02), **kwargs)
+
+
+def test_transient_failures_are_retried(fault_server) -> None:
+    """5xx、429、超时与断开连接都按退避重试，最终成功，并按失败类型计数。"""
+    fault_server.faults = {"/a": [503, 429], "/b": ["slow"], "/c": ["drop"]}
+    policy = _policy()
+    for path in ("/a", "/b", "/c"):
+        assert http_get(fault_server.url + path, timeout=0.2, policy=policy).text == "ok"
+
+    assert dict(fault_server.hits) == {"/a": 3, "/b": 2, "/c": 2}
+    assert policy.error_totals() == {"http_5xx": 1, "http_429": 1, "timeout": 1, "connection": 1}
+    assert policy.breaker("127.0.0.1").state == CLOSED
+
+
+def test_client_errors_are_not_retried(fault_server) -> None:
+    fault_server.faults = {"/missing": [404]}
+    policy = _policy()
+    with pytest.raises(HTTPStatusError) as info:
+        http_get(fault_server.url + "/missing", policy=policy)
+    assert info.value.status == 404
+    assert fault_server.hits["/missing"] == 1
+    assert policy.errors == {"127.0.0.1": {"http_4xx": 1}}
+
+
+def test_circuit_opens_and_recovers(fault_server) -> None:
+    """连续失败达到阈值后快速失败，不再访问上游；冷却后放行一个探测请求。"""
+    now = [0.0]
+    policy = _policy(failure_threshold=3, reset_timeout=10.0, clock=lambda: now[0])
+    fault_server.faults = {"/down": [500] * 3}
+    with pytest.raises(HTTPStatusError):
+        http_get(fault_server.url + "/down", policy=policy)
+    assert policy.breaker("127.0.0.1").state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        http_get(fault_server.url + "/other", policy=policy)
+    assert fault_server.hits["/other"] == 0
+    assert policy.error_totals()["circuit_open"] == 1
+
+    now[0] = 10.0
+    assert policy.breaker("127.0.0.1").state == HALF_OPEN
+    assert http_get(fault_server.url + "/down", policy=policy).text == "ok"
+    assert policy.breaker("127.0.0.1").state == CLOSED
+
+
+def test_async_call_retries(fault_server) -> None:
+    fault_server.faults = {"/x": [502, 502]}
+    policy = _policy()
+
+    async def fetch_text() -> str:
+        async with aiohttp.ClientSession() as session:
+            async def once() -> str:
+                async with session.get(fault_server.url + "/x") as response:
+                    if response.status != 200:
+                        raise HTTPStatusError(response.status, fault_server.url)
+                    return await response.text()
+
+            return await policy.acall(fault_server.url + "/x", once)
+
+    assert asyncio.run(fetch_text()) == "ok"
+    assert fault_server.hits["/x"] == 3
+    assert policy.error_totals() == {"http_5xx": 2}
+
+
+def test_requests_exceptions_propagate_after_retries(fault_server) -> None:
+    fault_server.faults = {"/slow": ["slow"] * 3}
+    with pytest.raises(requests.Timeout):
+        http_get(fault_server.url + "/slow", timeout=0.1, policy=_policy())
+    assert fault_server.hits["/slow"] == 3
+
+
+def test_cancelled_probe_reopens_circuit() -> None:
+    """半开探测被取消时重新进入冷却，冷却结束后仍会放行新的探测。"""
+    now = [0.0]
+    policy = _policy(failure_threshold=1, reset_timeout=10.0, clock=lambda: now[0])
+    url = "http://probe.invalid/x"
+    policy.breaker("probe.invalid").record_failure()
+    now[0] = 10.0
+
+    async def hang() -> str:
+        await asyncio.sleep(10)
+        return "ok"
+
+    async def cancel_probe() -> None:
+        task = asyncio.create_task(policy.acall(url, hang))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_probe())
+    breaker = policy.breaker("probe.invalid")
+    assert breaker.state == OPEN
+    now[0] = 20.0
+
+    async def ok() -> str:
+        return "ok"
+
+    assert asyncio.run(policy.acall(url, ok)) == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_unrelated_errors_leave_breaker_state() -> None:
+    """与主机健康无关的错误不关闭熔断，也不清零失败计数；只有 4xx 响应算作主机正常。"""
+    now = [0.0]
+    policy = _policy(failure_threshold=2, reset_timeout=10.0, clock=lambda: now[0])
+    url = "http://parse.invalid/x"
+    breaker = policy.breaker("parse.invalid")
+
+    def broken() -> str:
+        raise ValueError("bad payload")
+
+    breaker.record_failure()
+    with pytest.raises(ValueError):
+        policy.call(url, broken)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    now[0] = 10.0
+    with pytest.raises(ValueError):
+        policy.call(url, broken)
+    assert breaker.state == OPEN
+
+    def missing() -> str:
+        raise HTTPStatusError(404, url)
+
+    now[0] = 20.0
+    with pytest.raises(HTTPStatusError):
+        policy.call(url, missing)
+    assert breaker.state == CLOSED
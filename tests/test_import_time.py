@@ -0,0 +1,50 @@
+"""导入开销预算：``import quantify`` 不应加载重型依赖，累计耗时不超过预算。"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+BENCH_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+
+# 当前约 1 ms，预算留出足够余量；一旦 pandas / pydantic 被提前导入会超出数百毫秒
+BUDGET_MS = 50.0
+
+
+@pytest.fixture(scope="module")
+def importtime():
+    spec = importlib.util.spec_from_file_location("bench_importtime", BENCH_DIR / "importtime.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_package_import_is_within_budget(importtime) -> None:
+    rows = importtime.best_of("import quantify", "quantify", repeat=3)
+    total_ms = importtime.total_us(rows, "quantify") / 1000
+    print(f"import quantify: {total_ms:.1f} ms")
+    assert importtime.heavy_imports(rows) == []
+    assert total_ms < BUDGET_MS
+
+
+def test_subpackages_defer_heavy_dependencies(importtime) -> None:
+    statement = "import quantify.backtest, quantify.data, quantify.execution, quantify.features, " \
+                "quantify.strategies, quantify.utils"
+    assert importtime.heavy_imports(importtime.measure(statement)) == []
+
+    # 估值解析只需要 pandas，不应连带导入 HTTP 客户端
+    rows = importtime.measure("import quantify.features.A_stock")
+    assert not {"requests", "aiohttp", "akshare"} & set(importtime.heavy_imports(rows))
+
+
+def test_lazy_attributes_resolve() -> None:
+    import quantify
+    from quantify.backtest.engine import BacktestEngine
+    from quantify.config.settings import Settings
+
+    assert quantify.Settings is Settings
+    assert quantify.BacktestEngine is BacktestEngine
+    assert "strategies" in dir(quantify)
+    assert quantify.strategies.SignalFrame.__name__ == "SignalFrame"
+    with pytest.raises(AttributeError):
+        quantify.missing  # noqa: B018
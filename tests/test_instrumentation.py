@@ -0,0 +1,79 @@
+"""埋点模块测试。"""
+
+import asyncio
+import io
+import json
+import pstats
+import time
+
+import pytest
+
+from quantify.utils import instrumentation as inst
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    was_enabled = inst.is_enabled()
+    inst.reset()
+    yield
+    inst.reset()
+    (inst.enable if was_enabled else inst.disable)()
+
+
+@inst.timed("test.sleep")
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@inst.timed("test.async")
+async def _async_sleep(seconds: float) -> float:
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+def test_disabled_records_nothing() -> None:
+    inst.disable()
+    assert _sleep(0) == 0
+    with inst.timed("test.block"):
+        pass
+    inst.count("test.items", 5)
+    assert inst.summary()["stages"] == {} and inst.summary()["counters"] == {}
+
+
+def test_percentiles_and_counters() -> None:
+    inst.enable()
+    for _ in range(20):
+        _sleep(0.001)
+    assert asyncio.run(_async_sleep(0.002)) == 0.002
+    with inst.timed("test.block"):
+        time.sleep(0.001)
+    inst.count("test.items", 3)
+    inst.count("test.items")
+
+    data = inst.summary()
+    stage = data["stages"]["test.sleep"]
+    assert stage["calls"] == 20
+    assert 1.0 <= stage["p50_ms"] <= stage["p95_ms"] <= stage["p99_ms"] <= stage["max_ms"]
+    assert data["stages"]["test.async"]["calls"] == 1
+    assert data["stages"]["test.block"]["p50_ms"] >= 1.0
+    assert data["counters"] == {"test.items": 4}
+    assert "test.sleep" in inst.format_report(data)
+
+
+def test_percentile_interpolation() -> None:
+    assert inst._percentile([10, 20, 30, 40, 50], 0.5) == 30
+    assert inst._percentile([10, 20], 0.95) == pytest.approx(19.5)
+
+
+def test_instrumented_run_dumps_json_and_profile(tmp_path) -> None:
+    inst.disable()
+    stream = io.StringIO()
+    json_path, profile_path = tmp_path / "timing.json", tmp_path / "run.prof"
+    with inst.InstrumentedRun(json_path=json_path, profile_path=profile_path, stream=stream):
+        _sleep(0.001)
+
+    assert not inst.is_enabled()
+    assert json.loads(json_path.read_text(encoding="utf-8"))["stages"]["test.sleep"]["calls"] == 1
+    assert any("_sleep" in func for _, _, func in pstats.Stats(str(profile_path)).stats)
+    assert "test.sleep" in stream.getvalue()
@@ -0,0 +1,194 @@
+"""盘中实时监控测试，使用内存中的行情与估值桩。"""
+
+import asyncio
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantify.data.calendar import TradingCalendar
+from quantify.features.monitor import LiveMonitor, ScannerSource
+from tests.conftest import _scanner
+
+UNDERVALUED = {"stock_text": "测试", "analysis": "股价被低估", "relative_range": "10.00-20.00"}
+FAIR = {"stock_text": "测试", "analysis": "股价合理", "relative_range": "10.00-20.00"}
+
+
+class _StubSource:
+    """可修改价格的本地行情桩，记录每个代码的估值抓取次数。"""
+
+    def __init__(self, prices: Dict[str, float], analyses: Dict[str, dict]):
+        self.prices = dict(prices)
+        self.analyses = analyses
+        self.analysis_calls: List[str] = []
+
+    async def quotes(self, codes) -> pd.DataFrame:
+        codes = [code for code in codes if code in self.prices]
+        return pd.DataFrame({"price": [self.prices[c] for c in codes]}, index=pd.Index(codes, name="code"))
+
+    async def analysis(self, code: str) -> dict:
+        self.analysis_calls.append(code)
+        await asyncio.sleep(0)
+        if code not in self.analyses:
+            raise ValueError("no analysis")
+        return self.analyses[code]
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_alerts_on_entry_and_fetches_analysis_once_per_day() -> None:
+    source = _StubSource({"600000": 18.0, "600001": 12.0}, {"600000": UNDERVALUED, "600001": FAIR})
+    alerts = []
+    monitor = LiveMonitor(["600000", "600001"], source, on_alert=alerts.append)
+    day = pd.Timestamp("2024-01-05 10:00")
+
+    async def session():
+        await monitor.tick(day)
+        await monitor.drain()
+        assert alerts == []  # 18 在区间后半段
+        source.prices["600000"] = 14.0
+        first = await monitor.tick(day + pd.Timedelta(seconds=5))
+        second = await monitor.tick(day + pd.Timedelta(seconds=10))
+        source.prices["600000"] = 13.5
+        third = await monitor.tick(day + pd.Timedelta(seconds=15))
+        return first, second, third
+
+    first, second, third = _run(session())
+    assert [a.code for a in first] == ["600000"]
+    assert first[0].discount == pytest.approx(1 / 15)
+    # 仍满足条件时不重复提醒
+    assert second == [] and third == []
+    assert alerts == first
+    assert sorted(source.analysis_calls) == ["600000", "600001"]
+
+    snapshot = monitor.snapshot()
+    assert snapshot.loc["600000", "price"] == 13.5
+    assert bool(snapshot.loc["600000", "alerting"])
+    assert not snapshot.loc["600001", "undervalued"]
+
+
+def test_analysis_arrival_triggers_alert_without_new_tick() -> None:
+    source = _StubSource({"600000": 11.0}, {"600000": UNDERVALUED})
+    alerts = []
+    monitor = LiveMonitor(["600000"], source, on_alert=alerts.append)
+
+    async def session():
+        tick_alerts = await monitor.tick(pd.Timestamp("2024-01-05 10:00"))
+        await monitor.drain()
+        return tick_alerts
+
+    assert _run(session()) == []
+    assert [a.code for a in alerts] == ["600000"]
+
+
+def test_new_day_refetches_and_failures_retry() -> None:
+    source = _StubSource({"600000": 11.0, "600002": 11.0}, {"600000": UNDERVALUED})
+    monitor = LiveMonitor(["600000", "600002"], source, on_alert=None)
+
+    async def session():
+        await monitor.tick(pd.Timestamp("2024-01-05 10:00"))
+        await monitor.drain()
+        # 价格未变化：不重新抓取，也不重试失败的标的
+        await monitor.tick(pd.Timestamp("2024-01-05 10:01"))
+        await monitor.drain()
+        assert sorted(source.analysis_calls) == ["600000", "600002"]
+        source.prices["600002"] = 11.5
+        await monitor.tick(pd.Timestamp("2024-01-05 10:02"))
+        await monitor.drain()
+        source.prices["600000"] = 11.1
+        await monitor.tick(pd.Timestamp("2024-01-08 10:00"))
+        await monitor.drain()
+
+    _run(session())
+    # 新交易日所有标的都重新抓取一次
+    assert source.analysis_calls.count("600002") == 3
+    assert source.analysis_calls.count("600000") == 2
+    assert [a.time.day for a in monitor.alerts] == [8]
+
+
+def test_new_day_reanalyses_unchanged_prices() -> None:
+    source = _StubSource({"600000": 11.0}, {"600000": UNDERVALUED})
+    alerts = []
+    monitor = LiveMonitor(["600000"], source, on_alert=alerts.append)
+
+    async def session():
+        await monitor.tick(pd.Timestamp("2024-01-05 14:59"))
+        await monitor.drain()
+        await monitor.tick(pd.Timestamp("2024-01-08 09:30"))
+        await monitor.drain()
+
+    _run(session())
+    assert source.analysis_calls == ["600000", "600000"]
+    assert bool(monitor.analysed[0]) and bool(monitor.hit[0])
+    assert [a.time.day for a in alerts] == [5, 8]
+
+
+def test_run_waits_for_session_and_stops_after_max_ticks() -> None:
+    calendar = TradingCalendar.weekdays("2024-01-01", "2024-01-31", name="SSE")
+    times = iter([pd.Timestamp("2024-01-05 12:00"), pd.Timestamp("2024-01-05 13:00"), pd.Timestamp("2024-01-05 13:01")])
+    source = _StubSource({"600000": 11.0}, {})
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monitor = LiveMonitor(["600000"], source, interval=0.0, calendar=calendar, on_alert=None,
+                          clock=lambda: next(times), sleep=fake_sleep)
+    _run(monitor.run(max_ticks=2))
+    # 午间休市，等待到 13:00 开盘后刷新两次
+    assert sleeps[0] == 3600
+    assert monitor.ticks == 2
+
+
+def test_scanner_source_against_stub_server(stub_server) -> None:
+    source = ScannerSource(_scanner(stub_server))
+    monitor = LiveMonitor(["600000", "600001"], source, on_alert=None)
+
+    async def session():
+        async with source:
+            await monitor.tick(pd.Timestamp("2024-01-05 10:00"))
+            await monitor.drain()
+
+    _run(session())
+    np.testing.assert_allclose(monitor.price, [12.34, 12.34])
+    np.testing.assert_allclose(monitor.lower, [93.16, 93.16])
+    assert monitor.analysed.all() and not monitor.undervalued.any()
+
+
+def test_stale_failure_keeps_new_day_request_pending() -> None:
+    """前一交易日的抓取在换日后失败，不应清除新交易日同一标的的待抓取标记。"""
+    stale, fresh = asyncio.Event(), asyncio.Event()
+
+    class _SlowFailing(_StubSource):
+        async def analysis(self, code: str) -> dict:
+            self.analysis_calls.append(code)
+            if len(self.analysis_calls) == 1:
+                await stale.wait()
+                raise ValueError("stale failure")
+            await fresh.wait()
+            return UNDERVALUED
+
+    source = _SlowFailing({"600000": 11.0}, {})
+    monitor = LiveMonitor(["600000"], source, on_alert=None)
+
+    async def session():
+        await monitor.tick(pd.Timestamp("2024-01-05 10:00"))
+        await asyncio.sleep(0)
+        source.prices["600000"] = 11.1
+        await monitor.tick(pd.Timestamp("2024-01-08 10:00"))
+        await asyncio.sleep(0)
+        stale.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # 旧请求已失败，新请求仍在进行，价格再次变化时不得重复发起
+        source.prices["600000"] = 11.2
+        await monitor.tick(pd.Timestamp("2024-01-08 10:01"))
+        fresh.set()
+        await monitor.drain()
+
+    _run(session())
+    assert source.analysis_calls == ["600000", "600000"]
+    assert monitor.analysed.all()
@@ -0,0 +1,98 @@
+"""StrategyOne 参数优化器测试"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from strategies.optimizer import IndicatorPanel, ParameterSweep, _symbol_metrics
+from strategies.strategy_one import StrategyOne
+
+
+def _bars(seed: int, n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    index = pd.bdate_range('2020-01-01', periods=n)
+    return pd.DataFrame({'open': close, 'high': close + spread, 'low': close - spread,
+                         'close': close, 'volume': 1e6}, index=index)
+
+
+GRID = {'short_window': [3, 5, 8], 'long_window': [5, 20, 30], 'atr_multiplier': [1.5, 2.0]}
+
+
+@pytest.fixture
+def data():
+    return {'A': _bars(1), 'B': _bars(2, 250), 'C': _bars(3, 15)}
+
+
+def test_indicator_panel_computes_each_window_once(data) -> None:
+    """不同组合共用同一窗口的指标，面板只保存一份"""
+    combos = ParameterSweep(data, GRID).grid_combinations()
+    panel = IndicatorPanel.build(data, combos)
+    sma_keys = sorted(k for k in panel.arrays if k.startswith('sma_'))
+    assert sma_keys == ['sma_20', 'sma_3', 'sma_30', 'sma_5', 'sma_8']
+    assert list(panel.offsets) == [0, 300, 550, 565]
+
+
+def test_sweep_matches_strategy_one(data) -> None:
+    """优化器对每组参数的评估结果与直接运行 StrategyOne 一致"""
+    ranked = ParameterSweep(data, GRID, max_workers=1).run()
+    assert len(ranked) == 3 * 2 * 2 + 2  # short < long 的组合
+    assert list(ranked['rank']) == list(range(1, len(ranked) + 1))
+    assert ranked['sharpe'].is_monotonic_decreasing
+
+    row = ranked.to_dict('records')[len(ranked) // 2]
+    params = {k: row[k] for k in ParameterSweep.defaults()}
+    expected = []
+    for frame in data.values():
+        signals = StrategyOne(params).generate_signals(frame).signals.to_numpy()
+        expected.append(_symbol_metrics(frame['close'].to_numpy(), signals))
+    assert row['total_return'] == pytest.approx(np.mean([e[0] for e in expected]))
+    assert row['sharpe'] == pytest.approx(np.mean([e[1] for e in expected]))
+    assert row['trades'] == sum(e[3] for e in expected)
+
+
+def test_process_pool_matches_inline(data) -> None:
+    """进程池 + 共享内存与单进程计算结果一致"""
+    sweep = ParameterSweep(data, GRID, metric='total_return', chunk_size=3)
+    inline = ParameterSweep(data, GRID, metric='total_return', max_workers=1).run()
+    pooled = ParameterSweep(data, GRID, metric='total_return', max_workers=2, chunk_size=3).run()
+    pd.testing.assert_frame_equal(inline, pooled)
+    assert sweep.rank(inline)['total_return'].is_monotonic_decreasing
+
+
+def test_random_search_and_validation(data) -> None:
+    sweep = ParameterSweep(data, GRID, metric='max_drawdown', max_workers=1)
+    first = sweep.random_combinations(5, seed=7)
+    assert first == sweep.random_combinations(5, seed=7)
+    assert len(first) == 5
+    assert all(c['short_window'] < c['long_window'] for c in first)
+    ranked = sweep.run(n_iter=5, seed=7)
+    assert len(ranked) == 5
+    assert ranked['max_drawdown'].is_monotonic_increasing
+
+    with pytest.raises(ValueError):
+        ParameterSweep(data, {'window': [1]})
+
+
+def test_index_alignment_matches_strategy_one(data) -> None:
+    """指数与标的日期不一致时，优化器与 StrategyOne 使用相同的对齐规则"""
+    rng = np.random.default_rng(9)
+    dates = pd.bdate_range('2019-11-01', periods=400)
+    dates = dates[rng.random(len(dates)) > 0.1]
+    index_data = pd.DataFrame({'close': 3000 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))}, index=dates)
+    params = {**ParameterSweep.defaults(), 'index_drop_threshold': 0.01}
+
+    row = ParameterSweep(data, {}, base_params=params, index_data=index_data, max_workers=1).run().iloc[0]
+    expected = []
+    for frame in data.values():
+        signals = StrategyOne(params).generate_signals(frame, index_data).signals.to_numpy()
+        expected.append(_symbol_metrics(frame['close'].to_numpy(), signals))
+    assert row['total_return'] == pytest.approx(np.mean([e[0] for e in expected]))
+    assert row['trades'] == sum(e[3] for e in expected)
@@ -0,0 +1,76 @@
+"""多进程组合回测测试：结果须与单进程引擎完全一致。"""
+
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quantify.backtest import BacktestEngine, ParallelBacktestRunner
+from quantify.data.calendar import TradingCalendar
+from quantify.strategies import BaseStrategy, Signal, StrategyContext
+from tests.conftest import _MemoryLoader, _settings
+
+
+class _CrossStrategy(BaseStrategy):
+    """收盘价上穿 5 日均线买入、下穿卖出。"""
+
+    def generate_signals(self, data: pd.DataFrame, context: StrategyContext) -> Iterator[Signal]:
+        close = data["close"]
+        above = close > close.rolling(5).mean()
+        change = above.astype(int).diff().fillna(0)
+        symbol = data.attrs["symbol"]
+        context.record("last_symbol", float(len(symbol)))
+        for timestamp, value in change[change != 0].items():
+            yield Signal(symbol=symbol, action="BUY" if value > 0 else "SELL", timestamp=timestamp)
+
+
+def _universe(n_symbols: int = 7, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    dates = pd.bdate_range("2021-01-04", "2021-12-31")
+    for i in range(n_symbols):
+        # 各标的上市日期与停牌日不同，检验日期轴对齐
+        index = dates[i * 5:]
+        index = index[rng.random(len(index)) > 0.05]
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))
+        frames[f"S{i:02d}"] = pd.DataFrame(
+            {"open": close, "high": close, "low": close, "close": close, "volume": 1000},
+            index=index,
+        )
+    return frames
+
+
+@pytest.mark.parametrize("max_workers,use_calendar", [(1, False), (2, False), (1, True)])
+def test_parallel_matches_serial(max_workers: int, use_calendar: bool) -> None:
+    frames = _universe()
+    calendar = None
+    if use_calendar:
+        # 全部标的同日停牌：日历网格中有、各标的日期的并集中没有的交易日
+        frames = {symbol: frame.drop(pd.Timestamp("2021-06-01"), errors="ignore") for symbol, frame in frames.items()}
+        calendar = TradingCalendar.weekdays("2021-01-01", "2021-12-31")
+    symbols = list(frames)
+    serial = BacktestEngine(_settings(), _MemoryLoader(frames), _CrossStrategy(),
+                            calendar=calendar).run_universe(symbols)
+    runner = ParallelBacktestRunner(_settings(), _MemoryLoader(frames), _CrossStrategy(),
+                                    max_workers=max_workers, chunk_size=3, calendar=calendar)
+    parallel = runner.run_universe(symbols)
+
+    assert parallel.symbols == serial.symbols
+    assert parallel.signals == serial.signals
+    pd.testing.assert_series_equal(parallel.equity_curve, serial.equity_curve, check_freq=False)
+    pd.testing.assert_series_equal(parallel.cash, serial.cash, check_freq=False)
+    pd.testing.assert_frame_equal(parallel.positions, serial.positions, check_freq=False)
+    pd.testing.assert_frame_equal(parallel.fills, serial.fills)
+    pd.testing.assert_frame_equal(parallel.symbol_metrics, serial.symbol_metrics, check_dtype=False)
+    assert parallel.metrics == pytest.approx(serial.metrics)
+    if calendar is not None:
+        assert pd.Timestamp("2021-06-01") in parallel.equity_curve.index
+
+
+def test_parallel_settings_defaults() -> None:
+    settings = _settings()
+    settings.parallel.max_workers = 3
+    settings.parallel.chunk_size = 10
+    runner = ParallelBacktestRunner(settings, _MemoryLoader({}), _CrossStrategy())
+    assert (runner.max_workers, runner.chunk_size) == (3, 10)
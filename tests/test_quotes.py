@@ -0,0 +1,52 @@
+"""腾讯批量行情解析测试。"""
+
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from quantify.features import quotes
+
+
+def _line(symbol: str, name: str, price: str, timestamp: str) -> str:
+    fields = [""] * 50
+    fields[:7] = ["1", name, symbol[2:], price, "10.40", "10.45", "123456"]
+    fields[30:35] = [timestamp, "0.10", "0.96", "10.60", "10.30"]
+    fields[37] = "12345.6"
+    return f'v_{symbol}="{"~".join(fields)}";'
+
+
+def test_parse_tencent_quotes_multi_line() -> None:
+    """多行返回一次解析为类型化报价表，无效代码被跳过。"""
+    payload = "\n".join(
+        [
+            _line("sh600000", "浦发银行", "10.50", "20240105150003"),
+            'v_pv_none_match="1";',
+            _line("hk00700", "腾讯控股", "", "2024/01/05 16:08:10"),
+        ]
+    )
+    table = quotes.parse_tencent_quotes(payload)
+
+    assert list(table.index) == ["600000", "00700"]
+    assert table.loc["600000", "name"] == "浦发银行"
+    assert table.loc["600000", "price"] == 10.5
+    assert np.isnan(table.loc["00700", "price"])
+    assert table["volume"].dtype == np.float64
+    assert table.loc["00700", "timestamp"] == pd.Timestamp("2024-01-05 16:08:10")
+
+
+def test_fetch_quotes_chunks_requests() -> None:
+    """代码按 chunk_size 分组请求，每组一次。"""
+    codes = [f"6000{i:02d}" for i in range(7)]
+    session = mock.Mock()
+
+    def fake_get(url, **kwargs):
+        symbols = url.split("q=", 1)[1].split(",")
+        text = "\n".join(_line(s, "名称", "1.0", "20240105150003") for s in symbols)
+        return mock.Mock(status_code=200, text=text, encoding="gbk")
+
+    session.get.side_effect = fake_get
+    table = quotes.fetch_quotes(codes, chunk_size=3, session=session)
+
+    assert session.get.call_count == 3
+    assert list(table.index) == codes
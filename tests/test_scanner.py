@@ -0,0 +1,74 @@
+"""异步扫描引擎测试，使用本地桩 HTTP 服务器模拟行情与估值接口。"""
+
+import pytest
+
+from quantify.features.checkpoint import ScanCheckpoint
+from quantify.utils.cache import DiskCache
+from tests.conftest import _scanner
+
+
+def test_scan_streams_all_results(stub_server) -> None:
+    """每个代码都有结果，失败的代码带错误信息且不影响其他代码。"""
+    codes = [f"6000{i:02d}" for i in range(12)] + ["99999"]
+    results = {r.code: r for r in _scanner(stub_server, concurrency=4, quote_chunk_size=5).run(codes)}
+
+    assert set(results) == set(codes)
+    quote_requests = [path for path, _ in stub_server.hits if path.startswith("/q=")]
+    assert len(quote_requests) == 3
+    assert not results["99999"].ok
+    good = results["600000"]
+    assert good.price == pytest.approx(12.34)
+    assert good.analysis["stock_text"] == "美团-W (03690)"
+    assert stub_server.max_in_flight <= 4
+
+
+def test_scan_respects_host_rate_limit(stub_server) -> None:
+    """按主机限速时，相邻请求的发起间隔不小于 1/rate。"""
+    stub_server.delay = 0.0
+    scanner = _scanner(stub_server, concurrency=8, host_rate_limits={"127.0.0.1": 50.0})
+    scanner.run([f"6000{i:02d}" for i in range(5)])
+
+    starts = sorted(t for _, t in stub_server.hits)
+    # 1 次批量行情请求 + 5 次估值页面请求
+    assert len(starts) == 6
+    assert starts[-1] - starts[0] >= 5 * (1 / 50.0) * 0.9
+
+
+def test_scan_second_run_served_from_cache(stub_server, tmp_path) -> None:
+    """同一交易日内再次扫描全部命中缓存，不再访问网络。"""
+    cache = DiskCache(tmp_path / "cache.sqlite3")
+    codes = [f"6000{i:02d}" for i in range(6)]
+    with _scanner(stub_server, cache=cache) as scanner:
+        scanner.run(codes)
+    # 扫描器退出时关闭缓存连接，缓存之后仍可继续使用
+    assert cache._connections == []
+    first_hits = len(stub_server.hits)
+
+    results = _scanner(stub_server, cache=cache).run(codes)
+    assert len(stub_server.hits) == first_hits
+    assert all(r.ok and r.price == pytest.approx(12.34) for r in results)
+
+
+def test_scan_resumes_from_checkpoint(stub_server, tmp_path) -> None:
+    """重启后跳过断点中已完成的代码，写了一半的末行被忽略，失败的代码重试。"""
+    path = tmp_path / "scan.jsonl"
+    codes = [f"6000{i:02d}" for i in range(6)] + ["99999"]
+    with ScanCheckpoint(path) as checkpoint:
+        _scanner(stub_server).run(codes[:3], checkpoint)
+    # 模拟写入中途被杀
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write('{"code": "600003", "pri')
+
+    stub_server.hits.clear()
+    with ScanCheckpoint(path) as checkpoint:
+        assert checkpoint.done == set(codes[:3])
+        results = _scanner(stub_server).run(codes, checkpoint)
+    assert {r.code for r in results} == set(codes[3:])
+    analysis_requests = [path for path, _ in stub_server.hits if path.startswith("/analysis/")]
+    assert len(analysis_requests) == 3
+
+    restored = ScanCheckpoint(path)
+    assert {r.code for r in restored.records()[:3]} == set(codes[:3])
+    assert {r.code for r in restored.records()} == set(codes[:6])
+    assert "99999" not in restored
+    assert restored.records()[0].analysis["stock_text"] == "美团-W (03690)"
@@ -0,0 +1,60 @@
+"""估值区间批量筛选的测试。"""
+
+import numpy as np
+import pandas as pd
+
+from quantify.features.A_stock import is_price_in_front_half, parse_relative_range
+from quantify.features.scanner import ScanResult
+from quantify.strategies.screener import parse_ranges, scan_frame, screen, undervalued_report
+
+
+def test_parse_ranges_matches_scalar_parser() -> None:
+    texts = pd.Series(["93.16-102.97", "102.97-93.16", "-5.2--3.1", "10 至 20元", "--", None, "12.5"])
+    lower, upper = parse_ranges(texts)
+    for text, lo, hi in zip(texts, lower, upper):
+        expected = parse_relative_range(text)
+        if expected is None:
+            assert np.isnan(lo) and np.isnan(hi)
+        else:
+            assert (lo, hi) == expected
+
+
+def test_screen_ranks_and_agrees_with_scalar_checks() -> None:
+    rng = np.random.default_rng(3)
+    n = 200
+    low = rng.uniform(5, 100, n).round(2)
+    high = (low * rng.uniform(1.0, 1.5, n)).round(2)
+    high[:5] = low[:5]  # 上下限相等
+    frame = pd.DataFrame(
+        {
+            "price": (low * rng.uniform(0.8, 1.6, n)).round(2),
+            "relative_range": [f"{a}-{b}" for a, b in zip(low, high)],
+            "analysis": np.where(rng.random(n) < 0.3, "股价被低估", "股价合理"),
+        },
+        index=[f"{600000 + i}" for i in range(n)],
+    )
+    frame.iloc[7, 1] = "--"
+
+    screened = screen(frame)
+    expected = [is_price_in_front_half(p, r) for p, r in zip(frame["price"], frame["relative_range"])]
+    assert screened["front_half"].tolist() == pd.Series(expected, index=frame.index)[screened.index].tolist()
+
+    # 先按是否低估、再按是否处于前半区间排序
+    key = screened["undervalued"].astype(int) * 2 + screened["front_half"].astype(int)
+    assert key.is_monotonic_decreasing
+    hits = screened[screened["undervalued"] & screened["front_half"]]
+    assert hits["discount"].is_monotonic_decreasing
+    assert screened.index[: len(hits)].tolist() == hits.index.tolist()
+
+
+def test_scan_results_to_report() -> None:
+    results = [
+        ScanResult("600001", 95.0, {"stock_text": "甲", "analysis": "股价被低估", "relative_range": "93.16-102.97"}),
+        ScanResult("600002", 10.0, {"stock_text": "乙", "analysis": "股价被低估", "relative_range": "10-20"}),
+        ScanResult("600003", 10.0, {"stock_text": "丙", "analysis": "股价合理", "relative_range": "10-20"}),
+        ScanResult("600004", error="timeout"),
+    ]
+    report = undervalued_report(screen(scan_frame(results)))
+    assert report["股票代码"].tolist() == ["600002", "600001"]
+    assert report.loc[0, "距中点折价"] == (15 - 10) / 15
+    assert list(report.columns[:3]) == ["股票代码", "当前股价", "股票名称"]
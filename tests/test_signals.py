@@ -0,0 +1,73 @@
+"""列式信号容器 SignalFrame 的测试。"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from quantify.backtest import BacktestEngine
+from quantify.strategies import BaseStrategy, Signal, SignalFrame, StrategyContext
+from tests.conftest import _bars, _MemoryLoader, _ScheduleStrategy, _settings
+
+
+def _signals():
+    return [
+        Signal(symbol="AAA", action="BUY", price=10.0, timestamp=pd.Timestamp("2021-01-04")),
+        Signal(symbol="BBB", action="sell", volume=100.0, timestamp=pd.Timestamp("2021-01-05")),
+        Signal(symbol="AAA", action="SELL", reason="止损"),
+        Signal(symbol="AAA", action="HOLD"),
+    ]
+
+
+def test_round_trip_drops_non_trading_actions() -> None:
+    frame = SignalFrame.from_signals(_signals())
+    assert len(frame) == 3
+    assert frame.symbols == ("AAA", "BBB")
+    assert frame.to_signals() == [
+        Signal(symbol="AAA", action="BUY", price=10.0, timestamp=pd.Timestamp("2021-01-04")),
+        Signal(symbol="BBB", action="SELL", volume=100.0, timestamp=pd.Timestamp("2021-01-05")),
+        Signal(symbol="AAA", action="SELL", reason="止损"),
+    ]
+    assert frame.nbytes == 3 * (8 + 4 + 1 + 8 + 8)
+
+
+def test_slice_is_view_and_concat_remaps_symbols() -> None:
+    frame = SignalFrame.from_signals(_signals())
+    head = frame[:2]
+    assert np.shares_memory(head.timestamp, frame.timestamp)
+    assert head[1].symbol == "BBB"
+
+    other = SignalFrame.from_series("CCC", pd.Series([0, 1, 0, -1], index=pd.bdate_range("2021-01-04", periods=4)))
+    merged = SignalFrame.concat([other, frame])
+    assert merged.symbols == ("CCC", "AAA", "BBB")
+    assert list(merged.symbol_codes()) == ["CCC", "CCC", "AAA", "BBB", "AAA"]
+    assert merged.for_symbol("AAA").to_signals() == frame.for_symbol("AAA").to_signals()
+
+    table = merged.to_frame()
+    assert list(table["action"]) == ["BUY", "SELL", "BUY", "SELL", "SELL"]
+    assert table["timestamp"].isna().sum() == 1
+
+
+class _FrameStrategy(BaseStrategy):
+    """与 _ScheduleStrategy 相同的信号，但直接返回 SignalFrame。"""
+
+    def __init__(self, schedule: Dict[str, list]):
+        self._inner = _ScheduleStrategy(schedule)
+
+    def generate_signals(self, data: pd.DataFrame, context: StrategyContext) -> SignalFrame:
+        return SignalFrame.from_signals(self._inner.generate_signals(data, context))
+
+
+def test_engine_accepts_signal_frames() -> None:
+    frames = {"AAA": _bars([10, 11, 12, 12, 6]), "BBB": _bars([20, 20, 10, 15, 15])}
+    dates = frames["AAA"].index
+    schedule = {"AAA": [(dates[0], "BUY"), (dates[2], "SELL")], "BBB": [(dates[1], "BUY")]}
+    loader = _MemoryLoader(frames)
+
+    expected = BacktestEngine(_settings(), loader, _ScheduleStrategy(schedule)).run_universe(list(frames))
+    result = BacktestEngine(_settings(), loader, _FrameStrategy(schedule)).run_universe(list(frames))
+
+    assert isinstance(result.signals, SignalFrame)
+    assert result.signals == expected.signals
+    pd.testing.assert_series_equal(result.equity_curve, expected.equity_curve)
+    assert result.metrics == expected.metrics
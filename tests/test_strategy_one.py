@@ -8,7 +8,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
 
-from strategies.strategy_one import StrategyOne, StrategyState
+from strategies.strategy_one import StrategyOne, StrategyState, RollingIndicators, _signal_kernel_jit
 from src.core.signal_result import SignalResult
 import talib as ta
 
@@ -133,6 +133,115 @@ class TestStrategyOne(unittest.TestCase):
         # 验证信号值是否合法
         self.assertTrue(all(s in [-1, 0, 1] for s in result.signals))
         
+    def test_result_builds_series_on_demand(self):
+        """结果只保存列式信号，逐K线序列与元数据在访问时才构造"""
+        result = self.strategy.generate_signals(self.test_data, self.index_data)
+        self.assertIsNone(result._signals)
+        self.assertTrue(callable(result._metadata))
+        self.assertEqual(len(result.frame), int((result.signals != 0).sum()))
+        self.assertTrue(result.signals.index.equals(self.test_data.index))
+        self.assertEqual(list(result.metadata['stop_loss'].index), list(self.test_data.index))
+
+        short = self.strategy.generate_signals(self.test_data.iloc[:5])
+        self.assertEqual(len(short.frame), 0)
+        self.assertTrue((short.signals == 0).all())
+
+    def test_rolling_indicators_match_talib(self):
+        """测试增量指标与 TA-Lib 计算结果一致"""
+        close = self.test_data['close'].to_numpy()
+        high = self.test_data['high'].to_numpy()
+        low = self.test_data['low'].to_numpy()
+        rolling = RollingIndicators(5, 20, 14, 14)
+        values = np.array([rolling.update(high[i], low[i], close[i]) for i in range(len(close))])
+        
+        expected = [ta.SMA(close, 5), ta.SMA(close, 20), ta.RSI(close, 14), ta.ATR(high, low, close, 14)]
+        for column, reference in enumerate(expected):
+            np.testing.assert_allclose(values[:, column], reference, rtol=1e-10, equal_nan=True)
+            
+    def test_incremental_matches_batch(self):
+        """测试增量模式逐根处理的信号与批量模式一致"""
+        batch = StrategyOne(self.params).generate_signals(self.test_data, self.index_data).signals
+        
+        incremental = StrategyOne(self.params)
+        head = incremental.update(self.test_data.iloc[:30], self.index_data.iloc[:30])
+        tail = [
+            incremental.on_bar(ts, row.high, row.low, row.close, self.index_data['close'].iloc[30 + i])
+            for i, (ts, row) in enumerate(self.test_data.iloc[30:].iterrows())
+        ]
+        
+        self.assertEqual(list(batch), list(head) + tail)
+        
+    def test_numpy_state_machine_matches_incremental(self):
+        """测试 NumPy 状态机在触发止损、时间止损与回撤暂停时仍与逐根实现一致"""
+        rng = np.random.default_rng(42)
+        n = 600
+        close = 100 * np.exp(np.cumsum(rng.normal(0.001, 0.03, n)))
+        data = pd.DataFrame({
+            'open': close,
+            'high': close * (1 + rng.uniform(0, 0.03, n)),
+            'low': close * (1 - rng.uniform(0, 0.03, n)),
+            'close': close,
+            'volume': 1e6,
+        }, index=pd.bdate_range('2015-01-01', periods=n))
+        params = dict(self.params, max_drawdown=0.08, use_numba=False)
+        
+        batch = StrategyOne(params)
+        signals = batch.generate_signals(data).signals
+        incremental = StrategyOne(params)
+        expected = incremental.update(data)
+        
+        self.assertGreater((signals != 0).sum(), 0)
+        self.assertEqual(list(signals), list(expected))
+        self.assertEqual(batch.state, incremental.state)
+        
+        if _signal_kernel_jit is not None:
+            jit_signals = StrategyOne(dict(params, use_numba=True)).generate_signals(data).signals
+            self.assertEqual(list(jit_signals), list(signals))
+
+    def test_calendar_state_machine_matches_incremental(self):
+        """测试按交易日计算持仓与暂停天数时，NumPy 状态机与逐根实现一致，且与按自然日的结果不同"""
+        from quantify.data.calendar import TradingCalendar
+        rng = np.random.default_rng(7)
+        n = 400
+        close = 100 * np.exp(np.cumsum(rng.normal(0.001, 0.03, n)))
+        index = pd.bdate_range('2015-01-01', periods=n + 20)
+        holidays = index[rng.choice(len(index), 20, replace=False)]
+        index = index.difference(holidays)[:n]
+        data = pd.DataFrame({'open': close, 'high': close * 1.02, 'low': close * 0.98, 'close': close,
+                             'volume': 1e6}, index=index)
+        calendar = TradingCalendar.weekdays('2014-12-01', '2016-12-31', holidays=holidays)
+        params = dict(self.params, max_drawdown=0.08, max_hold_days=4, use_numba=False, calendar=calendar)
+
+        batch = StrategyOne(params)
+        signals = batch.generate_signals(data).signals
+        incremental = StrategyOne(params)
+        expected = incremental.update(data)
+
+        self.assertEqual(list(signals), list(expected))
+        self.assertEqual(batch.state, incremental.state)
+        by_day = StrategyOne(dict(params, calendar=None)).generate_signals(data).signals
+        self.assertNotEqual(list(signals), list(by_day))
+
+        if _signal_kernel_jit is not None:
+            jit_signals = StrategyOne(dict(params, use_numba=True)).generate_signals(data).signals
+            self.assertEqual(list(jit_signals), list(signals))
+
+    def test_feature_store_shared_between_strategies(self):
+        """测试两个策略通过指标仓库共享指标，信号与直接计算一致"""
+        from quantify.features import FeatureStore
+        store = FeatureStore()
+        data = self.test_data.copy()
+        data.attrs['symbol'] = 'TEST'
+
+        expected = StrategyOne(self.params).generate_signals(data).signals
+        first = StrategyOne(dict(self.params, feature_store=store)).generate_signals(data).signals
+        second = StrategyOne(dict(self.params, feature_store=store)).generate_signals(data).signals
+
+        self.assertEqual(list(first), list(expected))
+        self.assertEqual(list(second), list(expected))
+        self.assertEqual(store.misses, 4)
+        self.assertEqual(store.hits, 4)
+
     def test_calculate_position_size(self):
         """测试仓位计算"""
         portfolio_value = 1000000  # 100万资金
@@ -0,0 +1,72 @@
+"""标的注册表的测试。"""
+
+import os
+
+import numpy as np
+import pytest
+
+from quantify.data.universe import BOARD_CHINEXT, EXCHANGE_HK, EXCHANGE_SH, EXCHANGE_SZ, Universe, registry
+from quantify.features.A_stock import print_a_stock_without_st
+from quantify.strategies.analysis import get_filtered_stock_list
+
+
+def _write_list(path, rows) -> None:
+    path.write_text("﻿股票代码,股票名称\n" + "".join(f"{code},{name}\n" for code, name in rows), encoding="utf-8")
+
+
+def test_intern_assigns_dense_ids_and_routes_markets() -> None:
+    universe = Universe(["600000", "000001"])
+    ids = universe.intern(["00700", "600000", "300750", "00700"])
+    assert ids.tolist() == [2, 0, 3, 2]
+    assert len(universe) == 4
+    assert universe.exchange.tolist() == [EXCHANGE_SH, EXCHANGE_SZ, EXCHANGE_HK, EXCHANGE_SZ]
+    assert universe.board[3] == BOARD_CHINEXT
+    assert universe.symbols.tolist() == ["sh600000", "sz000001", "hk00700", "sz300750"]
+    assert universe.symbol("688981") == "sh688981"
+
+    with pytest.raises(ValueError):
+        universe.intern(["12345a"])
+    with pytest.raises(ValueError):
+        universe.intern(["1234"])
+    assert len(universe) == 5
+
+
+def test_filters_and_search(tmp_path) -> None:
+    path = tmp_path / "list.csv"
+    _write_list(path, [("600000", "浦发银行"), ("000004", "*ST国华"), ("300750", "宁德时代"), ("600519", "贵州茅台")])
+    universe = Universe(["00700"])
+    ids = universe.load_csv(path)
+    assert universe.load_csv(path) is ids  # 文件未修改时不重复读取
+
+    kept = universe.select(ids, exclude_st=True)
+    assert universe.code_list(kept) == ["600000", "300750", "600519"]
+    assert universe.code_list(universe.select(market="HK")) == ["00700"]
+    assert universe.code_list(universe.select(ids, boards=["chinext"])) == ["300750"]
+    assert universe.code_list(universe.search("茅台", kept)) == ["600519"]
+    np.testing.assert_array_equal(universe.to_frame(kept)["st"], False)
+
+
+def test_stock_list_helpers_use_registry(tmp_path) -> None:
+    path = tmp_path / "a_stock_list.csv"
+    _write_list(path, [("002594", "比亚迪"), ("600005", "ST武钢"), ("002050", "三花智控")])
+    assert get_filtered_stock_list(str(path)) == ["002594", "002050"]
+    frame = print_a_stock_without_st(str(path), keyword="比亚迪", print_output=False)
+    assert frame.to_dict("records") == [{"股票代码": "002594", "股票名称": "比亚迪"}]
+    assert registry().names[registry().id("002594")] == "比亚迪"
+
+
+def test_reloaded_csv_updates_names_and_skips_bad_rows(tmp_path) -> None:
+    path = tmp_path / "a_stock_list.csv"
+    _write_list(path, [("000001", "平安银行"), ("600000", "浦发银行")])
+    universe = Universe()
+    ids = universe.load_csv(path)
+    assert universe.code_list(universe.select(ids, exclude_st=True)) == ["000001", "600000"]
+
+    # 文件被改写：名称与 ST 标记以新文件为准，格式错误的代码跳过而不影响其余行
+    _write_list(path, [("000001", "*ST平安"), ("60000X", "坏代码"), ("600000", "浦发银行")])
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    ids = universe.load_csv(path)
+    assert universe.code_list(ids) == ["000001", "600000"]
+    assert universe.names[universe.id("000001")] == "*ST平安"
+    assert universe.code_list(universe.select(ids, exclude_st=True)) == ["600000"]
+    assert universe.code_list(universe.search("平安")) == ["000001"]
@@ -0,0 +1,46 @@
+"""K线仓库增量更新任务测试。"""
+
+import pandas as pd
+
+from quantify.data import AkshareLoader, BarStore, BarUpdater
+
+AFTER_CLOSE = pd.Timestamp("2024-03-29 18:00")
+
+
+def _updater(tmp_path, now=AFTER_CLOSE) -> BarUpdater:
+    loader = AkshareLoader(BarStore(tmp_path), now=lambda: now)
+    return BarUpdater(loader, max_workers=4, batch_size=2)
+
+
+def test_update_is_incremental_and_resumable(tmp_path, fake_akshare, monkeypatch) -> None:
+    codes = ["600000", "600001", "600002", "600003", "600004"]
+    original = fake_akshare.stock_zh_a_hist
+
+    def flaky(symbol, **kwargs):
+        if symbol == "600003":
+            raise ConnectionError("reset by peer")
+        return original(symbol, **kwargs)
+
+    monkeypatch.setattr(fake_akshare, "stock_zh_a_hist", flaky)
+    report = _updater(tmp_path, now=pd.Timestamp("2024-03-28 18:00")).run(codes, start="2024-03-01")
+    assert set(report.appended) == {"600000", "600001", "600002", "600004"}
+    assert set(report.failed) == {"600003"}
+    assert report.rows == 4 * 20
+
+    # 重新运行：只处理失败的标的
+    monkeypatch.setattr(fake_akshare, "stock_zh_a_hist", original)
+    fake_akshare.calls.clear()
+    updater = _updater(tmp_path, now=pd.Timestamp("2024-03-28 18:00"))
+    report = updater.run(codes, start="2024-03-01")
+    assert set(report.skipped) == {"600000", "600001", "600002", "600004"}
+    assert [c[0] for c in fake_akshare.calls] == ["600003"]
+
+    # 次日收盘后：每只标的只请求新的一天并追加一行
+    fake_akshare.calls.clear()
+    updater = _updater(tmp_path)
+    report = updater.run(codes, start="2024-03-01")
+    assert report.appended == {code: 1 for code in codes}
+    assert sorted(fake_akshare.calls) == [(code, "20240329", "20240329") for code in codes]
+    mark = updater.watermarks["600000"]
+    assert mark == {"last": "2024-03-29T00:00:00", "rows": 21, "checked": "2024-03-29T00:00:00"}
+    assert (tmp_path / "watermarks.json").exists()